@@ -20,7 +20,7 @@ if sys.platform == 'win32':
 
 # Import your models' Base for autogenerate support
 from app.database import Base
-from app.models.database import User, Portfolio, PortfolioVersion  # noqa
+from app.models.database import User, Portfolio, PortfolioVersion, PortfolioGithubRepo  # noqa
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
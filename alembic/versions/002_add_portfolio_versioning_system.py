@@ -5,6 +5,8 @@ Revises: 001
 Create Date: 2026-02-09 23:25:00
 
 """
+import uuid
+
 from alembic import op
 import sqlalchemy as sa
 from sqlalchemy.dialects import sqlite
@@ -19,59 +21,76 @@ depends_on = None
 def upgrade():
     """Add versioning system to portfolios"""
     
+    # Steps 1-2 only add columns and indexes, which SQLite's ALTER TABLE
+    # handles in place; batch_alter_table is kept for the downgrade's drops.
+
     # Step 1: Add version_state column to portfolio_versions
-    with op.batch_alter_table('portfolio_versions', schema=None) as batch_op:
-        batch_op.add_column(sa.Column('version_state', sa.String(20), nullable=False, server_default='committed'))
-        batch_op.create_index('idx_version_state', ['version_state'])
-        batch_op.create_index('idx_version_portfolio_number', ['portfolio_id', 'version_number'])
+    op.add_column('portfolio_versions', sa.Column('version_state', sa.String(20), nullable=False, server_default='committed'))
+    op.create_index('idx_version_state', 'portfolio_versions', ['version_state'])
+    op.create_index('idx_version_portfolio_number', 'portfolio_versions', ['portfolio_id', 'version_number'])
     
     # Step 2: Add current_version_id to portfolios (nullable for now)
-    with op.batch_alter_table('portfolios', schema=None) as batch_op:
-        batch_op.add_column(sa.Column('current_version_id', sa.String(36), nullable=True))
+    op.add_column('portfolios', sa.Column('current_version_id', sa.String(36), nullable=True))
     
     # Step 3: Migrate existing data - create version 1 for each portfolio
     connection = op.get_bind()
-    
-    # Import uuid for ID generation
-    import uuid
-    
-    # Get all portfolios that have public_portfolio_json
-    portfolios = connection.execute(
-        sa.text("""
-            SELECT id, slug, public_portfolio_json, private_coaching_json 
-            FROM portfolios 
-            WHERE public_portfolio_json IS NOT NULL
-        """)
-    ).fetchall()
-    
-    # For each portfolio, create a committed version 1
-    for portfolio in portfolios:
-        version_id = str(uuid.uuid4())
-        
-        # Insert version
+
+    if connection.dialect.name == "sqlite":
+        # If foreign key enforcement is on, check the backfill once at COMMIT
+        # rather than per row (no-op otherwise; resets when the transaction ends)
+        connection.execute(sa.text("PRAGMA defer_foreign_keys = ON"))
+
+        # Generate the version rows entirely in SQL: the random UUIDv4 is
+        # built from randomblob() in the same lowercase, hyphenated form as
+        # app.models.database.get_uuid, so no portfolio row round-trips
+        # through Python
         connection.execute(
             sa.text("""
                 INSERT INTO portfolio_versions 
                 (id, portfolio_id, version_number, version_state, public_portfolio_json, private_coaching_json, created_by, created_at)
-                VALUES (:id, :portfolio_id, 1, 'committed', :public_json, :private_json, 'ai', datetime('now'))
-            """),
-            {
-                'id': version_id,
-                'portfolio_id': portfolio[0],
-                'public_json': portfolio[2],
-                'private_json': portfolio[3]
-            }
-        )
-        
-        # Update portfolio's current_version_id
-        connection.execute(
-            sa.text("""
-                UPDATE portfolios 
-                SET current_version_id = :version_id 
-                WHERE id = :portfolio_id
-            """),
-            {'version_id': version_id, 'portfolio_id': portfolio[0]}
+                SELECT
+                    lower(
+                        hex(randomblob(4)) || '-' || hex(randomblob(2)) || '-4' ||
+                        substr(hex(randomblob(2)), 2) || '-' ||
+                        substr('89ab', abs(random()) % 4 + 1, 1) || substr(hex(randomblob(2)), 2) || '-' ||
+                        hex(randomblob(6))
+                    ),
+                    id, 1, 'committed', public_portfolio_json, private_coaching_json, 'ai', datetime('now')
+                FROM portfolios 
+                WHERE public_portfolio_json IS NOT NULL
+            """)
         )
+    else:
+        # Portable path: ids come from uuid4() in Python, but the JSON
+        # documents are still copied inside the database
+        portfolio_ids = connection.execute(
+            sa.text("SELECT id FROM portfolios WHERE public_portfolio_json IS NOT NULL")
+        ).scalars().all()
+        if portfolio_ids:
+            connection.execute(
+                sa.text("""
+                    INSERT INTO portfolio_versions 
+                    (id, portfolio_id, version_number, version_state, public_portfolio_json, private_coaching_json, created_by, created_at)
+                    SELECT :id, id, 1, 'committed', public_portfolio_json, private_coaching_json, 'ai', CURRENT_TIMESTAMP
+                    FROM portfolios 
+                    WHERE id = :portfolio_id
+                """),
+                [{'id': str(uuid.uuid4()), 'portfolio_id': portfolio_id} for portfolio_id in portfolio_ids]
+            )
+    
+    # Point every migrated portfolio at its version 1 with a single UPDATE
+    connection.execute(
+        sa.text("""
+            UPDATE portfolios 
+            SET current_version_id = (
+                SELECT portfolio_versions.id 
+                FROM portfolio_versions 
+                WHERE portfolio_versions.portfolio_id = portfolios.id 
+                AND portfolio_versions.version_number = 1
+            )
+            WHERE public_portfolio_json IS NOT NULL
+        """)
+    )
     
     # Step 4: Add foreign key constraint for current_version_id
     # Note: SQLite doesn't support adding FK constraints after table creation
@@ -0,0 +1,29 @@
+"""replace portfolio/version index with a covering index
+
+Revision ID: 005_version_covering_index
+Revises: 003_conversations
+Create Date: 2026-10-15
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "005_version_covering_index"
+down_revision = "003_conversations"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Trailing version_state and id let latest-version lookups skip the table row
+    op.create_index(
+        "idx_version_portfolio_covering",
+        "portfolio_versions",
+        ["portfolio_id", sa.text("version_number DESC"), "version_state", "id"],
+    )
+    op.drop_index("idx_version_portfolio_number", table_name="portfolio_versions")
+
+
+def downgrade():
+    op.create_index("idx_version_portfolio_number", "portfolio_versions", ["portfolio_id", "version_number"])
+    op.drop_index("idx_version_portfolio_covering", table_name="portfolio_versions")
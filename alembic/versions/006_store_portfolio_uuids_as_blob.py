@@ -0,0 +1,103 @@
+"""store portfolio and version UUIDs as 16-byte BLOBs on SQLite
+
+Revision ID: 006_uuid_blob_keys
+Revises: 005_version_covering_index
+Create Date: 2026-10-15
+"""
+import uuid
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "006_uuid_blob_keys"
+down_revision = "005_version_covering_index"
+branch_labels = None
+depends_on = None
+
+
+def _to_bytes(value):
+    if value is None or isinstance(value, bytes):
+        return value
+    return uuid.UUID(value).bytes
+
+
+def _to_text(value):
+    if value is None or isinstance(value, str):
+        return value
+    return str(uuid.UUID(bytes=value))
+
+
+def _convert_keys(connection, convert):
+    """Rewrite every portfolio/version key with convert() in two executemany passes."""
+    portfolios = connection.execute(
+        sa.text("SELECT id, current_version_id FROM portfolios")
+    ).fetchall()
+    if portfolios:
+        connection.execute(
+            sa.text("UPDATE portfolios SET id = :new_id, current_version_id = :version_id WHERE id = :old_id"),
+            [
+                {"old_id": row[0], "new_id": convert(row[0]), "version_id": convert(row[1])}
+                for row in portfolios
+            ],
+        )
+
+    versions = connection.execute(
+        sa.text("SELECT id, portfolio_id FROM portfolio_versions")
+    ).fetchall()
+    if versions:
+        connection.execute(
+            sa.text("UPDATE portfolio_versions SET id = :new_id, portfolio_id = :portfolio_id WHERE id = :old_id"),
+            [
+                {"old_id": row[0], "new_id": convert(row[0]), "portfolio_id": convert(row[1])}
+                for row in versions
+            ],
+        )
+
+
+def _restore_covering_index():
+    # Batch table rebuilds cannot reflect DESC index columns, so restore the
+    # covering index from 005_version_covering_index.
+    op.drop_index("idx_version_portfolio_covering", table_name="portfolio_versions")
+    op.create_index(
+        "idx_version_portfolio_covering",
+        "portfolio_versions",
+        ["portfolio_id", sa.text("version_number DESC"), "version_state", "id"],
+    )
+
+
+def upgrade():
+    # Only SQLite stores the binary form; other backends keep String(36).
+    if op.get_bind().dialect.name != "sqlite":
+        return
+
+    # Convert values first: the batch rebuild copies them with CAST(... AS BLOB)
+    _convert_keys(op.get_bind(), _to_bytes)
+
+    with op.batch_alter_table("portfolio_versions") as batch_op:
+        batch_op.alter_column("id", existing_type=sa.String(36), type_=sa.LargeBinary(16))
+        batch_op.alter_column("portfolio_id", existing_type=sa.String(36), type_=sa.LargeBinary(16))
+
+    with op.batch_alter_table("portfolios") as batch_op:
+        batch_op.alter_column("id", existing_type=sa.String(36), type_=sa.LargeBinary(16))
+        batch_op.alter_column("current_version_id", existing_type=sa.String(36), type_=sa.LargeBinary(16))
+
+    _restore_covering_index()
+
+
+def downgrade():
+    if op.get_bind().dialect.name != "sqlite":
+        return
+
+    # Back to text before the rebuild casts the columns to VARCHAR
+    _convert_keys(op.get_bind(), _to_text)
+
+    with op.batch_alter_table("portfolios") as batch_op:
+        batch_op.alter_column("current_version_id", existing_type=sa.LargeBinary(16), type_=sa.String(36))
+        batch_op.alter_column("id", existing_type=sa.LargeBinary(16), type_=sa.String(36))
+
+    with op.batch_alter_table("portfolio_versions") as batch_op:
+        batch_op.alter_column("portfolio_id", existing_type=sa.LargeBinary(16), type_=sa.String(36))
+        batch_op.alter_column("id", existing_type=sa.LargeBinary(16), type_=sa.String(36))
+
+    _restore_covering_index()
@@ -0,0 +1,32 @@
+"""replace version_state index with a partial index on drafts
+
+Revision ID: 007_partial_draft_index
+Revises: 006_uuid_blob_keys
+Create Date: 2026-10-15
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "007_partial_draft_index"
+down_revision = "006_uuid_blob_keys"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Committed versions dominate the table; index only the few drafts
+    draft_only = sa.text("version_state = 'DRAFT'")
+    op.create_index(
+        "idx_version_draft",
+        "portfolio_versions",
+        ["portfolio_id"],
+        sqlite_where=draft_only,
+        postgresql_where=draft_only,
+    )
+    op.drop_index("idx_version_state", table_name="portfolio_versions")
+
+
+def downgrade():
+    op.create_index("idx_version_state", "portfolio_versions", ["version_state"])
+    op.drop_index("idx_version_draft", table_name="portfolio_versions")
@@ -0,0 +1,23 @@
+"""drop idx_version_portfolio_id (covered by the composite index)
+
+Revision ID: 008_drop_version_portfolio_id_index
+Revises: 007_partial_draft_index
+Create Date: 2026-10-15
+"""
+from alembic import op
+
+
+revision = "008_drop_version_portfolio_id_index"
+down_revision = "007_partial_draft_index"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # idx_version_portfolio_covering leads with portfolio_id, so it already
+    # serves every WHERE portfolio_id = ? lookup
+    op.drop_index("idx_version_portfolio_id", table_name="portfolio_versions")
+
+
+def downgrade():
+    op.create_index("idx_version_portfolio_id", "portfolio_versions", ["portfolio_id"])
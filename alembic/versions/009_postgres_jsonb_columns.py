@@ -0,0 +1,50 @@
+"""store portfolio JSON columns as JSONB on PostgreSQL
+
+Revision ID: 009_postgres_jsonb
+Revises: 008_drop_version_portfolio_id_index
+Create Date: 2026-10-15
+"""
+from alembic import op
+
+
+revision = "009_postgres_jsonb"
+down_revision = "008_drop_version_portfolio_id_index"
+branch_labels = None
+depends_on = None
+
+
+JSON_COLUMNS = {
+    "portfolios": (
+        "linkedin_data",
+        "github_data",
+        "codeforces_data",
+        "leetcode_data",
+        "public_portfolio_json",
+        "private_coaching_json",
+        "ai_generation_metadata",
+    ),
+    "portfolio_versions": ("public_portfolio_json", "private_coaching_json"),
+}
+
+
+def _convert(target_type):
+    for table, columns in JSON_COLUMNS.items():
+        alterations = ", ".join(
+            f"ALTER COLUMN {column} TYPE {target_type} USING {column}::{target_type}"
+            for column in columns
+        )
+        # One ALTER TABLE per table so PostgreSQL rewrites each table only once
+        op.execute(f"ALTER TABLE {table} {alterations}")
+
+
+def upgrade():
+    # SQLite has no JSONB; its JSON columns are untouched.
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    _convert("jsonb")
+
+
+def downgrade():
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    _convert("json")
@@ -0,0 +1,56 @@
+"""store portfolio and version UUID keys as native uuid on PostgreSQL
+
+Revision ID: 010_postgres_uuid_keys
+Revises: 009_postgres_jsonb
+Create Date: 2026-10-15
+"""
+from alembic import op
+
+
+revision = "010_postgres_uuid_keys"
+down_revision = "009_postgres_jsonb"
+branch_labels = None
+depends_on = None
+
+
+# Name PostgreSQL gave the unnamed FK declared in 001_initial_schema
+VERSION_PORTFOLIO_FK = "portfolio_versions_portfolio_id_fkey"
+# portfolios.current_version_id -> portfolio_versions.id, from 24183b7f2a2d
+CURRENT_VERSION_FK = "fk_portfolios_current_version_id"
+
+
+def _convert(target_type):
+    # Each FK pins both sides to the same type, so lift both while converting
+    op.drop_constraint(CURRENT_VERSION_FK, "portfolios", type_="foreignkey")
+    op.drop_constraint(VERSION_PORTFOLIO_FK, "portfolio_versions", type_="foreignkey")
+    op.execute(
+        f"ALTER TABLE portfolios "
+        f"ALTER COLUMN id TYPE {target_type} USING id::{target_type}, "
+        f"ALTER COLUMN current_version_id TYPE {target_type} USING current_version_id::{target_type}"
+    )
+    op.execute(
+        f"ALTER TABLE portfolio_versions "
+        f"ALTER COLUMN id TYPE {target_type} USING id::{target_type}, "
+        f"ALTER COLUMN portfolio_id TYPE {target_type} USING portfolio_id::{target_type}"
+    )
+    op.create_foreign_key(
+        VERSION_PORTFOLIO_FK, "portfolio_versions", "portfolios",
+        ["portfolio_id"], ["id"], ondelete="CASCADE",
+    )
+    op.create_foreign_key(
+        CURRENT_VERSION_FK, "portfolios", "portfolio_versions",
+        ["current_version_id"], ["id"],
+    )
+
+
+def upgrade():
+    # SQLite already stores these keys as 16-byte BLOBs (006_uuid_blob_keys).
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    _convert("uuid")
+
+
+def downgrade():
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    _convert("varchar(36)")
@@ -0,0 +1,37 @@
+"""INCLUDE version-list metadata in the covering index on PostgreSQL
+
+Revision ID: 011_version_index_include
+Revises: 010_postgres_uuid_keys
+Create Date: 2026-10-15
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "011_version_index_include"
+down_revision = "010_postgres_uuid_keys"
+branch_labels = None
+depends_on = None
+
+
+KEY_COLUMNS = ["portfolio_id", sa.text("version_number DESC"), "version_state", "id"]
+
+
+def upgrade():
+    # INCLUDE is PostgreSQL 11+ syntax; SQLite keeps the plain covering index.
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.drop_index("idx_version_portfolio_covering", table_name="portfolio_versions")
+    op.create_index(
+        "idx_version_portfolio_covering",
+        "portfolio_versions",
+        KEY_COLUMNS,
+        postgresql_include=["created_by", "created_at", "changes_summary"],
+    )
+
+
+def downgrade():
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.drop_index("idx_version_portfolio_covering", table_name="portfolio_versions")
+    op.create_index("idx_version_portfolio_covering", "portfolio_versions", KEY_COLUMNS)
@@ -0,0 +1,103 @@
+"""shred portfolios.github_data into a portfolio_github_repos child table
+
+Revision ID: 012_portfolio_github_repos
+Revises: 011_version_index_include
+Create Date: 2026-10-15
+"""
+import json
+import uuid
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = "012_portfolio_github_repos"
+down_revision = "011_version_index_include"
+branch_labels = None
+depends_on = None
+
+
+def _key_type(dialect_name):
+    # Same storage as UUIDBinary: 16-byte BLOB on SQLite, uuid on PostgreSQL
+    if dialect_name == "sqlite":
+        return sa.LargeBinary(16)
+    if dialect_name == "postgresql":
+        return postgresql.UUID(as_uuid=False)
+    return sa.String(length=36)
+
+
+def _backfill(connection):
+    """Copy the repos already stored in portfolios.github_data into child rows."""
+    dialect_name = connection.dialect.name
+    rows = connection.execute(
+        sa.text("SELECT id, github_data FROM portfolios WHERE github_data IS NOT NULL")
+    ).fetchall()
+
+    repos_table = sa.table(
+        "portfolio_github_repos",
+        sa.column("id"),
+        sa.column("portfolio_id"),
+        sa.column("name"),
+        sa.column("description"),
+        sa.column("primary_language"),
+        sa.column("last_updated"),
+        sa.column("github_url"),
+        sa.column("readme_text"),
+        sa.column("readme_length"),
+        sa.column("structure", sa.JSON),
+    )
+    new_rows = []
+    for portfolio_id, github_data in rows:
+        repos = json.loads(github_data) if isinstance(github_data, str) else github_data
+        for repo in repos or []:
+            new_id = uuid.uuid4()
+            new_rows.append({
+                "id": new_id.bytes if dialect_name == "sqlite" else str(new_id),
+                "portfolio_id": portfolio_id,
+                "name": repo.get("name") or "",
+                "description": repo.get("description"),
+                "primary_language": repo.get("primary_language"),
+                "last_updated": repo.get("last_updated"),
+                "github_url": repo.get("github_url"),
+                "readme_text": repo.get("readme_text"),
+                "readme_length": repo.get("readme_length"),
+                "structure": repo.get("structure"),
+            })
+    if new_rows:
+        op.bulk_insert(repos_table, new_rows)
+
+
+def upgrade():
+    dialect_name = op.get_bind().dialect.name
+    json_type = postgresql.JSONB() if dialect_name == "postgresql" else sa.JSON()
+
+    op.create_table(
+        "portfolio_github_repos",
+        sa.Column("id", _key_type(dialect_name), nullable=False),
+        sa.Column("portfolio_id", _key_type(dialect_name), nullable=False),
+        sa.Column("name", sa.String(length=200), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("primary_language", sa.String(length=50), nullable=True),
+        sa.Column("last_updated", sa.String(length=50), nullable=True),
+        sa.Column("github_url", sa.String(length=255), nullable=True),
+        sa.Column("readme_text", sa.Text(), nullable=True),
+        sa.Column("readme_length", sa.Integer(), nullable=True),
+        sa.Column("structure", json_type, nullable=True),
+        sa.ForeignKeyConstraint(["portfolio_id"], ["portfolios.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "idx_github_repo_portfolio_language",
+        "portfolio_github_repos",
+        ["portfolio_id", "primary_language"],
+    )
+
+    # Offline (--sql) runs have no rows to read
+    if not op.get_context().as_sql:
+        _backfill(op.get_bind())
+
+
+def downgrade():
+    op.drop_index("idx_github_repo_portfolio_language", table_name="portfolio_github_repos")
+    op.drop_table("portfolio_github_repos")
@@ -1,21 +1,23 @@
 import logging
 import os
-from typing import List, Dict
+from typing import Dict, FrozenSet
 from dotenv import load_dotenv
 
 load_dotenv()
 
 # File upload constraints
 MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB in bytes
-ALLOWED_EXTENSIONS = [".pdf", ".docx"]
-ALLOWED_MIME_TYPES = [
+ALLOWED_EXTENSIONS: FrozenSet[str] = frozenset({".pdf", ".docx"})
+ALLOWED_MIME_TYPES: FrozenSet[str] = frozenset({
     "application/pdf",
     "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-]
+})
 
 # API Keys and Configuration
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", "")
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite+aiosqlite:///./portfolio.db")
+# Set when `alembic upgrade head` owns the schema (see build.sh); skips create_all on startup
+ALEMBIC_MANAGED = os.getenv("ALEMBIC_MANAGED", "").lower() in {"1", "true", "yes"}
 
 # RAG configuration for the AI Career Coach
 QDRANT_URL = os.getenv("QDRANT_URL", "")
@@ -27,18 +29,22 @@ GITHUB_CLIENT_ID = os.getenv("GITHUB_CLIENT_ID", "")
 GITHUB_CLIENT_SECRET = os.getenv("GITHUB_CLIENT_SECRET", "")
 GITHUB_REDIRECT_URI = os.getenv("GITHUB_REDIRECT_URI", "http://localhost:8000/api/auth/callback")
 FRONTEND_URL = os.getenv("FRONTEND_URL", "http://localhost:5173")
+# Comma-separated list of allowed browser origins (defaults to the frontend URL)
+CORS_ORIGINS = [
+    origin.strip() for origin in os.getenv("CORS_ORIGINS", FRONTEND_URL).split(",") if origin.strip()
+]
 
 # JWT Configuration
 JWT_SECRET = os.getenv("JWT_SECRET", "your-super-secret-jwt-key-change-this-in-production")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24 * 7  # 1 week
 
-# Section keywords for LinkedIn parsing (case-insensitive matching)
-LINKEDIN_SECTIONS: Dict[str, List[str]] = {
-    "summary": ["summary", "about"],
-    "experience": ["experience", "work experience", "professional experience"],
-    "education": ["education", "academic background"],
-    "skills": ["skills", "technical skills", "core competencies"]
+# Section keywords for LinkedIn parsing (lowercase; frozensets for O(1) matching)
+LINKEDIN_SECTIONS: Dict[str, FrozenSet[str]] = {
+    "summary": frozenset({"summary", "about"}),
+    "experience": frozenset({"experience", "work experience", "professional experience"}),
+    "education": frozenset({"education", "academic background"}),
+    "skills": frozenset({"skills", "technical skills", "core competencies"})
 }
 
 # Logging setup
@@ -1,13 +1,20 @@
 """Database configuration and session management"""
-import os
+import logging
+import uuid
+
+import orjson
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import declarative_base
-from dotenv import load_dotenv
+from app.config import DATABASE_URL  # Loaded from .env by app.config (defaults to SQLite for MVP)
+
+logger = logging.getLogger(__name__)
 
-load_dotenv()
 
-# Database URL from environment variable (default to SQLite for MVP)
-DATABASE_URL = os.getenv("DATABASE_URL", "sqlite+aiosqlite:///./portfolio.db")
+def _orjson_serializer(value) -> str:
+    """Serialize JSON column values with orjson (SQLAlchemy expects str)."""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
 
 # Create async engine
 engine = create_async_engine(
@@ -19,9 +26,33 @@ engine = create_async_engine(
     pool_size=10,  # Maximum number of connections to maintain in the pool
     max_overflow=20,  # Maximum overflow connections beyond pool_size
     # SQLite-specific settings for better concurrency
-    connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {}
+    connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {},
+    # orjson is several times faster than stdlib json for the large portfolio blobs.
+    # The PostgreSQL dialects (psycopg, asyncpg) register these same callables
+    # as their json/jsonb codecs, so no per-driver hook is needed.
+    json_serializer=_orjson_serializer,
+    json_deserializer=orjson.loads,
 )
 
+
+if engine.dialect.name == "sqlite":
+    @event.listens_for(engine.sync_engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        """
+        Tune every new SQLite connection once, when the pool opens it.
+
+        WAL lets readers proceed while a writer commits, and synchronous=NORMAL
+        is durable in WAL mode without an fsync on every commit.
+        """
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA mmap_size=268435456")  # 256MB
+        cursor.execute("PRAGMA cache_size=-64000")  # ~64MB
+        cursor.execute("PRAGMA busy_timeout=5000")
+        cursor.close()
+
 # Create async session factory
 AsyncSessionLocal = async_sessionmaker(
     engine,
@@ -55,6 +86,107 @@ async def get_db() -> AsyncSession:
             await session.close()
 
 
+async def get_db_ro() -> AsyncSession:
+    """
+    Read-only variant of get_db for GET routes that never write.
+
+    The session is rolled back instead of committed, and on SQLite the
+    connection is put in query_only mode for the duration of the request so
+    an accidental write fails loudly. Routes that also depend on
+    get_current_user should keep using get_db so the request shares a
+    single session.
+    """
+    async with AsyncSessionLocal() as session:
+        conn = None
+        if engine.dialect.name == "sqlite":
+            # Hold the session's connection so the reset below runs on the
+            # same pooled connection, before rollback hands it back
+            conn = await session.connection()
+            await conn.exec_driver_sql("PRAGMA query_only = 1")
+        try:
+            yield session
+        finally:
+            if conn is not None:
+                await conn.exec_driver_sql("PRAGMA query_only = 0")
+            await session.rollback()
+
+
+# Bump whenever the ORM models add tables or the one-time upgrade below gains a
+# step, so existing SQLite files pick them up
+SCHEMA_VERSION = 4
+
+# UUIDBinary key columns on SQLite. Files that create_all built before those
+# keys became 16-byte BLOBs still hold the 36-character text form
+_SQLITE_UUID_KEY_COLUMNS = {
+    "portfolios": ("id", "current_version_id"),
+    "portfolio_versions": ("id", "portfolio_id"),
+    "portfolio_github_repos": ("id", "portfolio_id"),
+}
+
+
+def _convert_text_uuid_keys(connection):
+    """
+    Rewrite text UUID keys as the 16 raw bytes UUIDBinary binds on SQLite.
+
+    Alembic revision 006_uuid_blob_keys does this for migrated databases;
+    this covers files that only ever went through init_db. A BLOB stored in
+    a VARCHAR column keeps its storage class, so no table rebuild is needed.
+    """
+    for table, columns in _SQLITE_UUID_KEY_COLUMNS.items():
+        for column in columns:
+            values = connection.exec_driver_sql(
+                f"SELECT DISTINCT {column} FROM {table} WHERE typeof({column}) = 'text'"
+            ).scalars().all()
+            params = []
+            for value in values:
+                try:
+                    params.append((uuid.UUID(value).bytes, value))
+                except ValueError:
+                    logger.warning("Leaving malformed key %r in %s.%s as text", value, table, column)
+            if params:
+                connection.exec_driver_sql(
+                    f"UPDATE {table} SET {column} = ? WHERE {column} = ?", params
+                )
+
+
+def _backfill_github_repos(connection):
+    """
+    Shred portfolios.github_data into portfolio_github_repos rows.
+
+    Alembic revision 012_portfolio_github_repos does this for migrated
+    databases; create_all only adds the empty table. Portfolios that already
+    have repo rows are left alone.
+    """
+    rows = connection.exec_driver_sql(
+        "SELECT id, github_data FROM portfolios "
+        "WHERE github_data IS NOT NULL "
+        "AND NOT EXISTS (SELECT 1 FROM portfolio_github_repos WHERE portfolio_id = portfolios.id)"
+    ).all()
+    params = []
+    for portfolio_id, github_data in rows:
+        for repo in orjson.loads(github_data) or []:
+            structure = repo.get("structure")
+            params.append((
+                uuid.uuid4().bytes,
+                portfolio_id,
+                repo.get("name") or "",
+                repo.get("description"),
+                repo.get("primary_language"),
+                repo.get("last_updated"),
+                repo.get("github_url"),
+                repo.get("readme_text"),
+                repo.get("readme_length"),
+                _orjson_serializer(structure) if structure is not None else None,
+            ))
+    if params:
+        connection.exec_driver_sql(
+            "INSERT INTO portfolio_github_repos (id, portfolio_id, name, description, primary_language, "
+            "last_updated, github_url, readme_text, readme_length, structure) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            params,
+        )
+
+
 async def init_db():
     """
     Initialize database tables.
@@ -62,10 +194,27 @@ async def init_db():
 
     NOTE: For production, use Alembic migrations instead.
     This is useful for quick setup and testing.
+
+    On SQLite, PRAGMA user_version records that create_all already ran, so
+    later startups cost one probe instead of one existence check per table.
+    Older files are brought up to date once, including converting legacy
+    text UUID keys to the binary form the models now bind and filling
+    portfolio_github_repos from github_data.
     """
     async with engine.begin() as conn:
+        is_sqlite = conn.dialect.name == "sqlite"
+        if is_sqlite:
+            user_version = (await conn.exec_driver_sql("PRAGMA user_version")).scalar()
+            if user_version >= SCHEMA_VERSION:
+                return
+
         await conn.run_sync(Base.metadata.create_all)
 
+        if is_sqlite:
+            await conn.run_sync(_convert_text_uuid_keys)
+            await conn.run_sync(_backfill_github_repos)
+            await conn.exec_driver_sql(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
 
 async def close_db():
     """
@@ -0,0 +1,93 @@
+"""Shared outbound HTTP client for GitHub, Codeforces and LeetCode calls"""
+import asyncio
+import random
+from typing import Optional
+
+import httpx
+
+# One pooled client for the whole process: keep-alive connections (and HTTP/2
+# multiplexing to api.github.com) are reused across requests instead of paying
+# a TCP + TLS handshake for every external call. Accept-Encoding is left to
+# httpx, which advertises gzip/deflate plus br whenever the brotli extra is
+# installed; forcing it by hand would request encodings we cannot decode.
+_client: Optional[httpx.AsyncClient] = None
+
+# Upstream responses worth retrying: rate limiting and gateway/overload errors
+RETRY_STATUS_CODES = frozenset({429, 502, 503, 504})
+MAX_STATUS_RETRIES = 2
+RETRY_BACKOFF_BASE = 0.5  # Seconds; doubled on each attempt
+MAX_RETRY_DELAY = 5.0  # Longer Retry-After waits are returned to the caller as-is
+
+
+def _retry_delay(response: httpx.Response, attempt: int) -> Optional[float]:
+    """
+    Seconds to wait before retrying, or None if the wait is too long.
+
+    Honours a numeric Retry-After header; otherwise uses exponential backoff
+    with full jitter so concurrent callers do not retry in lockstep.
+    """
+    retry_after = response.headers.get("Retry-After", "")
+    if retry_after.isdigit():
+        delay = float(retry_after)
+        return delay if delay <= MAX_RETRY_DELAY else None
+    return random.uniform(0, RETRY_BACKOFF_BASE * 2 ** attempt)
+
+
+class RetryTransport(httpx.AsyncBaseTransport):
+    """
+    Wraps a transport and retries responses in RETRY_STATUS_CODES.
+
+    Connection failures are retried by the wrapped AsyncHTTPTransport itself.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, max_retries: int = MAX_STATUS_RETRIES):
+        self._transport = transport
+        self._max_retries = max_retries
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        for attempt in range(self._max_retries + 1):
+            response = await self._transport.handle_async_request(request)
+            if response.status_code not in RETRY_STATUS_CODES or attempt == self._max_retries:
+                return response
+            delay = _retry_delay(response, attempt)
+            if delay is None:
+                return response
+            await response.aclose()
+            await asyncio.sleep(delay)
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Return the shared AsyncClient, creating it on first use.
+
+    Callers pass per-request headers and timeouts; the client itself only
+    carries connection pooling and retry settings.
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            timeout=10.0,
+            transport=RetryTransport(
+                httpx.AsyncHTTPTransport(
+                    http2=True,
+                    retries=2,  # Connection failures; RetryTransport handles 429/5xx
+                    limits=httpx.Limits(max_keepalive_connections=50, max_connections=200),
+                ),
+            ),
+        )
+    return _client
+
+
+async def close_http_client():
+    """
+    Close the shared client.
+    Call this on application shutdown.
+    """
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
@@ -1,4 +1,8 @@
-from fastapi import FastAPI
+from pathlib import Path
+
+import orjson
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from contextlib import asynccontextmanager
@@ -12,22 +16,27 @@ from app.routers import (
     portfolio_router,
     portfolio_generation_router,
     portfolio_retrieval_router,
-    portfolio_editing_router,
     portfolio_refinement_router,
     career_bot_router,
     jd_match_router
 )
-from app.config import logger
+from app.config import ALEMBIC_MANAGED, CORS_ORIGINS, logger
 from app.database import init_db, close_db
+from app.http_client import close_http_client
+from app.utils.file_parser import shutdown_process_pool
+from app.utils.upstream import UpstreamError
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Lifecycle manager for database connections"""
-    # Startup: Initialize database
-    logger.info("Initializing database...")
-    await init_db()
-    logger.info("Database initialized successfully")
+    """Lifecycle manager for database connections and the shared HTTP client"""
+    # Startup: Initialize database (Alembic-managed deployments already have the schema)
+    if ALEMBIC_MANAGED:
+        logger.info("ALEMBIC_MANAGED set, skipping database initialization")
+    else:
+        logger.info("Initializing database...")
+        await init_db()
+        logger.info("Database initialized successfully")
 
     yield
 
@@ -36,6 +45,12 @@ async def lifespan(app: FastAPI):
     await close_db()
     logger.info("Database connections closed")
 
+    # Shutdown: Close the shared outbound HTTP client
+    await close_http_client()
+
+    # Shutdown: Stop the upload extraction worker processes
+    shutdown_process_pool()
+
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -44,16 +59,23 @@ app = FastAPI(
     version="2.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
-    lifespan=lifespan
+    lifespan=lifespan,
+    # orjson encodes the large portfolio payloads several times faster than stdlib json
+    default_response_class=ORJSONResponse
 )
 
-# CORS configuration for frontend integration
+# External API failures raised through app.utils.upstream
+@app.exception_handler(UpstreamError)
+async def upstream_error_handler(request: Request, exc: UpstreamError):
+    return ORJSONResponse(status_code=exc.status_code, content={"detail": exc.detail})
+
+# CORS configuration for frontend integration (explicit lists, no wildcard matching)
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # Update with specific origins in production
+    allow_origins=CORS_ORIGINS,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "PATCH", "DELETE"],
+    allow_headers=["authorization", "content-type"],
 )
 
 # Mount static files (CSS, JS, images)
@@ -61,11 +83,27 @@ app.mount("/static", StaticFiles(directory="app/static"), name="static")
 
 # Mount frontend build (for production)
 # The frontend build will be in frontend/dist after running npm run build
+import mimetypes
 import os
 from fastapi.responses import FileResponse
 
-if os.path.exists("frontend/dist"):
-    app.mount("/assets", StaticFiles(directory="frontend/dist/assets"), name="frontend-assets")
+# Resolved once at import; the SPA shells are tiny and served from memory
+FRONTEND_DIST = Path("frontend/dist") if Path("frontend/dist").exists() else None
+INDEX_HTML_BYTES = (FRONTEND_DIST / "index.html").read_bytes() if FRONTEND_DIST else b""
+DISPLAY_HTML_BYTES = (FRONTEND_DIST / "display.html").read_bytes() if FRONTEND_DIST else b""
+
+# Relative path -> (absolute path, media type) for every file in the build,
+# so the catch-all route never has to stat the filesystem
+FRONTEND_FILES = {}
+if FRONTEND_DIST:
+    for dirpath, _dirnames, filenames in os.walk(FRONTEND_DIST):
+        for filename in filenames:
+            full = Path(dirpath) / filename
+            rel_path = full.relative_to(FRONTEND_DIST).as_posix()
+            FRONTEND_FILES[rel_path] = (str(full), mimetypes.guess_type(filename)[0])
+
+if FRONTEND_DIST:
+    app.mount("/assets", StaticFiles(directory=FRONTEND_DIST / "assets"), name="frontend-assets")
 
 # Register routers
 # Auth router (under /api to avoid clash with frontend /auth path)
@@ -82,7 +120,7 @@ app.include_router(leetcode_router.router)
 app.include_router(portfolio_router.router, prefix="/portfolio")  # Slug generation
 app.include_router(portfolio_generation_router.router)  # Portfolio generation orchestrator
 app.include_router(portfolio_retrieval_router.router)  # GET endpoints (retrieve portfolios)
-# app.include_router(portfolio_editing_router.router)  # PATCH/POST endpoints (edit/refine) - DEPRECATED: Use portfolio_refinement_router instead
+# portfolio_editing_router (PATCH/POST edit/refine) is DEPRECATED and no longer imported: use portfolio_refinement_router instead
 app.include_router(portfolio_refinement_router.router)  # AI-assisted refinement
 
 # AI Career Bot
@@ -95,78 +133,82 @@ logger.info("FastAPI application initialized with all routers")
 # API health check is still available at /health
 
 
+# Static payload, serialized once at import instead of on every probe
+_HEALTH_BYTES = orjson.dumps({
+    "status": "healthy",
+    "version": "2.0.0",
+    "endpoints": {
+        "data_extraction": {
+            "linkedin": "/upload/linkedin",
+            "resume": "/upload/resume",
+            "github": "/github/analyze",
+            "codeforces": "/codeforces/{username}",
+            "leetcode": "/leetcode/{username}"
+        },
+        "portfolio": {
+            "generate": "/portfolio/generate",
+            "retrieve": "/portfolio/{slug}",
+            "view_html": "/portfolio/{slug}/view",
+            "coaching": "/portfolio/{slug}/coaching",
+            "status": "/portfolio/{slug}/status",
+            "edit": "/portfolio/{slug}",
+            "refine": "/portfolio/{slug}/refine",
+            "confirm": "/portfolio/{slug}/confirm",
+            "revert": "/portfolio/{slug}/revert",
+            "versions": "/portfolio/{slug}/versions",
+            "restore": "/portfolio/{slug}/versions/{version_id}/restore",
+            "slug_generator": "/portfolio/"
+        },
+        "career_bot": {
+            "chat": "/career-bot/chat",
+            "history": "/career-bot/history",
+            "clear_history": "/career-bot/history (DELETE)"
+        }
+    },
+    "features": [
+        "AI-powered portfolio generation",
+        "Code quality analysis",
+        "Multi-source data aggregation",
+        "Private coaching insights",
+        "AI career coaching chatbot"
+    ]
+})
+
+
 @app.get("/health", tags=["Health"])
 async def health_check():
     """Health check endpoint for monitoring"""
-    return {
-        "status": "healthy",
-        "version": "2.0.0",
-        "endpoints": {
-            "data_extraction": {
-                "linkedin": "/upload/linkedin",
-                "resume": "/upload/resume",
-                "github": "/github/analyze",
-                "codeforces": "/codeforces/{username}",
-                "leetcode": "/leetcode/{username}"
-            },
-            "portfolio": {
-                "generate": "/portfolio/generate",
-                "retrieve": "/portfolio/{slug}",
-                "view_html": "/portfolio/{slug}/view",
-                "coaching": "/portfolio/{slug}/coaching",
-                "status": "/portfolio/{slug}/status",
-                "edit": "/portfolio/{slug}",
-                "refine": "/portfolio/{slug}/refine",
-                "confirm": "/portfolio/{slug}/confirm",
-                "revert": "/portfolio/{slug}/revert",
-                "versions": "/portfolio/{slug}/versions",
-                "restore": "/portfolio/{slug}/versions/{version_id}/restore",
-                "slug_generator": "/portfolio/"
-            },
-            "career_bot": {
-                "chat": "/career-bot/chat",
-                "history": "/career-bot/history",
-                "clear_history": "/career-bot/history (DELETE)"
-            }
-        },
-        "features": [
-            "AI-powered portfolio generation",
-            "Code quality analysis",
-            "Multi-source data aggregation",
-            "Private coaching insights",
-            "AI career coaching chatbot"
-        ]
-    }
+    return Response(_HEALTH_BYTES, media_type="application/json")
 
 
 # Frontend routes (MUST be last - after all API routers)
-if os.path.exists("frontend/dist"):
-    @app.get("/refine/{slug}")
+if FRONTEND_DIST:
+    @app.get("/refine/{slug}", include_in_schema=False)
     async def serve_refine_page(slug: str):
         """Serve the refinement UI"""
-        return FileResponse("frontend/dist/index.html")
+        return Response(INDEX_HTML_BYTES, media_type="text/html")
     
-    @app.get("/view/{slug}")
+    @app.get("/view/{slug}", include_in_schema=False)
     async def serve_portfolio_view(slug: str):
         """Serve the public portfolio view UI"""
-        return FileResponse("frontend/dist/index.html")
+        return Response(INDEX_HTML_BYTES, media_type="text/html")
     
-    @app.get("/display/{slug}")
+    @app.get("/display/{slug}", include_in_schema=False)
     async def serve_portfolio_display(slug: str):
         """Serve the isolated portfolio display UI (MPA)"""
-        return FileResponse("frontend/dist/display.html")
+        return Response(DISPLAY_HTML_BYTES, media_type="text/html")
     
-    @app.get("/{full_path:path}")
+    # Block API endpoints from being served as frontend
+    API_PREFIXES = ("api/", "docs", "redoc", "openapi.json", "health",
+                    "upload/", "github/", "codeforces/", "leetcode/")
+
+    @app.get("/{full_path:path}", include_in_schema=False)
     async def serve_frontend(full_path: str):
         """Serve frontend for all other routes (must be last)"""
-        # Block API endpoints from being served as frontend
-        api_prefixes = ("api/", "docs", "redoc", "openapi.json", "health", 
-                       "upload/", "github/", "codeforces/", "leetcode/")
-        
-        if full_path.startswith(api_prefixes):
+        if full_path.startswith(API_PREFIXES):
             return {"error": "Not found"}
         
-        file_path = f"frontend/dist/{full_path}"
-        if os.path.exists(file_path) and os.path.isfile(file_path):
-            return FileResponse(file_path)
-        return FileResponse("frontend/dist/index.html")
+        hit = FRONTEND_FILES.get(full_path)
+        if hit:
+            return FileResponse(hit[0], media_type=hit[1])
+        return Response(INDEX_HTML_BYTES, media_type="text/html")
@@ -2,10 +2,11 @@
 import uuid
 from datetime import datetime
 from enum import Enum as PyEnum
-from sqlalchemy import Column, String, Boolean, Text, DateTime, Integer, ForeignKey, Index, Enum
-from sqlalchemy.dialects.postgresql import UUID as PGUUID
+from sqlalchemy import Column, String, Boolean, Text, DateTime, Integer, ForeignKey, Index, Enum, LargeBinary, func, text
+from sqlalchemy.dialects.postgresql import JSONB, UUID as PGUUID
 from sqlalchemy.dialects.sqlite import JSON as SQLiteJSON
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import deferred, relationship
+from sqlalchemy.types import TypeDecorator
 from app.database import Base
 
 
@@ -23,11 +24,68 @@ class VersionCreatedBy(str, PyEnum):
     AI_REFINEMENT = "ai_refinement"
 
 
+# JSON column type: binary JSONB on PostgreSQL (parsed once on write),
+# SQLite's JSON elsewhere
+JSONType = SQLiteJSON().with_variant(JSONB(), "postgresql")
+
+
 # Use UUID type that works with both PostgreSQL and SQLite
 def get_uuid():
+    # Keep the hyphenated form: a freshly inserted object keeps its default
+    # value in the session, so it has to match what UUIDBinary reads back and
+    # what API responses and RAG payloads already carry. Storage is compact
+    # regardless (16 bytes on SQLite via UUIDBinary, native uuid on
+    # PostgreSQL). For the remaining String(36) keys, uuid4().hex would save
+    # only 4 bytes per key while mixing two id formats in existing rows.
     return str(uuid.uuid4())
 
 
+class UUIDBinary(TypeDecorator):
+    """
+    UUID stored as 16 raw bytes on SQLite, native UUID on PostgreSQL
+    (String(36) elsewhere).
+
+    Python code keeps seeing the canonical hyphenated string, but B-tree
+    indexes and joins compare 16 bytes per key instead of 36.
+    """
+    impl = String(36)
+    cache_ok = True
+
+    # Bound in place of malformed ids on PostgreSQL, where the uuid type would
+    # reject them; uuid4() never generates it, so it matches no row
+    _NO_MATCH = "00000000-0000-0000-0000-000000000000"
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "sqlite":
+            return dialect.type_descriptor(LargeBinary(16))
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(PGUUID(as_uuid=False))
+        return dialect.type_descriptor(String(36))
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return value
+        if dialect.name == "sqlite":
+            try:
+                return uuid.UUID(str(value)).bytes
+            except ValueError:
+                # Malformed ids (e.g. from a URL) are never 16 bytes, so match no row
+                return str(value).encode()
+        if dialect.name == "postgresql":
+            try:
+                return str(uuid.UUID(str(value)))
+            except ValueError:
+                return self._NO_MATCH
+        return value
+
+    def process_result_value(self, value, dialect):
+        if value is None or isinstance(value, str):
+            return value
+        if dialect.name == "sqlite":
+            return str(uuid.UUID(bytes=value))
+        return str(value)
+
+
 class User(Base):
     """User table for GitHub authentication"""
     __tablename__ = "users"
@@ -39,15 +97,17 @@ class User(Base):
     avatar_url = Column(String(255), nullable=True)
     access_token = Column(String(255), nullable=True)
 
-    # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    # Timestamps (database-side, see Portfolio.created_at)
+    created_at = Column(DateTime, default=func.current_timestamp(), nullable=False)
+    updated_at = Column(DateTime, default=func.current_timestamp(), onupdate=func.current_timestamp(), nullable=False)
 
     # Relationships
     portfolios = relationship("Portfolio", back_populates="user")
     conversations = relationship("Conversation", back_populates="user", cascade="all, delete-orphan")
     chat_messages = relationship("ChatMessage", back_populates="user", cascade="all, delete-orphan")
 
+    __mapper_args__ = {"eager_defaults": True}
+
     def __repr__(self):
         return f"<User(username='{self.username}', github_id='{self.github_id}')>"
 
@@ -57,7 +117,7 @@ class Portfolio(Base):
     __tablename__ = "portfolios"
 
     # Primary key
-    id = Column(String(36), primary_key=True, default=get_uuid)
+    id = Column(UUIDBinary, primary_key=True, default=get_uuid)
 
     # Portfolio identification
     slug = Column(String(100), unique=True, nullable=False, index=True)
@@ -83,16 +143,21 @@ class Portfolio(Base):
     has_leetcode = Column(Boolean, default=False)
 
     # Raw input data (stored as JSON)
-    linkedin_data = Column(SQLiteJSON, nullable=True)
-    resume_text = Column(Text, nullable=True)
-    github_data = Column(SQLiteJSON, nullable=True)
-    codeforces_data = Column(SQLiteJSON, nullable=True)
-    leetcode_data = Column(SQLiteJSON, nullable=True)
+    # The large payloads are deferred into the "payload" group so list and
+    # status queries don't fetch them; readers opt in with
+    # undefer_group("payload") (async sessions cannot lazy-load them)
+    linkedin_data = deferred(Column(JSONType, nullable=True), group="payload")
+    resume_text = deferred(Column(Text, nullable=True), group="payload")
+    # Deprecated for queries: kept for existing readers, while per-repo
+    # filters and aggregates go through the portfolio_github_repos rows
+    github_data = deferred(Column(JSONType, nullable=True), group="payload")
+    codeforces_data = Column(JSONType, nullable=True)
+    leetcode_data = Column(JSONType, nullable=True)
 
     # Generated output (stored as JSON)
-    public_portfolio_json = Column(SQLiteJSON, nullable=True)
-    private_coaching_json = Column(SQLiteJSON, nullable=True)
-    ai_generation_metadata = Column(SQLiteJSON, nullable=True)
+    public_portfolio_json = deferred(Column(JSONType, nullable=True), group="payload")
+    private_coaching_json = deferred(Column(JSONType, nullable=True), group="payload")
+    ai_generation_metadata = deferred(Column(JSONType, nullable=True), group="payload")
 
     # Error tracking
     error_message = Column(Text, nullable=True)
@@ -101,18 +166,25 @@ class Portfolio(Base):
     user_id = Column(String(36), ForeignKey("users.id"), nullable=True)
 
     # Current version reference
-    current_version_id = Column(String(36), ForeignKey("portfolio_versions.id"), nullable=True)
+    current_version_id = Column(UUIDBinary, ForeignKey("portfolio_versions.id"), nullable=True)
 
     # Timestamps
     generation_started_at = Column(DateTime, nullable=True)
     generation_completed_at = Column(DateTime, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    # Rendered inline as CURRENT_TIMESTAMP (UTC on SQLite), so the database
+    # fills these in; eager_defaults fetches them back via RETURNING
+    created_at = Column(DateTime, default=func.current_timestamp(), nullable=False)
+    updated_at = Column(DateTime, default=func.current_timestamp(), onupdate=func.current_timestamp(), nullable=False)
 
     # Relationships
     user = relationship("User", back_populates="portfolios")
-    versions = relationship("PortfolioVersion", back_populates="portfolio", foreign_keys="PortfolioVersion.portfolio_id", cascade="all, delete-orphan")
+    # lazy="raise": version lists are queried directly or opted into per query
+    # with selectinload(Portfolio.versions), never lazily loaded (N+1)
+    versions = relationship("PortfolioVersion", back_populates="portfolio", foreign_keys="PortfolioVersion.portfolio_id", cascade="all, delete-orphan", lazy="raise")
     current_version = relationship("PortfolioVersion", foreign_keys=[current_version_id], uselist=False, post_update=True)
+    github_repos = relationship("PortfolioGithubRepo", back_populates="portfolio", cascade="all, delete-orphan", lazy="raise")
+
+    __mapper_args__ = {"eager_defaults": True}
 
     # Indexes for performance
     __table_args__ = (
@@ -130,41 +202,83 @@ class PortfolioVersion(Base):
     __tablename__ = "portfolio_versions"
 
     # Primary key
-    id = Column(String(36), primary_key=True, default=get_uuid)
+    id = Column(UUIDBinary, primary_key=True, default=get_uuid)
 
     # Foreign key to portfolio
-    portfolio_id = Column(String(36), ForeignKey("portfolios.id"), nullable=False)
+    portfolio_id = Column(UUIDBinary, ForeignKey("portfolios.id"), nullable=False)
 
     # Version tracking
     version_number = Column(Integer, nullable=False)
     version_state = Column(Enum(VersionState), default=VersionState.DRAFT, nullable=False)
 
     # Snapshot of portfolio content at this version
-    public_portfolio_json = Column(SQLiteJSON, nullable=False)
-    private_coaching_json = Column(SQLiteJSON, nullable=True)
+    public_portfolio_json = Column(JSONType, nullable=False)
+    private_coaching_json = Column(JSONType, nullable=True)
 
     # Version metadata
     changes_summary = Column(Text, nullable=True)
     created_by = Column(Enum(VersionCreatedBy), default=VersionCreatedBy.AI, nullable=False)
 
-    # Timestamp
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    # Timestamp (database-side, see Portfolio.created_at)
+    created_at = Column(DateTime, default=func.current_timestamp(), nullable=False)
 
     # Relationships
-    portfolio = relationship("Portfolio", back_populates="versions", foreign_keys=[portfolio_id])
+    portfolio = relationship("Portfolio", back_populates="versions", foreign_keys=[portfolio_id], lazy="raise")
+
+    __mapper_args__ = {"eager_defaults": True}
 
     # Indexes for performance
     __table_args__ = (
-        Index('idx_version_portfolio_id', 'portfolio_id'),
-        Index('idx_version_state', 'version_state'),
+        # Partial index: only in-flight drafts are indexed (Enum stores member names)
+        Index(
+            'idx_version_draft', 'portfolio_id',
+            sqlite_where=text("version_state = 'DRAFT'"),
+            postgresql_where=text("version_state = 'DRAFT'"),
+        ),
         Index('idx_version_created_at', 'created_at'),
-        Index('idx_version_portfolio_number', 'portfolio_id', 'version_number'),
+        # Covers "latest version of portfolio X" as an index-only seek
+        # (PostgreSQL also INCLUDEs the version-list metadata for index-only scans)
+        Index(
+            'idx_version_portfolio_covering', 'portfolio_id', version_number.desc(), 'version_state', 'id',
+            postgresql_include=['created_by', 'created_at', 'changes_summary'],
+        ),
     )
 
     def __repr__(self):
         return f"<PortfolioVersion(portfolio_id='{self.portfolio_id}', version={self.version_number})>"
 
 
+class PortfolioGithubRepo(Base):
+    """One analyzed GitHub repository of a portfolio (shredded from github_data)"""
+    __tablename__ = "portfolio_github_repos"
+
+    # Primary key
+    id = Column(UUIDBinary, primary_key=True, default=get_uuid)
+
+    # Foreign key to portfolio
+    portfolio_id = Column(UUIDBinary, ForeignKey("portfolios.id"), nullable=False)
+
+    # Fields of GitHubRepoAnalysis
+    name = Column(String(200), nullable=False)
+    description = Column(Text, nullable=True)
+    primary_language = Column(String(50), nullable=True)
+    last_updated = Column(String(50), nullable=True)
+    github_url = Column(String(255), nullable=True)
+    readme_text = Column(Text, nullable=True)
+    readme_length = Column(Integer, nullable=True)
+    structure = Column(JSONType, nullable=True)  # Rarely filtered on, so left as JSON
+
+    # Relationships
+    portfolio = relationship("Portfolio", back_populates="github_repos", lazy="raise")
+
+    __table_args__ = (
+        Index('idx_github_repo_portfolio_language', 'portfolio_id', 'primary_language'),
+    )
+
+    def __repr__(self):
+        return f"<PortfolioGithubRepo(portfolio_id='{self.portfolio_id}', name='{self.name}')>"
+
+
 class Conversation(Base):
     """An isolated Career Coach conversation owned by one user."""
     __tablename__ = "conversations"
@@ -1,6 +1,6 @@
 """Pydantic schemas for portfolio generation endpoints"""
 from typing import Optional, List, Dict, Any
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class PortfolioGenerateResponse(BaseModel):
@@ -12,8 +12,8 @@ class PortfolioGenerateResponse(BaseModel):
     private_coaching_url: str = Field(description="URL to access private coaching")
     generation_time_seconds: float = Field(description="Time taken to generate portfolio")
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "portfolio_id": "550e8400-e29b-41d4-a716-446655440000",
                 "slug": "john-doe-29fa2b",
@@ -22,7 +22,8 @@ class PortfolioGenerateResponse(BaseModel):
                 "private_coaching_url": "/portfolio/john-doe-29fa2b/coaching",
                 "generation_time_seconds": 12.5
             }
-        }
+        },
+    )
 
 
 class PortfolioRefineRequest(BaseModel):
@@ -36,13 +37,14 @@ class PortfolioRefineRequest(BaseModel):
         description="Instruction for refinement (e.g., 'make it more concise')"
     )
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "section": "professional_summary",
                 "instruction": "make it more concise and emphasize backend skills"
             }
-        }
+        },
+    )
 
 
 class PortfolioRefineResponse(BaseModel):
@@ -51,14 +53,15 @@ class PortfolioRefineResponse(BaseModel):
     refined_content: str = Field(description="Refined content")
     version_created: bool = Field(description="Whether a new version was created")
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "section": "professional_summary",
                 "refined_content": "Experienced backend engineer with 5 years...",
                 "version_created": True
             }
-        }
+        },
+    )
 
 
 class PortfolioEditRequest(BaseModel):
@@ -71,8 +74,8 @@ class PortfolioEditRequest(BaseModel):
         description="Optional summary of changes made"
     )
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "updates": {
                     "professional_summary": "Updated summary text...",
@@ -80,7 +83,8 @@ class PortfolioEditRequest(BaseModel):
                 },
                 "changes_summary": "Updated summary and key strengths"
             }
-        }
+        },
+    )
 
 
 class PortfolioVersionListResponse(BaseModel):
@@ -88,8 +92,8 @@ class PortfolioVersionListResponse(BaseModel):
     versions: List[Dict[str, Any]] = Field(description="List of portfolio versions")
     total_count: int = Field(description="Total number of versions")
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "versions": [
                     {
@@ -109,7 +113,8 @@ class PortfolioVersionListResponse(BaseModel):
                 ],
                 "total_count": 2
             }
-        }
+        },
+    )
 
 
 class PortfolioErrorResponse(BaseModel):
@@ -125,12 +130,13 @@ class PortfolioErrorResponse(BaseModel):
         description="Portfolio ID if partially created"
     )
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "error": "Portfolio generation failed",
                 "details": "External API timeout",
                 "failed_sources": ["github", "codeforces"],
                 "portfolio_id": "550e8400-e29b-41d4-a716-446655440000"
             }
-        }
+        },
+    )
@@ -1,7 +1,12 @@
+import re
 from typing import Optional
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from typing import List
 
+# https://github.com/owner/repo, capturing (owner, repo); compiled once and
+# shared with github_service. GitHub owner/repo names are ASCII-only
+GITHUB_URL_RE = re.compile(r'^https?://github\.com/([\w\-\.]+)/([\w\-\.]+)/?$', re.ASCII)
+
 
 class LinkedInResponse(BaseModel):
     """Response model for LinkedIn profile parsing"""
@@ -22,15 +27,16 @@ class LinkedInResponse(BaseModel):
         description="Skills section content"
     )
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "summary": "Experienced software engineer with 5 years...",
                 "experience_raw": "Senior Developer at Tech Corp\n2020-Present...",
                 "education_raw": "BS Computer Science\nStanford University...",
                 "skills_raw": "Python, JavaScript, React, FastAPI..."
             }
-        }
+        },
+    )
 
 
 class ResumeResponse(BaseModel):
@@ -39,12 +45,13 @@ class ResumeResponse(BaseModel):
         description="Full extracted text from resume"
     )
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "resume_text": "Marcus Johnson\nSoftware Engineer\n\nExperience:\n..."
             }
-        }
+        },
+    )
 
 
 class ErrorResponse(BaseModel):
@@ -53,12 +60,13 @@ class ErrorResponse(BaseModel):
         description="Error message describing what went wrong"
     )
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "detail": "File type not allowed. Accepted formats: .pdf, .docx"
             }
-        }
+        },
+    )
 
 
 class CodeforcesResponse(BaseModel):
@@ -85,8 +93,8 @@ class CodeforcesResponse(BaseModel):
         description="Unique problems solved"
     )
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "username": "tourist",
                 "current_rating": 3858,
@@ -95,11 +103,32 @@ class CodeforcesResponse(BaseModel):
                 "contest_count": 156,
                 "problems_solved": 2847
             }
-        }
+        },
+    )
 
 
 # GitHub Analyzer Models
 
+# Shared OpenAPI examples: the nested repo example appears in three schemas
+_EXAMPLE_STRUCTURE = {
+    "files": 42,
+    "folders": 15,
+    "max_depth": 5,
+    "top_dirs": ["src", "tests", "docs"],
+    "largest_file_kb": 125.5,
+    "has_tests": True
+}
+
+_EXAMPLE_REPO = {
+    "name": "Hello-World",
+    "description": "My first repository on GitHub!",
+    "primary_language": "Python",
+    "last_updated": "2024-01-15T10:30:00Z",
+    "readme_text": "# Hello World\n\nThis is a sample project...",
+    "readme_length": 1250,
+    "structure": _EXAMPLE_STRUCTURE
+}
+
 class GitHubAnalyzeRequest(BaseModel):
     """Request model for GitHub repository analysis"""
     repos: List[str] = Field(
@@ -112,15 +141,10 @@ class GitHubAnalyzeRequest(BaseModel):
     @classmethod
     def validate_github_urls(cls, v: List[str]) -> List[str]:
         """Validate that all URLs are valid GitHub repository URLs"""
-        import re
-        github_pattern = re.compile(
-            r'^https?://github\.com/[\w\-\.]+/[\w\-\.]+/?$'
-        )
-        
         for url in v:
             # Remove trailing slash for validation
             clean_url = url.rstrip('/')
-            if not github_pattern.match(clean_url):
+            if not GITHUB_URL_RE.match(clean_url):
                 raise ValueError(
                     f"Invalid GitHub URL: {url}. "
                     "Expected format: https://github.com/owner/repo"
@@ -128,15 +152,16 @@ class GitHubAnalyzeRequest(BaseModel):
         
         return v
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "repos": [
                     "https://github.com/octocat/Hello-World",
                     "https://github.com/torvalds/linux"
                 ]
             }
-        }
+        },
+    )
 
 
 class RepositoryStructure(BaseModel):
@@ -148,17 +173,11 @@ class RepositoryStructure(BaseModel):
     largest_file_kb: float = Field(description="Largest file size in KB")
     has_tests: bool = Field(description="Whether repository contains test files")
     
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "files": 42,
-                "folders": 15,
-                "max_depth": 5,
-                "top_dirs": ["src", "tests", "docs"],
-                "largest_file_kb": 125.5,
-                "has_tests": True
-            }
-        }
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": _EXAMPLE_STRUCTURE
+        },
+    )
 
 
 class GitHubRepoAnalysis(BaseModel):
@@ -172,25 +191,11 @@ class GitHubRepoAnalysis(BaseModel):
     readme_length: int = Field(description="README character count")
     structure: RepositoryStructure = Field(description="Repository structure analysis")
     
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "name": "Hello-World",
-                "description": "My first repository on GitHub!",
-                "primary_language": "Python",
-                "last_updated": "2024-01-15T10:30:00Z",
-                "readme_text": "# Hello World\n\nThis is a sample project...",
-                "readme_length": 1250,
-                "structure": {
-                    "files": 42,
-                    "folders": 15,
-                    "max_depth": 5,
-                    "top_dirs": ["src", "tests", "docs"],
-                    "largest_file_kb": 125.5,
-                    "has_tests": True
-                }
-            }
-        }
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": _EXAMPLE_REPO
+        },
+    )
 
 
 class GitHubAnalyzeResponse(BaseModel):
@@ -199,29 +204,11 @@ class GitHubAnalyzeResponse(BaseModel):
         description="List of analyzed repositories"
     )
     
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "repos": [
-                    {
-                        "name": "Hello-World",
-                        "description": "My first repository on GitHub!",
-                        "primary_language": "Python",
-                        "last_updated": "2024-01-15T10:30:00Z",
-                        "readme_text": "# Hello World\n\nThis is a sample project...",
-                        "readme_length": 1250,
-                        "structure": {
-                            "files": 42,
-                            "folders": 15,
-                            "max_depth": 5,
-                            "top_dirs": ["src", "tests", "docs"],
-                            "largest_file_kb": 125.5,
-                            "has_tests": True
-                        }
-                    }
-                ]
-            }
-        }
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {"repos": [_EXAMPLE_REPO]}
+        },
+    )
 
 
 class LeetCodeResponse(BaseModel):
@@ -247,8 +234,8 @@ class LeetCodeResponse(BaseModel):
         description="LeetCode profile URL"
     )
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "username": "john_doe",
                 "total_solved": 450,
@@ -257,7 +244,8 @@ class LeetCodeResponse(BaseModel):
                 "hard_solved": 70,
                 "profile_url": "https://leetcode.com/john_doe"
             }
-        }
+        },
+    )
 
 
 class PortfolioRequest(BaseModel):
@@ -267,12 +255,13 @@ class PortfolioRequest(BaseModel):
         description="User's name to generate portfolio slug from"
     )
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "name": "Marcus Johnson"
             }
-        }
+        },
+    )
 
 
 class PortfolioResponse(BaseModel):
@@ -281,12 +270,10 @@ class PortfolioResponse(BaseModel):
         description="Generated portfolio URL path"
     )
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "portfolio_url": "/portfolio/marcus-johnson-29fa2b"
             }
-        }
-
-
-
+        },
+    )
@@ -1,7 +1,7 @@
 """Pydantic schemas for database models (API validation)"""
 from typing import Optional, Dict, Any, List
 from datetime import datetime
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class PortfolioBase(BaseModel):
@@ -52,8 +52,7 @@ class PortfolioInDB(PortfolioBase):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True  # Allows ORM models to be converted to Pydantic
+    model_config = ConfigDict(from_attributes=True)  # Allows ORM models to be converted to Pydantic
 
 
 class PortfolioPublic(BaseModel):
@@ -66,8 +65,7 @@ class PortfolioPublic(BaseModel):
     public_portfolio_url: str
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class PortfolioVersionBase(BaseModel):
@@ -90,8 +88,7 @@ class PortfolioVersionInDB(PortfolioVersionBase):
     id: str
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class PortfolioStatusResponse(BaseModel):
@@ -103,5 +100,14 @@ class PortfolioStatusResponse(BaseModel):
     generation_completed_at: Optional[datetime] = None
     error_message: Optional[str] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+
+
+class UserMe(BaseModel):
+    """Response schema for the authenticated user (/auth/me)"""
+    id: str
+    username: str
+    email: Optional[str] = None
+    avatar_url: Optional[str] = None
+
+    model_config = ConfigDict(from_attributes=True)
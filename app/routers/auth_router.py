@@ -1,10 +1,15 @@
-import httpx
+import asyncio
 from fastapi import APIRouter, Depends, HTTPException, status, Request
-from fastapi.responses import RedirectResponse
+from fastapi.responses import RedirectResponse, Response
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import bindparam, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.future import select
+from sqlalchemy.orm import load_only
 from app.database import get_db
 from app.models.database import User
+from app.models.schemas import UserMe
 from app.config import (
     GITHUB_CLIENT_ID,
     GITHUB_CLIENT_SECRET,
@@ -12,13 +17,44 @@ from app.config import (
     FRONTEND_URL,
     logger
 )
+from app.http_client import get_http_client
 from app.utils.auth import create_access_token, verify_token
+from app.utils.ttl_cache import TTLCache
 from fastapi.security import OAuth2PasswordBearer
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
+# Resolved users keyed by id, so authenticated requests don't pay a DB
+# round-trip each. Entries are detached User instances (sessions use
+# expire_on_commit=False) and are dropped on login, when the row changes.
+_user_cache = TTLCache(ttl=60.0, max_size=10_000)
+
+# Built once so the hot auth path reuses the compiled SQL (and, on
+# PostgreSQL, the driver's prepared statement) and only sends parameters
+_user_by_id_stmt = (
+    select(User)
+    .options(load_only(User.id, User.username, User.email, User.avatar_url, User.access_token))
+    .where(User.id == bindparam("uid"))
+)
+
+
+def _discard_task(task: asyncio.Task) -> None:
+    """
+    Cancel a task whose result is no longer needed.
+
+    If it already finished with an error, the done callback retrieves the
+    exception so asyncio doesn't log "Task exception was never retrieved".
+    """
+    task.cancel()
+    task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+
+def invalidate_cached_user(user_id: str) -> None:
+    """Drop a user from the auth cache after their row is updated."""
+    _user_cache.pop(user_id)
+
 
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
@@ -41,12 +77,17 @@ async def get_current_user(
     if user_id is None:
         raise credentials_exception
 
-    result = await db.execute(select(User).where(User.id == user_id))
+    cached_user = _user_cache.get(user_id)
+    if cached_user is not None:
+        return cached_user
+
+    result = await db.execute(_user_by_id_stmt, {"uid": user_id})
     user = result.scalars().first()
 
     if user is None:
         raise credentials_exception
 
+    _user_cache.set(user_id, user)
     return user
 
 
@@ -66,18 +107,18 @@ async def github_callback(code: str, db: AsyncSession = Depends(get_db)):
     Handle GitHub OAuth callback.
     """
     # 1. Exchange code for access token
-    async with httpx.AsyncClient() as client:
-        token_response = await client.post(
-            "https://github.com/login/oauth/access_token",
-            data={
-                "client_id": GITHUB_CLIENT_ID,
-                "client_secret": GITHUB_CLIENT_SECRET,
-                "code": code,
-                "redirect_uri": GITHUB_REDIRECT_URI,
-            },
-            headers={"Accept": "application/json"},
-        )
-        token_data = token_response.json()
+    client = get_http_client()
+    token_response = await client.post(
+        "https://github.com/login/oauth/access_token",
+        data={
+            "client_id": GITHUB_CLIENT_ID,
+            "client_secret": GITHUB_CLIENT_SECRET,
+            "code": code,
+            "redirect_uri": GITHUB_REDIRECT_URI,
+        },
+        headers={"Accept": "application/json"},
+    )
+    token_data = token_response.json()
 
     if "error" in token_data:
         logger.error(f"GitHub OAuth error: {token_data.get('error_description')}")
@@ -88,55 +129,54 @@ async def github_callback(code: str, db: AsyncSession = Depends(get_db)):
 
     access_token = token_data.get("access_token")
 
-    # 2. Get user info from GitHub
-    async with httpx.AsyncClient() as client:
-        user_response = await client.get(
-            "https://api.github.com/user",
-            headers={
-                "Authorization": f"token {access_token}",
-                "Accept": "application/json",
-            },
-        )
-        github_user = user_response.json()
-
-        # Get email if not public
-        if not github_user.get("email"):
-            email_response = await client.get(
-                "https://api.github.com/user/emails",
-                headers={
-                    "Authorization": f"token {access_token}",
-                    "Accept": "application/json",
-                },
-            )
-            emails = email_response.json()
-            primary_email = next((e["email"] for e in emails if e["primary"]), emails[0]["email"] if emails else None)
-            github_user["email"] = primary_email
+    # 2. Get user info from GitHub (profile and emails fetched concurrently,
+    # so a private email costs no extra round trip)
+    github_headers = {
+        "Authorization": f"token {access_token}",
+        "Accept": "application/json",
+    }
+    user_task = asyncio.create_task(client.get("https://api.github.com/user", headers=github_headers))
+    emails_task = asyncio.create_task(client.get("https://api.github.com/user/emails", headers=github_headers))
+    try:
+        github_user = (await user_task).json()
+    except BaseException:
+        _discard_task(emails_task)
+        raise
+
+    # Get email if not public; otherwise the emails request is not needed
+    if github_user.get("email"):
+        _discard_task(emails_task)
+    else:
+        emails = (await emails_task).json()
+        primary_email = next((e["email"] for e in emails if e["primary"]), emails[0]["email"] if emails else None)
+        github_user["email"] = primary_email
 
     # 3. Create or update user in database
     github_id = str(github_user.get("id"))
-    result = await db.execute(select(User).where(User.github_id == github_id))
-    user = result.scalars().first()
-
-    if not user:
-        user = User(
-            github_id=github_id,
-            username=github_user.get("login"),
-            email=github_user.get("email"),
-            avatar_url=github_user.get("avatar_url"),
-            access_token=access_token
+    profile = {
+        "username": github_user.get("login"),
+        "email": github_user.get("email"),
+        "avatar_url": github_user.get("avatar_url"),
+        "access_token": access_token,
+    }
+    # Single-statement upsert on the unique github_id (SQLite and PostgreSQL
+    # share the ON CONFLICT syntax), returning the id for the JWT
+    insert = pg_insert if db.bind.dialect.name == "postgresql" else sqlite_insert
+    stmt = (
+        insert(User)
+        .values(github_id=github_id, **profile)
+        .on_conflict_do_update(
+            index_elements=[User.github_id],
+            set_={**profile, "updated_at": func.current_timestamp()},
         )
-        db.add(user)
-    else:
-        user.username = github_user.get("login")
-        user.email = github_user.get("email")
-        user.avatar_url = github_user.get("avatar_url")
-        user.access_token = access_token
-
+        .returning(User.id)
+    )
+    user_id = (await db.execute(stmt)).scalar_one()
     await db.commit()
-    await db.refresh(user)
+    invalidate_cached_user(user_id)
 
     # 4. Create JWT and redirect to frontend
-    jwt_token = create_access_token(data={"sub": user.id})
+    jwt_token = create_access_token(data={"sub": user_id})
 
     # In production, this would redirect to the frontend with the token
     # For now, we'll return the token or redirect to a frontend callback page
@@ -144,14 +184,14 @@ async def github_callback(code: str, db: AsyncSession = Depends(get_db)):
     return RedirectResponse(f"{callback_url}?token={jwt_token}")
 
 
-@router.get("/me")
+@router.get("/me", response_model=UserMe)
 async def get_me(current_user: User = Depends(get_current_user)):
     """
     Get current user information.
     """
-    return {
-        "id": current_user.id,
-        "username": current_user.username,
-        "email": current_user.email,
-        "avatar_url": current_user.avatar_url
-    }
+    # Serialized by pydantic-core straight to JSON bytes; returning a Response
+    # skips FastAPI's re-validation and jsonable_encoder pass
+    return Response(
+        content=UserMe.model_validate(current_user).model_dump_json(),
+        media_type="application/json",
+    )
@@ -2,9 +2,10 @@
 from datetime import datetime
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Response, status
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from pydantic import BaseModel, Field
-from sqlalchemy import func
+from sqlalchemy import delete, func, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
@@ -52,13 +53,14 @@ class ChatHistoryItem(BaseModel):
     id: str
     role: str
     content: str
-    created_at: str
+    created_at: datetime
     ai_service: Optional[str] = None
 
 
 class ChatHistoryResponse(BaseModel):
     messages: List[ChatHistoryItem]
-    total_count: int
+    total_count: Optional[int] = None  # Null on after_id pages
+    next_cursor: Optional[str] = None  # Pass as after_id for the next page
 
 
 async def get_current_user_with_completed_portfolio(
@@ -169,12 +171,9 @@ async def delete_conversation(
 ):
     """Permanently remove one conversation, its state, and every message in it."""
     conversation = await get_owned_conversation(conversation_id, current_user, db)
-    message_result = await db.execute(
-        select(ChatMessage).where(ChatMessage.conversation_id == conversation.id)
-    )
-    for message in message_result.scalars().all():
-        await db.delete(message)
-    await db.delete(conversation)
+    # Two set-based DELETEs instead of loading and deleting every message row
+    await db.execute(delete(ChatMessage).where(ChatMessage.conversation_id == conversation.id))
+    await db.execute(delete(Conversation).where(Conversation.id == conversation.id))
     await db.commit()
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
@@ -183,36 +182,81 @@ async def delete_conversation(
 async def get_conversation_messages(
     conversation_id: str,
     limit: int = 100,
-    offset: int = 0,
+    offset: int = Query(0, deprecated=True, description="Use after_id instead; ignored when after_id is set"),
+    after_id: Optional[str] = None,
     current_user: User = Depends(get_current_user_with_completed_portfolio),
     db: AsyncSession = Depends(get_db),
 ):
+    """
+    Page through a conversation oldest-first.
+
+    Pass the previous page's next_cursor as after_id to continue. Keyset
+    pagination seeks straight to the cursor on idx_chat_conversation_created
+    instead of scanning and discarding OFFSET rows; total_count is only
+    computed when no cursor is given. The deprecated offset parameter is
+    still honoured for existing clients.
+    """
     await get_owned_conversation(conversation_id, current_user, db)
     limit = min(max(limit, 1), 100)
     offset = max(offset, 0)
-    message_query = (
-        select(ChatMessage)
-        .where(ChatMessage.conversation_id == conversation_id)
-        .order_by(ChatMessage.created_at.asc())
+    columns = [
+        ChatMessage.id,
+        ChatMessage.role,
+        ChatMessage.content,
+        ChatMessage.created_at,
+        ChatMessage.ai_service,
+    ]
+    if after_id is None:
+        # Total folded in as a window COUNT: one round trip for page and count
+        columns.append(func.count().over().label("total_count"))
+    message_query = select(*columns).where(ChatMessage.conversation_id == conversation_id)
+    if after_id is not None:
+        cursor_created_at = (
+            select(ChatMessage.created_at)
+            .where(ChatMessage.id == after_id, ChatMessage.conversation_id == conversation_id)
+            .scalar_subquery()
+        )
+        message_query = message_query.where(
+            tuple_(ChatMessage.created_at, ChatMessage.id) > tuple_(cursor_created_at, after_id)
+        )
+    elif offset:
+        message_query = message_query.offset(offset)
+    page_result = await db.execute(
+        message_query.order_by(ChatMessage.created_at.asc(), ChatMessage.id.asc()).limit(limit)
     )
-    total_result = await db.execute(
-        select(func.count(ChatMessage.id)).where(ChatMessage.conversation_id == conversation_id)
+    page = page_result.all()
+    if after_id is not None:
+        total_count = None
+    elif page:
+        total_count = page[0].total_count
+    elif offset:
+        # Past the last page the window has no row to ride on
+        total_result = await db.execute(
+            select(func.count(ChatMessage.id)).where(ChatMessage.conversation_id == conversation_id)
+        )
+        total_count = total_result.scalar_one()
+    else:
+        total_count = 0
+    # Up to 100 full message bodies per page: encoded straight to bytes with
+    # orjson (datetimes included, same ISO format) rather than validated
+    # against ChatHistoryResponse and walked by jsonable_encoder first
+    return Response(
+        orjson.dumps({
+            "messages": [
+                {
+                    "id": row.id,
+                    "role": row.role,
+                    "content": row.content,
+                    "created_at": row.created_at,
+                    "ai_service": row.ai_service,
+                }
+                for row in page
+            ],
+            "total_count": total_count,
+            "next_cursor": page[-1].id if len(page) == limit else None,
+        }),
+        media_type="application/json",
     )
-    page_result = await db.execute(message_query.offset(offset).limit(limit))
-    page = page_result.scalars().all()
-    return {
-        "messages": [
-            {
-                "id": message.id,
-                "role": message.role,
-                "content": message.content,
-                "created_at": message.created_at.isoformat(),
-                "ai_service": message.ai_service,
-            }
-            for message in page
-        ],
-        "total_count": total_result.scalar_one(),
-    }
 
 
 @router.post(
@@ -1,107 +1,120 @@
 import httpx
 import asyncio
+import ijson
+import orjson
 from fastapi import APIRouter, HTTPException
-from typing import Optional, Set, Tuple
+from typing import Iterable, Optional, Set, Tuple
 from app.models.responses import CodeforcesResponse, ErrorResponse
 from app.config import logger
+from app.http_client import get_http_client
+from app.utils.ttl_cache import TTLCache
+from app.utils.upstream import translate_upstream
 
 router = APIRouter(prefix="/codeforces", tags=["Codeforces"])
 
 # Codeforces API base URL
 CF_API_BASE = "https://codeforces.com/api"
 
+# Ratings only move after a contest, so stats are reused for a few minutes
+# instead of repeating three upstream calls per request
+_stats_cache = TTLCache(ttl=300.0, max_size=1024)
+
 
 async def get_user_info(username: str) -> dict:
     """Fetch user info from Codeforces API"""
-    url = f"{CF_API_BASE}/user.info?handles={username}"
-    
-    async with httpx.AsyncClient(timeout=10.0) as client:
-        try:
-            resp = await client.get(url)
-            resp.raise_for_status()
-            data = resp.json()
-            
-            if data.get("status") != "OK":
-                logger.warning(f"CF API returned non-OK status for user {username}")
-                return None
-            
-            # API returns list of users, we need first one
-            users = data.get("result", [])
-            return users[0] if users else None
-            
-        except httpx.HTTPStatusError as e:
-            logger.error(f"HTTP error fetching user info: {e}")
-            raise
-        except httpx.RequestError as e:
-            logger.error(f"Network error: {e}")
-            raise
+    client = get_http_client()
+    try:
+        resp = await client.get(f"{CF_API_BASE}/user.info", params={"handles": username}, timeout=10.0)
+        if resp.status_code == 400:
+            # Codeforces answers 400 ("handles: User with handle ... not found")
+            # for unknown handles rather than 404
+            logger.warning(f"CF API rejected handle {username}")
+            return None
+        resp.raise_for_status()
+        data = orjson.loads(resp.content)
+        
+        if data.get("status") != "OK":
+            logger.warning(f"CF API returned non-OK status for user {username}")
+            return None
+        
+        # API returns list of users, we need first one
+        users = data.get("result", [])
+        return users[0] if users else None
+        
+    except httpx.HTTPStatusError as e:
+        logger.error(f"HTTP error fetching user info: {e}")
+        raise
+    except httpx.RequestError as e:
+        logger.error(f"Network error: {e}")
+        raise
 
 
 async def get_rating_history(username: str) -> list:
     """Fetch contest rating history"""
-    url = f"{CF_API_BASE}/user.rating?handle={username}"
-    
-    async with httpx.AsyncClient(timeout=10.0) as client:
-        try:
-            resp = await client.get(url)
-            resp.raise_for_status()
-            data = resp.json()
-            
-            if data.get("status") != "OK":
-                return []
-            
-            return data.get("result", [])
-            
-        except httpx.HTTPStatusError:
+    client = get_http_client()
+    try:
+        resp = await client.get(f"{CF_API_BASE}/user.rating", params={"handle": username}, timeout=10.0)
+        resp.raise_for_status()
+        data = orjson.loads(resp.content)
+        
+        if data.get("status") != "OK":
             return []
-        except httpx.RequestError as e:
-            logger.error(f"Network error fetching rating: {e}")
-            raise
+        
+        return data.get("result", [])
+        
+    except httpx.HTTPStatusError:
+        return []
+    except httpx.RequestError as e:
+        logger.error(f"Network error fetching rating: {e}")
+        raise
 
 
-async def get_user_submissions(username: str) -> list:
-    """Fetch user's submission history"""
-    url = f"{CF_API_BASE}/user.status?handle={username}"
-    
-    async with httpx.AsyncClient(timeout=15.0) as client:
-        try:
-            resp = await client.get(url)
-            resp.raise_for_status()
-            data = resp.json()
-            
-            if data.get("status") != "OK":
-                return []
-            
-            return data.get("result", [])
-            
-        except httpx.HTTPStatusError:
-            return []
-        except httpx.RequestError as e:
-            logger.error(f"Network error fetching submissions: {e}")
-            raise
+def add_solved_problems(solved: Set[Tuple[int, str]], submissions: Iterable[dict]) -> None:
+    """
+    Add the problems of accepted submissions (verdict == OK) to solved.
+    A problem is identified by (contestId, index) pair.
+    """
+    # Some problems don't have contestId (practice problems)
+    solved.update(
+        (problem["contestId"], problem["index"])
+        for sub in submissions
+        if sub.get("verdict") == "OK"
+        and (problem := sub.get("problem", {})).get("contestId")
+        and problem.get("index")
+    )
 
 
-def count_solved_problems(submissions: list) -> int:
+async def count_solved_problems(username: str) -> int:
     """
-    Count unique problems solved (verdict == OK).
-    A problem is identified by (contestId, index) pair.
+    Count unique problems solved from the user's submission history.
+
+    user.status returns every submission the user has made (tens of MB for
+    active users), so the body is stream-parsed and only the set of solved
+    problems is kept in memory.
     """
+    client = get_http_client()
     solved: Set[Tuple[int, str]] = set()
-    
-    for sub in submissions:
-        verdict = sub.get("verdict")
-        if verdict != "OK":
-            continue
-        
-        problem = sub.get("problem", {})
-        contest_id = problem.get("contestId")
-        index = problem.get("index")
+    submissions = ijson.sendable_list()
+    parser = ijson.items_coro(submissions, "result.item")
+    try:
+        async with client.stream(
+            "GET", f"{CF_API_BASE}/user.status", params={"handle": username}, timeout=15.0
+        ) as resp:
+            resp.raise_for_status()
+            async for chunk in resp.aiter_bytes():
+                parser.send(chunk)
+                add_solved_problems(solved, submissions)
+                del submissions[:]
+        # A non-OK status carries no "result", so nothing was counted
+        parser.close()
+        add_solved_problems(solved, submissions)
+        return len(solved)
         
-        # Some problems don't have contestId (practice problems)
-        if contest_id and index:
-            solved.add((contest_id, index))
-    
-    return len(solved)
+    except httpx.HTTPStatusError:
+        return 0
+    except httpx.RequestError as e:
+        logger.error(f"Network error fetching submissions: {e}")
+        raise
 
 
 @router.get(
@@ -114,6 +127,7 @@ def count_solved_problems(submissions: list) -> int:
     summary="Get Codeforces User Statistics",
     description="Fetches user statistics from Codeforces including rating, rank, contests, and problems solved"
 )
+@translate_upstream("Codeforces", not_found="Codeforces user '{username}' not found")
 async def get_codeforces_stats(username: str) -> CodeforcesResponse:
     """
     Retrieve Codeforces user statistics.
@@ -122,59 +136,46 @@ async def get_codeforces_stats(username: str) -> CodeforcesResponse:
     
     Returns user's current rating, max rating, rank, contest count, and problems solved.
     """
+    cached_stats = _stats_cache.get(username)
+    if cached_stats is not None:
+        return cached_stats
+
     logger.info(f"Fetching Codeforces stats for user: {username}")
     
-    try:
-        # Fetch all data concurrently
-        user_info, rating_history, submissions = await asyncio.gather(
-            get_user_info(username),
-            get_rating_history(username),
-            get_user_submissions(username),
-            return_exceptions=False
-        )
-        
-        # Check if user exists
-        if not user_info:
-            logger.warning(f"User not found: {username}")
-            raise HTTPException(
-                status_code=404,
-                detail=f"Codeforces user '{username}' not found"
-            )
-        
-        # Extract user data
-        current_rating = user_info.get("rating")
-        max_rating = user_info.get("maxRating")
-        rank = user_info.get("rank")
-        
-        # Count contests
-        contest_count = len(rating_history)
-        
-        # Count solved problems
-        problems_solved = count_solved_problems(submissions)
-        
-        logger.info(f"Stats for {username}: rating={current_rating}, "
-                   f"contests={contest_count}, solved={problems_solved}")
-        
-        return CodeforcesResponse(
-            username=username,
-            current_rating=current_rating,
-            max_rating=max_rating,
-            rank=rank,
-            contest_count=contest_count,
-            problems_solved=problems_solved
-        )
+    # Fetch all data concurrently
+    user_info, rating_history, problems_solved = await asyncio.gather(
+        get_user_info(username),
+        get_rating_history(username),
+        count_solved_problems(username),
+        return_exceptions=False
+    )
     
-    except httpx.RequestError as e:
-        logger.error(f"Network error while fetching CF data: {e}")
-        raise HTTPException(
-            status_code=502,
-            detail="Codeforces API is currently unavailable. Please try again later."
-        )
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Unexpected error: {e}")
+    # Check if user exists
+    if not user_info:
+        logger.warning(f"User not found: {username}")
         raise HTTPException(
-            status_code=500,
-            detail=f"An unexpected error occurred: {str(e)}"
+            status_code=404,
+            detail=f"Codeforces user '{username}' not found"
         )
+    
+    # Extract user data
+    current_rating = user_info.get("rating")
+    max_rating = user_info.get("maxRating")
+    rank = user_info.get("rank")
+    
+    # Count contests
+    contest_count = len(rating_history)
+    
+    logger.info(f"Stats for {username}: rating={current_rating}, "
+               f"contests={contest_count}, solved={problems_solved}")
+    
+    stats = CodeforcesResponse(
+        username=username,
+        current_rating=current_rating,
+        max_rating=max_rating,
+        rank=rank,
+        contest_count=contest_count,
+        problems_solved=problems_solved
+    )
+    _stats_cache.set(username, stats)
+    return stats
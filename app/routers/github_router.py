@@ -1,5 +1,6 @@
 import asyncio
 import httpx
+from typing import Optional
 from fastapi import APIRouter, HTTPException
 from app.models.responses import (
     GitHubAnalyzeRequest,
@@ -7,8 +8,9 @@ from app.models.responses import (
     GitHubRepoAnalysis,
     ErrorResponse
 )
-from app.services.github_service import analyze_repository, get_user_repositories
+from app.services.github_service import analyze_repository, get_user_repositories, prefetch_repositories
 from app.config import logger
+from app.utils.upstream import translate_upstream, upstream_error
 from app.routers.auth_router import get_current_user, User
 from fastapi import Depends
 
@@ -20,6 +22,7 @@ router = APIRouter(prefix="/github", tags=["GitHub"])
     summary="Get user's GitHub repositories",
     description="Fetches the authenticated user's repositories from GitHub"
 )
+@translate_upstream("GitHub")
 async def get_my_repos(current_user: User = Depends(get_current_user)):
     """
     Get the authenticated user's GitHub repositories.
@@ -30,14 +33,23 @@ async def get_my_repos(current_user: User = Depends(get_current_user)):
             detail="User does not have a GitHub access token. Please sign in again."
         )
 
+    repos = await get_user_repositories(current_user.access_token)
+    return {"repos": repos}
+
+
+async def _analyze_or_http_error(repo_url: str, prefetched: Optional[dict]) -> GitHubRepoAnalysis:
+    """Analyze one repository, mapping failures to the HTTP error to return."""
     try:
-        repos = await get_user_repositories(current_user.access_token)
-        return {"repos": repos}
-    except Exception as e:
-        logger.error(f"Error fetching user repositories: {e}")
+        return await analyze_repository(repo_url, prefetched)
+    except httpx.HTTPError as e:
+        logger.error(f"GitHub API call failed for {repo_url}: {e}")
+        raise upstream_error("GitHub", e, f"Repository not found: {repo_url}")
+    except ValueError as e:
+        # Invalid URL or missing token
+        logger.error(f"Validation error: {e}")
         raise HTTPException(
-            status_code=502,
-            detail=f"Failed to fetch repositories from GitHub: {str(e)}"
+            status_code=400,
+            detail=str(e)
         )
 
 
@@ -52,6 +64,7 @@ async def get_my_repos(current_user: User = Depends(get_current_user)):
     summary="Analyze GitHub Repositories",
     description="Analyzes 1-5 GitHub repositories and returns metadata, structure, and README content"
 )
+@translate_upstream("GitHub")
 async def analyze_repositories(request: GitHubAnalyzeRequest) -> GitHubAnalyzeResponse:
     """
     Analyze GitHub repositories.
@@ -66,78 +79,20 @@ async def analyze_repositories(request: GitHubAnalyzeRequest) -> GitHubAnalyzeRe
     logger.info(f"Analyzing {len(request.repos)} repositories")
     
     try:
-        # Analyze all repositories concurrently
-        tasks = [analyze_repository(repo_url) for repo_url in request.repos]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        # Process results and handle errors
-        analyzed_repos = []
-        
-        for i, result in enumerate(results):
-            repo_url = request.repos[i]
-            
-            if isinstance(result, Exception):
-                # Handle specific exceptions
-                if isinstance(result, httpx.HTTPStatusError):
-                    status_code = result.response.status_code
-                    
-                    if status_code == 404:
-                        logger.warning(f"Repository not found: {repo_url}")
-                        raise HTTPException(
-                            status_code=404,
-                            detail=f"Repository not found: {repo_url}"
-                        )
-                    elif status_code == 403:
-                        logger.error(f"GitHub API rate limit or permission denied: {repo_url}")
-                        raise HTTPException(
-                            status_code=502,
-                            detail="GitHub API rate limit exceeded or access denied. Please check your token permissions."
-                        )
-                    else:
-                        logger.error(f"GitHub API error {status_code}: {repo_url}")
-                        raise HTTPException(
-                            status_code=502,
-                            detail=f"GitHub API returned error {status_code}"
-                        )
-                
-                elif isinstance(result, httpx.RequestError):
-                    logger.error(f"Network error for {repo_url}: {result}")
-                    raise HTTPException(
-                        status_code=502,
-                        detail="GitHub API is currently unavailable. Please try again later."
-                    )
-                
-                elif isinstance(result, ValueError):
-                    # Invalid URL or missing token
-                    logger.error(f"Validation error: {result}")
-                    raise HTTPException(
-                        status_code=400,
-                        detail=str(result)
-                    )
-                
-                else:
-                    # Unexpected error
-                    logger.error(f"Unexpected error analyzing {repo_url}: {result}")
-                    raise HTTPException(
-                        status_code=500,
-                        detail=f"An unexpected error occurred: {str(result)}"
-                    )
-            
-            else:
-                # Success - add to results
-                analyzed_repos.append(result)
-        
-        logger.info(f"Successfully analyzed {len(analyzed_repos)} repositories")
-        
-        return GitHubAnalyzeResponse(repos=analyzed_repos)
+        # Analyze all repositories concurrently; the first failure cancels
+        # the remaining analyses instead of letting them spend API quota
+        prefetched = await prefetch_repositories(request.repos)
+        async with asyncio.TaskGroup() as tg:
+            tasks = [
+                tg.create_task(_analyze_or_http_error(repo_url, repo_prefetched))
+                for repo_url, repo_prefetched in zip(request.repos, prefetched)
+            ]
+    except ExceptionGroup as eg:
+        # Report the first failure (already mapped to an HTTP error if expected)
+        raise eg.exceptions[0]
     
-    except HTTPException:
-        # Re-raise HTTP exceptions
-        raise
+    analyzed_repos = [task.result() for task in tasks]
     
-    except Exception as e:
-        logger.error(f"Unexpected error in analyze_repositories: {e}")
-        raise HTTPException(
-            status_code=500,
-            detail=f"An unexpected error occurred: {str(e)}"
-        )
+    logger.info(f"Successfully analyzed {len(analyzed_repos)} repositories")
+    
+    return GitHubAnalyzeResponse(repos=analyzed_repos)
@@ -5,6 +5,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy.orm import undefer
 
 from app.database import get_db
 from app.models.database import Portfolio, User
@@ -42,6 +43,7 @@ async def analyze_job_description(
 ):
     result = await db.execute(
         select(Portfolio)
+        .options(undefer(Portfolio.resume_text))
         .where(
             Portfolio.user_id == current_user.id,
             Portfolio.status == "completed",
@@ -1,12 +1,55 @@
+import asyncio
+import re
 from fastapi import APIRouter, UploadFile, File, HTTPException
 from typing import Dict
 from app.models.responses import LinkedInResponse, ErrorResponse
-from app.utils.validators import check_file_validity, FileValidationError
-from app.utils.file_parser import extract_text
+from app.utils.validators import validate_file, FileValidationError
+from app.utils.file_parser import content_digest, extract_text_async
+from app.utils.ttl_cache import TTLCache
 from app.config import LINKEDIN_SECTIONS, logger
 
 router = APIRouter(prefix="/upload", tags=["LinkedIn"])
 
+# Parsed sections keyed by file content hash: users often re-upload the same
+# export after a retry, and PDF extraction is the slow part of the request
+_sections_cache = TTLCache(ttl=86400.0, max_size=256)
+
+# Header line (lowercased) -> section key, so each line costs one dict lookup
+SECTION_HEADERS: Dict[str, str] = {
+    "top skills": "skills",
+    "skills": "skills",
+    "technical skills": "skills",
+    "core competencies": "skills",
+    "summary": "summary_header",
+    "about": "summary_header",
+    "experience": "experience",
+    "work experience": "experience",
+    "professional experience": "experience",
+    "education": "education",
+    "academic background": "education",
+}
+
+# Matches a whole line holding one of the headers above, so headers are found
+# in a single scan of the text rather than a Python-level loop over lines
+_HEADER_RE = re.compile(
+    r"^[^\S\n]*("
+    + "|".join(re.escape(header) for header in SECTION_HEADERS)
+    + r")[^\S\n]*$",
+    re.MULTILINE | re.IGNORECASE,
+)
+
+# One match per line of text, so sections can be sliced out of the original
+# string by offset instead of splitting it into a list and re-joining
+_LINE_RE = re.compile(r"^.*$", re.MULTILINE)
+
+# Names used in the header log lines
+_SECTION_LABELS = {
+    "skills": "Skills",
+    "summary_header": "Summary",
+    "experience": "Experience",
+    "education": "Education",
+}
+
 
 def parse_linkedin_sections(text: str) -> Dict[str, str]:
     """
@@ -19,31 +62,32 @@ def parse_linkedin_sections(text: str) -> Dict[str, str]:
     Returns:
         Dictionary with summary, experience_raw, education_raw, skills_raw
     """
-    lines = text.split('\n')
-    
-    # Find section header positions
+    # Find section header positions as character offsets into text: where
+    # each header line starts, and where its line ends (body starts after it)
     section_positions = {
         "skills": -1,
         "summary_header": -1,
         "experience": -1,
         "education": -1
     }
+    header_ends: Dict[str, int] = {}
     
-    for i, line in enumerate(lines):
-        line_lower = line.strip().lower()
-        
-        if line_lower in ["top skills", "skills", "technical skills", "core competencies"] and section_positions["skills"] == -1:
-            section_positions["skills"] = i
-            logger.info(f"Found Skills header at line {i}")
-        elif line_lower in ["summary", "about"] and section_positions["summary_header"] == -1:
-            section_positions["summary_header"] = i
-            logger.info(f"Found Summary header at line {i}")
-        elif line_lower in ["experience", "work experience", "professional experience"] and section_positions["experience"] == -1:
-            section_positions["experience"] = i
-            logger.info(f"Found Experience header at line {i}")
-        elif line_lower in ["education", "academic background"] and section_positions["education"] == -1:
-            section_positions["education"] = i
-            logger.info(f"Found Education header at line {i}")
+    remaining = len(section_positions)
+    for match in _HEADER_RE.finditer(text):
+        # Unicode case folding can match a line whose .lower() is not a
+        # header spelling (e.g. "ſkills"); like the old per-line lookup,
+        # such lines are not headers
+        key = SECTION_HEADERS.get(match.group(1).lower())
+        if key is None or section_positions[key] != -1:
+            continue
+
+        section_positions[key] = match.start()
+        header_ends[key] = match.end()
+        logger.info(f"Found {_SECTION_LABELS[key]} header at offset {match.start()}")
+        remaining -= 1
+        if not remaining:
+            # Only the first occurrence of each header matters
+            break
     
     # Initialize sections
     sections = {
@@ -55,15 +99,17 @@ def parse_linkedin_sections(text: str) -> Dict[str, str]:
     
     # Extract Skills section (from "Top Skills" to "Summary" or "Experience")
     if section_positions["skills"] != -1:
-        start = section_positions["skills"] + 1
+        start = header_ends["skills"]
         # End at Summary header OR Experience header (whichever comes first)
-        end_candidates = [pos for pos in [section_positions["summary_header"], section_positions["experience"]] if pos > start]
-        end = min(end_candidates) if end_candidates else len(lines)
+        # (a header on the line straight after Skills is read as a skill)
+        end_candidates = [pos for pos in [section_positions["summary_header"], section_positions["experience"]] if pos > start + 1]
+        end = min(end_candidates) if end_candidates else len(text)
         
         skills_lines = []
         consecutive_long_lines = 0
         
-        for line in lines[start:end]:
+        for match in _LINE_RE.finditer(text, start, end):
+            line = match.group()
             stripped = line.strip()
             
             if not stripped:
@@ -88,15 +134,18 @@ def parse_linkedin_sections(text: str) -> Dict[str, str]:
     # Extract Summary section
     # Summary content is between end of skills and "Experience" header
     if section_positions["skills"] != -1 and section_positions["experience"] != -1:
-        start = section_positions["skills"] + 1
+        start = header_ends["skills"]
         
         # Find where skills end (where we stopped adding to skills_lines)
         # This is where we first encounter paragraph-style content
         summary_start = start
+        previous_line_start = start
         consecutive_long_lines = 0
         
-        for i in range(start, section_positions["experience"]):
-            stripped = lines[i].strip()
+        for match in _LINE_RE.finditer(text, start, section_positions["experience"]):
+            line_start = previous_line_start
+            previous_line_start = match.start()
+            stripped = match.group().strip()
             if not stripped:
                 continue
                 
@@ -106,27 +155,27 @@ def parse_linkedin_sections(text: str) -> Dict[str, str]:
                 if consecutive_long_lines >= 2:
                     # Found start of narrative content
                     # Back up to where long lines started
-                    summary_start = i - 1
+                    summary_start = line_start
                     break
             else:
                 consecutive_long_lines = 0
         
         end = section_positions["experience"]
-        sections["summary"] = '\n'.join(lines[summary_start:end]).strip()
+        sections["summary"] = text[summary_start:end].strip()
     elif section_positions["experience"] != -1 and section_positions["skills"] == -1:
         # No skills section found, everything before Experience is summary
-        sections["summary"] = '\n'.join(lines[:section_positions["experience"]]).strip()
+        sections["summary"] = text[:section_positions["experience"]].strip()
     
     # Extract Experience section
     if section_positions["experience"] != -1:
-        start = section_positions["experience"] + 1
-        end = section_positions["education"] if section_positions["education"] != -1 else len(lines)
-        sections["experience_raw"] = '\n'.join(lines[start:end]).strip()
+        start = header_ends["experience"]
+        end = section_positions["education"] if section_positions["education"] != -1 else len(text)
+        sections["experience_raw"] = text[start:end].strip()
     
     # Extract Education section
     if section_positions["education"] != -1:
-        start = section_positions["education"] + 1
-        sections["education_raw"] = '\n'.join(lines[start:]).strip()
+        start = header_ends["education"]
+        sections["education_raw"] = text[start:].strip()
     
     # Log results
     for key, value in sections.items():
@@ -157,26 +206,25 @@ async def upload_linkedin(file: UploadFile = File(...)) -> LinkedInResponse:
     Returns structured data with summary, experience, education, and skills sections.
     """
     try:
-        # Read file content
-        file_content = await file.read()
-        file_size = len(file_content)
-        
-        logger.info(f"Processing LinkedIn file: {file.filename} ({file_size} bytes)")
-        
-        # Validate file
+        # Validate file (Starlette already spooled the body to a temp file, so
+        # its size is read from there instead of copying it into memory)
         try:
-            check_file_validity(
-                filename=file.filename,
-                content_type=file.content_type,
-                file_size=file_size
-            )
+            file_size = validate_file(file)
         except FileValidationError as e:
             logger.warning(f"Validation failed for {file.filename}: {str(e)}")
             raise HTTPException(status_code=400, detail=str(e))
         
-        # Extract text
+        logger.info(f"Processing LinkedIn file: {file.filename} ({file_size} bytes)")
+        
+        digest = await asyncio.to_thread(content_digest, file.file)
+        cached_response = _sections_cache.get(digest)
+        if cached_response is not None:
+            logger.info(f"Reusing parsed sections for {file.filename} ({digest})")
+            return cached_response
+        
+        # Extract text from the spooled file off the event loop
         try:
-            extracted_text = extract_text(file_content, file.filename)
+            extracted_text = await extract_text_async(file.file, file.filename, file_size)
             logger.info(f"Extracted {len(extracted_text)} characters from {file.filename}")
         except Exception as e:
             logger.error(f"Text extraction failed: {str(e)}")
@@ -193,7 +241,9 @@ async def upload_linkedin(file: UploadFile = File(...)) -> LinkedInResponse:
                    f"Education: {len(sections['education_raw'])} chars, "
                    f"Skills: {len(sections['skills_raw'])} chars")
         
-        return LinkedInResponse(**sections)
+        response = LinkedInResponse(**sections)
+        _sections_cache.set(digest, response)
+        return response
     
     except HTTPException:
         raise
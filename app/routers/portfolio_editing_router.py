@@ -1,11 +1,16 @@
-"""Portfolio Editing Router - PATCH/POST endpoints for editing portfolios"""
+"""
+Portfolio Editing Router - PATCH/POST endpoints for editing portfolios
+
+DEPRECATED and not mounted in app.main: these endpoints are unreachable.
+portfolio_refinement_router serves refinement, confirm and revert instead.
+"""
 import logging
-from typing import Dict, Any, List
 from datetime import datetime
 
-from fastapi import APIRouter, Depends, HTTPException, Body
+from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from sqlalchemy.orm import undefer_group
 
 from app.database import get_db
 from app.models.database import Portfolio, PortfolioVersion
@@ -44,7 +49,7 @@ async def edit_portfolio(
     """
     # Query portfolio by slug
     result = await db.execute(
-        select(Portfolio).where(Portfolio.slug == slug)
+        select(Portfolio).options(undefer_group("payload")).where(Portfolio.slug == slug)
     )
     portfolio = result.scalar_one_or_none()
 
@@ -113,7 +118,7 @@ async def refine_portfolio_section(
     """
     # Query portfolio by slug
     result = await db.execute(
-        select(Portfolio).where(Portfolio.slug == slug)
+        select(Portfolio).options(undefer_group("payload")).where(Portfolio.slug == slug)
     )
     portfolio = result.scalar_one_or_none()
 
@@ -275,7 +280,7 @@ async def restore_portfolio_version(
     """
     # Query portfolio by slug
     portfolio_result = await db.execute(
-        select(Portfolio).where(Portfolio.slug == slug)
+        select(Portfolio).options(undefer_group("payload")).where(Portfolio.slug == slug)
     )
     portfolio = portfolio_result.scalar_one_or_none()
 
@@ -3,24 +3,25 @@ import asyncio
 import json
 import logging
 import time
-from typing import Optional
+from typing import List, Optional, Tuple
 from datetime import datetime
 
 from fastapi import APIRouter, UploadFile, File, Form, Depends, HTTPException, Request
+from pydantic_core import to_jsonable_python
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
-from app.models.database import Portfolio, User
+from app.models.database import Portfolio, PortfolioGithubRepo, User
 from app.models.portfolio_schemas import PortfolioGenerateResponse, PortfolioErrorResponse
 from app.routers.auth_router import get_current_user, verify_token
 from app.utils.slug import generate_portfolio_slug
 from app.utils.validators import validate_file
-from app.utils.file_parser import extract_text
+from app.utils.file_parser import extract_text_async
 
 # Import existing routers' logic (we'll reuse their parsing functions)
 from app.routers.linkedin_router import parse_linkedin_sections
-from app.services.github_service import analyze_repository
+from app.services.github_service import analyze_repository, prefetch_repositories
 from app.services.leetcode_service import fetch_leetcode_stats
 from app.routers.codeforces_router import get_codeforces_stats
 
@@ -33,6 +34,15 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/portfolio", tags=["Portfolio Generation"])
 
+# Key under which each data source's result is stored
+_SOURCE_DATA_KEYS = {
+    "linkedin": "linkedin_data",
+    "resume": "resume_text",
+    "github": "github_data",
+    "codeforces": "codeforces_data",
+    "leetcode": "leetcode_data",
+}
+
 
 @router.post("/generate", response_model=PortfolioGenerateResponse)
 async def generate_portfolio(
@@ -109,11 +119,12 @@ async def generate_portfolio(
             generation_started_at=datetime.utcnow()
         )
         db.add(portfolio)
+        # Server defaults come back via RETURNING (eager_defaults), so the
+        # instance needs no refresh
         await db.commit()
-        await db.refresh(portfolio)
 
         # 3. Parse all data sources in parallel
-        data_results = await _fetch_all_data_sources(
+        data_results, sources_used = await _fetch_all_data_sources(
             linkedin_file=linkedin_file,
             resume_file=resume_file,
             github_repos=github_repos,
@@ -129,13 +140,29 @@ async def generate_portfolio(
         portfolio.has_leetcode = data_results["leetcode_data"] is not None
 
         # Convert Pydantic models to dictionaries for JSON serialization
-        # Note: _to_serializable() already converts Pydantic models to dicts
+        # Note: _fetch_all_data_sources() already converts Pydantic models to dicts
         portfolio.linkedin_data = data_results["linkedin_data"]
         portfolio.resume_text = data_results["resume_text"]
         portfolio.github_data = data_results["github_data"]
         portfolio.codeforces_data = data_results["codeforces_data"]
         portfolio.leetcode_data = data_results["leetcode_data"]
 
+        # One row per analyzed repo, so repo-level queries don't parse the blob
+        db.add_all([
+            PortfolioGithubRepo(
+                portfolio_id=portfolio.id,
+                name=repo.get("name") or "",
+                description=repo.get("description"),
+                primary_language=repo.get("primary_language"),
+                last_updated=repo.get("last_updated"),
+                github_url=repo.get("github_url"),
+                readme_text=repo.get("readme_text"),
+                readme_length=repo.get("readme_length"),
+                structure=repo.get("structure"),
+            )
+            for repo in data_results["github_data"] or []
+        ])
+
         await db.commit()
 
         # 5. Run code quality analysis on GitHub data
@@ -247,7 +274,7 @@ async def generate_portfolio(
         portfolio.ai_generation_metadata = {
             "model": "gemini-1.5-flash",
             "generated_at": datetime.utcnow().isoformat(),
-            "sources_used": _list_used_sources(data_results)
+            "sources_used": sources_used
         }
         portfolio.status = "completed"
         portfolio.generation_completed_at = datetime.utcnow()
@@ -298,109 +325,55 @@ async def _fetch_all_data_sources(
     github_repos: Optional[str],
     codeforces_username: Optional[str],
     leetcode_username: Optional[str]
-) -> dict:
+) -> Tuple[dict, List[str]]:
     """
     Fetch data from all sources in parallel.
 
     Returns:
-        Dictionary with all fetched data (None for sources not provided)
+        Dictionary with all fetched data (None for sources not provided),
+        and the names of the sources that returned data
     """
-    tasks = []
-    task_names = []
-
-    # LinkedIn parsing
+    # Only the sources the user supplied are fetched
+    coros = {}
     if linkedin_file:
-        tasks.append(_parse_linkedin_file(linkedin_file))
-        task_names.append("linkedin")
-    else:
-        tasks.append(_return_none())
-        task_names.append("linkedin")
-
-    # Resume parsing
+        coros["linkedin"] = _parse_linkedin_file(linkedin_file)
     if resume_file:
-        tasks.append(_parse_resume_file(resume_file))
-        task_names.append("resume")
-    else:
-        tasks.append(_return_none())
-        task_names.append("resume")
-
-    # GitHub analysis
+        coros["resume"] = _parse_resume_file(resume_file)
     if github_repos:
-        tasks.append(_analyze_github_repos(github_repos))
-        task_names.append("github")
-    else:
-        tasks.append(_return_none())
-        task_names.append("github")
-
-    # Codeforces
+        coros["github"] = _analyze_github_repos(github_repos)
     if codeforces_username:
-        tasks.append(_fetch_codeforces(codeforces_username))
-        task_names.append("codeforces")
-    else:
-        tasks.append(_return_none())
-        task_names.append("codeforces")
-
-    # LeetCode
+        coros["codeforces"] = _fetch_codeforces(codeforces_username)
     if leetcode_username:
-        tasks.append(_fetch_leetcode(leetcode_username))
-        task_names.append("leetcode")
-    else:
-        tasks.append(_return_none())
-        task_names.append("leetcode")
+        coros["leetcode"] = _fetch_leetcode(leetcode_username)
 
-    # Execute all tasks in parallel
-    results = await asyncio.gather(*tasks, return_exceptions=True)
+    # Execute all fetches in parallel
+    results = await asyncio.gather(*coros.values(), return_exceptions=True)
 
     # Process results
-    data = {}
-    for name, result in zip(task_names, results):
-        key = f"{name}_data" if name != "resume" else "resume_text"
-        
+    data = {key: None for key in _SOURCE_DATA_KEYS.values()}
+    sources_used = []
+    for name, result in zip(coros, results):
+        key = _SOURCE_DATA_KEYS[name]
+
         if isinstance(result, Exception):
             logger.warning(f"Failed to fetch {name}: {result}")
-            data[key] = None
         else:
-            # Convert result to serializable dict if it's a Pydantic model
-            data[key] = _to_serializable(result)
-
-    return data
-
-
-def _to_serializable(obj):
-    """Helper to convert Pydantic models to dictionaries recursively"""
-    if obj is None:
-        return None
-    
-    # Handle dictionaries FIRST (before checking for model_dump)
-    # This prevents trying to call model_dump on already-converted dicts
-    if isinstance(obj, dict):
-        return {k: _to_serializable(v) for k, v in obj.items()}
-    
-    # Handle lists (like GitHub repos)
-    if isinstance(obj, list):
-        return [_to_serializable(item) for item in obj]
-        
-    # Handle Pydantic models (only if not already a dict)
-    if hasattr(obj, "model_dump"):
-        return obj.model_dump()
-    if hasattr(obj, "dict"):
-        return obj.dict()
-        
-    return obj
+            # Pydantic models (also inside lists, e.g. GitHub repos) become
+            # plain dicts in one pydantic-core pass
+            data[key] = to_jsonable_python(result)
+            if data[key]:
+                sources_used.append(name)
 
-
-async def _return_none():
-    """Helper to return None asynchronously"""
-    return None
+    return data, sources_used
 
 
 async def _parse_linkedin_file(file: UploadFile):
     """Parse LinkedIn file"""
     try:
-        validate_file(file)
-        file_bytes = await file.read()
-        # Offload CPU-intensive extraction to a thread pool
-        text = await asyncio.to_thread(extract_text, file_bytes, file.filename)
+        file_size = validate_file(file)
+        # Parse straight from the spooled upload; offload CPU-intensive
+        # extraction to a worker thread or process
+        text = await extract_text_async(file.file, file.filename, file_size)
         return parse_linkedin_sections(text)
     except Exception as e:
         logger.error(f"LinkedIn parsing failed: {e}")
@@ -410,10 +383,10 @@ async def _parse_linkedin_file(file: UploadFile):
 async def _parse_resume_file(file: UploadFile):
     """Parse resume file"""
     try:
-        validate_file(file)
-        file_bytes = await file.read()
-        # Offload CPU-intensive extraction to a thread pool
-        text = await asyncio.to_thread(extract_text, file_bytes, file.filename)
+        file_size = validate_file(file)
+        # Parse straight from the spooled upload; offload CPU-intensive
+        # extraction to a worker thread or process
+        text = await extract_text_async(file.file, file.filename, file_size)
         return text
     except Exception as e:
         logger.error(f"Resume parsing failed: {e}")
@@ -430,8 +403,10 @@ async def _analyze_github_repos(repos_json: str):
         if not isinstance(repo_urls, list):
             raise ValueError("github_repos must be a JSON array")
 
-        # Analyze each repo in parallel
-        repo_tasks = [analyze_repository(url) for url in repo_urls[:5]]  # Max 5 repos
+        # Analyze each repo in parallel, reusing one batched metadata query
+        repo_urls = repo_urls[:5]  # Max 5 repos
+        prefetched = await prefetch_repositories(repo_urls)
+        repo_tasks = [analyze_repository(url, repo_prefetched) for url, repo_prefetched in zip(repo_urls, prefetched)]
         results_raw = await asyncio.gather(*repo_tasks, return_exceptions=True)
         results = []
         for i, res in enumerate(results_raw):
@@ -462,19 +437,3 @@ async def _fetch_leetcode(username: str):
     except Exception as e:
         logger.error(f"LeetCode fetch failed: {e}")
         raise
-
-
-def _list_used_sources(data_results: dict) -> list:
-    """List which data sources were actually fetched"""
-    sources = []
-    if data_results.get("linkedin_data"):
-        sources.append("linkedin")
-    if data_results.get("resume_text"):
-        sources.append("resume")
-    if data_results.get("github_data"):
-        sources.append("github")
-    if data_results.get("codeforces_data"):
-        sources.append("codeforces")
-    if data_results.get("leetcode_data"):
-        sources.append("leetcode")
-    return sources
@@ -3,11 +3,12 @@ import logging
 from typing import List, Dict, Any
 from datetime import datetime
 
-from fastapi import APIRouter, Depends, HTTPException
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Response
 from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, desc
-from sqlalchemy.orm import selectinload
+from sqlalchemy import Text, and_, cast, delete, desc, func, select
+from sqlalchemy.orm import load_only, selectinload
 
 from app.database import get_db
 from app.models.database import Portfolio, PortfolioVersion, VersionState, VersionCreatedBy
@@ -16,6 +17,27 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/portfolio", tags=["portfolio-refinement"])
 
+# Drafts kept per portfolio; each refinement past this drops the oldest one
+MAX_VERSIONS = 50
+
+
+def _copied_from(version_id: str, column):
+    """
+    Scalar subquery copying one JSON column of an existing version.
+
+    Assigned to a new PortfolioVersion's attribute, the INSERT copies the
+    document inside the database instead of decoding it into Python and
+    re-encoding it for the new row.
+    """
+    return select(column).where(PortfolioVersion.id == version_id).scalar_subquery()
+
+
+# Whether the version's public document is present and non-empty, computed in
+# SQL so confirming never has to load the document itself
+_has_public_document = func.coalesce(
+    cast(PortfolioVersion.public_portfolio_json, Text), "null"
+).not_in(("null", "{}"))
+
 
 # Request/Response Models
 class RefineRequest(BaseModel):
@@ -25,6 +47,10 @@ class RefineRequest(BaseModel):
         default_factory=lambda: ["all"],
         description="Sections to modify. Use ['all'] to refine entire portfolio, or specify sections like ['summary', 'experience']"
     )
+    regenerate: bool = Field(
+        default=False,
+        description="Ask the AI again even if this exact refinement was recently made"
+    )
 
 
 class VersionMetadata(BaseModel):
@@ -53,7 +79,8 @@ async def refine_portfolio(
     This endpoint:
     1. Fetches the latest version from the database
     2. Sends it to Gemini AI with refinement instructions
-    3. Creates a new DRAFT version with the refined content
+    3. Creates a new DRAFT version with the refined content, dropping the
+       oldest draft beyond MAX_VERSIONS
     4. Updates current_version_id to the new draft
     
     Args:
@@ -66,43 +93,51 @@ async def refine_portfolio(
     """
     logger.info(f"Refining portfolio {slug} - sections: {request.sections}")
     
-    # Step 1: Resolve portfolio by slug
+    # Step 1: Resolve portfolio by slug together with its latest version
+    # (highest version_number) in one round trip; the outer join still
+    # returns the portfolio, with no version, when it has none
+    # Only the version columns used below are selected (its coaching JSON is
+    # copied server-side), not a full PortfolioVersion entity
     result = await db.execute(
-        select(Portfolio).where(Portfolio.slug == slug)
+        select(
+            Portfolio,
+            PortfolioVersion.id,
+            PortfolioVersion.version_number,
+            PortfolioVersion.version_state,
+            PortfolioVersion.public_portfolio_json,
+        )
+        .outerjoin(PortfolioVersion, PortfolioVersion.portfolio_id == Portfolio.id)
+        .where(Portfolio.slug == slug)
+        .order_by(desc(PortfolioVersion.version_number))
+        .limit(1)
     )
-    portfolio = result.scalar_one_or_none()
+    row = result.one_or_none()
     
-    if not portfolio:
+    if not row:
         raise HTTPException(
             status_code=404,
             detail=f"Portfolio not found with slug: {slug}"
         )
     
-    # Step 2: Fetch the latest version (highest version_number)
-    latest_version_result = await db.execute(
-        select(PortfolioVersion)
-        .where(PortfolioVersion.portfolio_id == portfolio.id)
-        .order_by(desc(PortfolioVersion.version_number))
-        .limit(1)
-    )
-    latest_version = latest_version_result.scalar_one_or_none()
+    portfolio, latest_version_id, latest_version_number, latest_version_state, latest_public_json = row
     
-    if not latest_version or not latest_version.public_portfolio_json:
+    if latest_version_id is None or not latest_public_json:
         raise HTTPException(
             status_code=400,
             detail="No existing version found. Please generate a portfolio first."
         )
     
-    logger.info(f"Latest version: {latest_version.version_number}, state: {latest_version.version_state}")
+    logger.info(f"Latest version: {latest_version_number}, state: {latest_version_state}")
     
-    # Step 3: Call AI service to refine the portfolio
+    # Step 2: Call AI service to refine the portfolio
     from app.services.ai_refinement_service import refine_portfolio_content
     
     try:
         refined_json = await refine_portfolio_content(
-            current_portfolio_json=latest_version.public_portfolio_json,
+            current_portfolio_json=latest_public_json,
             instruction=request.instruction,
-            sections_to_modify=request.sections
+            sections_to_modify=request.sections,
+            use_cache=not request.regenerate
         )
         logger.info("AI refinement completed successfully")
     except Exception as e:
@@ -112,40 +147,57 @@ async def refine_portfolio(
             detail=f"AI refinement failed: {str(e)}"
         )
     
-    # Step 4: Create new DRAFT version
-    new_version_number = latest_version.version_number + 1
+    # Step 3: Create new DRAFT version
+    new_version_number = latest_version_number + 1
     
     new_version = PortfolioVersion(
         portfolio_id=portfolio.id,
         version_number=new_version_number,
         version_state=VersionState.DRAFT,
         public_portfolio_json=refined_json,
-        private_coaching_json=latest_version.private_coaching_json,  # Keep coaching unchanged
+        private_coaching_json=_copied_from(latest_version_id, PortfolioVersion.private_coaching_json),  # Keep coaching unchanged
         changes_summary=f"AI refinement: {request.instruction[:100]}",
         created_by=VersionCreatedBy.AI_REFINEMENT
     )
     
     db.add(new_version)
-    await db.flush()  # Get the new version ID
+    await db.flush()  # Insert it before the portfolio references it (FK)
+    
+    # Keep the newest MAX_VERSIONS drafts. version_number is the leading sort
+    # key of the covering index, so this is a range delete; committed versions
+    # are left for confirm/revert to replace
+    if new_version_number > MAX_VERSIONS:
+        await db.execute(
+            delete(PortfolioVersion)
+            .where(PortfolioVersion.portfolio_id == portfolio.id)
+            .where(PortfolioVersion.version_state == VersionState.DRAFT)
+            .where(PortfolioVersion.version_number <= new_version_number - MAX_VERSIONS)
+        )
     
-    # Step 5: Update portfolio's current_version_id to the new draft
+    # Step 4: Update portfolio's current_version_id to the new draft
     portfolio.current_version_id = new_version.id
     portfolio.updated_at = datetime.utcnow()
     
     await db.commit()
-    await db.refresh(new_version)
     
     logger.info(f"Created draft version {new_version_number} for portfolio {slug}")
     
-    # Step 6: Return response
-    return RefineResponse(
-        version=VersionMetadata(
-            id=new_version.id,
-            version_number=new_version.version_number,
-            version_state=new_version.version_state.value
-        ),
-        sections_updated=request.sections,
-        portfolio_json=refined_json
+    # Step 5: Return response, encoded straight to JSON bytes with orjson:
+    # portfolio_json is the whole refined document, which response_model
+    # validation and serialization would otherwise copy and walk repeatedly
+    # (response_model is still declared for the OpenAPI schema)
+    version = VersionMetadata(
+        id=new_version.id,
+        version_number=new_version.version_number,
+        version_state=new_version.version_state.value
+    )
+    return Response(
+        content=orjson.dumps({
+            "version": version.model_dump(),
+            "sections_updated": request.sections,
+            "portfolio_json": refined_json,
+        }),
+        media_type="application/json"
     )
 
 
@@ -165,7 +217,7 @@ async def confirm_portfolio(
     
     This endpoint:
     1. Fetches the latest version from the database
-    2. Creates a new COMMITTED version from it
+    2. Commits it in place under the next version number
     3. Deletes ALL other versions (drafts and old commits)
     4. Updates current_version_id to the new committed version
     
@@ -180,28 +232,36 @@ async def confirm_portfolio(
     """
     logger.info(f"Confirming portfolio {slug}")
     
-    # Step 1: Resolve portfolio by slug
+    # Step 1: Resolve portfolio by slug together with its latest version
+    # (highest version_number) in one round trip; the outer join still
+    # returns the portfolio, with no version, when it has none
     result = await db.execute(
-        select(Portfolio).where(Portfolio.slug == slug)
+        select(Portfolio, PortfolioVersion, _has_public_document)
+        .outerjoin(PortfolioVersion, PortfolioVersion.portfolio_id == Portfolio.id)
+        .where(Portfolio.slug == slug)
+        .order_by(desc(PortfolioVersion.version_number))
+        .limit(1)
+        # It is committed in place, so its documents are never read: only
+        # metadata is loaded (portfolio_id too, for the bulk DELETE below),
+        # and whether the refined document is empty is decided in SQL
+        .options(load_only(
+            PortfolioVersion.id,
+            PortfolioVersion.portfolio_id,
+            PortfolioVersion.version_number,
+            PortfolioVersion.version_state,
+        ))
     )
-    portfolio = result.scalar_one_or_none()
+    row = result.one_or_none()
     
-    if not portfolio:
+    if not row:
         raise HTTPException(
             status_code=404,
             detail=f"Portfolio not found with slug: {slug}"
         )
     
-    # Step 2: Fetch the latest version (highest version_number)
-    latest_version_result = await db.execute(
-        select(PortfolioVersion)
-        .where(PortfolioVersion.portfolio_id == portfolio.id)
-        .order_by(desc(PortfolioVersion.version_number))
-        .limit(1)
-    )
-    latest_version = latest_version_result.scalar_one_or_none()
+    portfolio, latest_version, has_public_document = row
     
-    if not latest_version or not latest_version.public_portfolio_json:
+    if not latest_version or not has_public_document:
         raise HTTPException(
             status_code=400,
             detail="No existing version found. Please generate a portfolio first."
@@ -209,30 +269,27 @@ async def confirm_portfolio(
     
     logger.info(f"Latest version: {latest_version.version_number}, state: {latest_version.version_state}")
     
-    # Step 3: Create NEW committed version (copy from latest)
+    # Step 2: Turn the latest version into the new committed version. It is
+    # updated in place (next version number, committed state) so its
+    # documents are never copied into another row
     new_version_number = latest_version.version_number + 1
     
-    committed_version = PortfolioVersion(
-        portfolio_id=portfolio.id,
-        version_number=new_version_number,
-        version_state=VersionState.COMMITTED,
-        public_portfolio_json=latest_version.public_portfolio_json,
-        private_coaching_json=latest_version.private_coaching_json,
-        changes_summary="Portfolio confirmed and finalized",
-        created_by=VersionCreatedBy.USER_MANUAL
-    )
-    
-    db.add(committed_version)
-    await db.flush()  # Get the new version ID
+    committed_version = latest_version
+    committed_version.version_number = new_version_number
+    committed_version.version_state = VersionState.COMMITTED
+    committed_version.changes_summary = "Portfolio confirmed and finalized"
+    committed_version.created_by = VersionCreatedBy.USER_MANUAL
+    committed_version.created_at = func.current_timestamp()
     
-    # Step 4: Update portfolio
+    # Step 3: Update portfolio
     portfolio.current_version_id = committed_version.id
     portfolio.status = "completed"
     portfolio.updated_at = datetime.utcnow()
     
-    # Step 5: Delete ALL other versions (keep only the new committed version)
-    from sqlalchemy import delete
-    
+    # Step 4: Delete ALL other versions (keep only the new committed version).
+    # Flush first: autoflush is off, and the old current_version_id may still
+    # reference a version the DELETE removes
+    await db.flush()
     await db.execute(
         delete(PortfolioVersion)
         .where(PortfolioVersion.portfolio_id == portfolio.id)
@@ -241,11 +298,10 @@ async def confirm_portfolio(
     
     # Commit the transaction
     await db.commit()
-    await db.refresh(committed_version)
     
-    logger.info(f"Confirmed portfolio {slug} - created committed version {new_version_number}, deleted all other versions")
+    logger.info(f"Confirmed portfolio {slug} - committed latest version as version {new_version_number}, deleted all other versions")
     
-    # Step 6: Return response
+    # Step 5: Return response
     return ConfirmResponse(
         status="confirmed",
         version=VersionMetadata(
@@ -279,7 +335,7 @@ async def revert_portfolio(
     This endpoint:
     1. Resolves the portfolio using the slug
     2. Fetches the selected portfolio version using version_id
-    3. Creates a NEW committed version (copy of selected version)
+    3. Commits it in place under the next version number
     4. Updates current_version_id to the new committed version
     5. Deletes ALL other versions (drafts and old commits)
     
@@ -295,25 +351,41 @@ async def revert_portfolio(
     """
     logger.info(f"Reverting portfolio {slug} to version {request.version_id}")
     
-    # Step 1: Resolve portfolio by slug
+    # Step 1: Resolve portfolio by slug, the selected version (only if it
+    # belongs to this portfolio) and the current max version number in one
+    # round trip. Correlated on Portfolio only, so the subquery scans all of
+    # the portfolio's versions rather than the joined one.
+    max_version_number = (
+        select(func.max(PortfolioVersion.version_number))
+        .where(PortfolioVersion.portfolio_id == Portfolio.id)
+        .correlate(Portfolio)
+        .scalar_subquery()
+    )
     result = await db.execute(
-        select(Portfolio).where(Portfolio.slug == slug)
+        select(Portfolio, PortfolioVersion, max_version_number)
+        .outerjoin(
+            PortfolioVersion,
+            and_(PortfolioVersion.portfolio_id == Portfolio.id, PortfolioVersion.id == request.version_id),
+        )
+        .where(Portfolio.slug == slug)
+        # Its documents stay in place, so only metadata is loaded (portfolio_id
+        # too, so the bulk DELETE can match it without a reload)
+        .options(load_only(
+            PortfolioVersion.id,
+            PortfolioVersion.portfolio_id,
+            PortfolioVersion.version_number,
+            PortfolioVersion.version_state,
+        ))
     )
-    portfolio = result.scalar_one_or_none()
+    row = result.one_or_none()
     
-    if not portfolio:
+    if not row:
         raise HTTPException(
             status_code=404,
             detail=f"Portfolio not found with slug: {slug}"
         )
     
-    # Step 2: Fetch the selected version using version_id
-    selected_version_result = await db.execute(
-        select(PortfolioVersion)
-        .where(PortfolioVersion.id == request.version_id)
-        .where(PortfolioVersion.portfolio_id == portfolio.id)
-    )
-    selected_version = selected_version_result.scalar_one_or_none()
+    portfolio, selected_version, max_version_number = row
     
     if not selected_version:
         raise HTTPException(
@@ -323,38 +395,28 @@ async def revert_portfolio(
     
     logger.info(f"Selected version: {selected_version.version_number}, state: {selected_version.version_state}")
     
-    # Step 3: Get max version number for creating new version
-    max_version_result = await db.execute(
-        select(PortfolioVersion.version_number)
-        .where(PortfolioVersion.portfolio_id == portfolio.id)
-        .order_by(desc(PortfolioVersion.version_number))
-        .limit(1)
-    )
-    max_version_number = max_version_result.scalar_one_or_none() or 0
-    new_version_number = max_version_number + 1
+    new_version_number = (max_version_number or 0) + 1
     
-    # Step 4: Create NEW committed version (copy from selected version)
-    committed_version = PortfolioVersion(
-        portfolio_id=portfolio.id,
-        version_number=new_version_number,
-        version_state=VersionState.COMMITTED,
-        public_portfolio_json=selected_version.public_portfolio_json,
-        private_coaching_json=selected_version.private_coaching_json,
-        changes_summary=f"Reverted to version {selected_version.version_number}",
-        created_by=VersionCreatedBy.USER_MANUAL
-    )
+    # Step 2: Turn the selected version into the new committed version,
+    # updated in place like in confirm_portfolio
+    reverted_version_number = selected_version.version_number
     
-    db.add(committed_version)
-    await db.flush()  # Get the new version ID
+    committed_version = selected_version
+    committed_version.version_number = new_version_number
+    committed_version.version_state = VersionState.COMMITTED
+    committed_version.changes_summary = f"Reverted to version {reverted_version_number}"
+    committed_version.created_by = VersionCreatedBy.USER_MANUAL
+    committed_version.created_at = func.current_timestamp()
     
-    # Step 5: Update portfolio
+    # Step 3: Update portfolio
     portfolio.current_version_id = committed_version.id
     portfolio.status = "completed"
     portfolio.updated_at = datetime.utcnow()
     
-    # Step 6: Delete ALL other versions (keep only the new committed version)
-    from sqlalchemy import delete
-    
+    # Step 4: Delete ALL other versions (keep only the new committed version).
+    # Flush first: autoflush is off, and the old current_version_id may still
+    # reference a version the DELETE removes
+    await db.flush()
     await db.execute(
         delete(PortfolioVersion)
         .where(PortfolioVersion.portfolio_id == portfolio.id)
@@ -363,11 +425,10 @@ async def revert_portfolio(
     
     # Commit the transaction
     await db.commit()
-    await db.refresh(committed_version)
     
-    logger.info(f"Reverted portfolio {slug} to version {selected_version.version_number} - created committed version {new_version_number}, deleted all other versions")
+    logger.info(f"Reverted portfolio {slug} to version {reverted_version_number} - committed it as version {new_version_number}, deleted all other versions")
     
-    # Step 7: Return response
+    # Step 5: Return response
     return RevertResponse(
         status="reverted",
         version=VersionMetadata(
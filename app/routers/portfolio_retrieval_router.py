@@ -1,19 +1,24 @@
 """Portfolio Retrieval Router - GET endpoints for accessing portfolios"""
+import asyncio
+import html
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from pathlib import Path
 
+import orjson
+
 from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from fastapi.responses import HTMLResponse
 from fastapi.templating import Jinja2Templates
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import delete, select, update
-from sqlalchemy.orm import selectinload
+from sqlalchemy import Text, cast, delete, select, update
+from sqlalchemy.orm import load_only, selectinload
 
-from app.database import get_db
-from app.models.database import Portfolio, PortfolioVersion, User
+from app.database import get_db, get_db_ro
+from app.models.database import Portfolio, PortfolioGithubRepo, PortfolioVersion, User
 from app.models.schemas import PortfolioStatusResponse
 from app.routers.auth_router import get_current_user
+from app.utils.ttl_cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +27,55 @@ router = APIRouter(prefix="/portfolio", tags=["Portfolio Retrieval"])
 # Setup Jinja2 templates
 templates = Jinja2Templates(directory="app/templates")
 
+# Encoded JSON and rendered HTML of public documents, keyed by (format,
+# version id). A version's public document is never rewritten: edits create
+# a new version and move current_version_id. Entries therefore never go
+# stale and need no invalidation; the TTL only bounds memory.
+_public_render_cache = TTLCache(ttl=3600.0, max_size=256)
+
+# Stored forms of documents treated as missing (falsy once decoded)
+_EMPTY_JSON_TEXTS = (None, "null", "{}")
+
+
+def _json_document_response(document: Any) -> Response:
+    """
+    Encode a stored portfolio document straight to JSON bytes with orjson.
+
+    These documents run to hundreds of KB; returning a Response skips
+    FastAPI's response_model validation and jsonable_encoder walk over the
+    whole tree (response_model is still declared for the OpenAPI schema).
+    """
+    return Response(content=orjson.dumps(document), media_type="application/json")
+
+
+async def _load_public_document(db: AsyncSession, version_id: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Load a version's public portfolio JSON (None if there is no version)."""
+    if version_id is None:
+        return None
+    result = await db.execute(
+        select(PortfolioVersion.public_portfolio_json).where(PortfolioVersion.id == version_id)
+    )
+    return result.scalar_one_or_none()
+
+
+async def _load_public_document_text(db: AsyncSession, version_id: Optional[str]) -> Optional[str]:
+    """
+    Load a version's public portfolio JSON as the stored JSON text.
+
+    Cast to text in SQL, so a document that is only sent back to the client
+    is never decoded into Python objects and re-encoded. None if there is no
+    version or the document is empty.
+    """
+    if version_id is None:
+        return None
+    result = await db.execute(
+        select(cast(PortfolioVersion.public_portfolio_json, Text)).where(PortfolioVersion.id == version_id)
+    )
+    document_text = result.scalar_one_or_none()
+    if document_text in _EMPTY_JSON_TEXTS:
+        return None
+    return document_text
+
 
 @router.delete("/{slug}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_portfolio(
@@ -54,6 +108,7 @@ async def delete_portfolio(
         update(Portfolio).where(Portfolio.id == portfolio.id).values(current_version_id=None)
     )
     await db.execute(delete(PortfolioVersion).where(PortfolioVersion.portfolio_id == portfolio.id))
+    await db.execute(delete(PortfolioGithubRepo).where(PortfolioGithubRepo.portfolio_id == portfolio.id))
     await db.execute(delete(Portfolio).where(Portfolio.id == portfolio.id))
     await db.commit()
     logger.info("Deleted portfolio %s and all of its versions for user %s", portfolio.id, current_user.id)
@@ -63,7 +118,7 @@ async def delete_portfolio(
 @router.get("/{slug}", response_model=Dict[str, Any])
 async def get_public_portfolio(
     slug: str,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db_ro)
 ):
     """
     Retrieve public portfolio by slug.
@@ -78,10 +133,11 @@ async def get_public_portfolio(
     Returns:
         Public portfolio JSON with AI-generated content and data sources
     """
-    # Query portfolio by slug with current_version eager loaded
+    # Query only what the status checks need; the document itself is
+    # loaded below unless its encoded form is cached
     result = await db.execute(
         select(Portfolio)
-        .options(selectinload(Portfolio.current_version))
+        .options(load_only(Portfolio.status, Portfolio.error_message, Portfolio.current_version_id))
         .where(Portfolio.slug == slug)
     )
     portfolio = result.scalar_one_or_none()
@@ -113,20 +169,26 @@ async def get_public_portfolio(
         )
 
     # Return current version's public portfolio JSON
-    if not portfolio.current_version or not portfolio.current_version.public_portfolio_json:
-        raise HTTPException(
-            status_code=500,
-            detail="Portfolio data is missing. Please regenerate."
-        )
+    cache_key = ("json", portfolio.current_version_id)
+    content = _public_render_cache.get(cache_key)
+    if content is None:
+        document_text = await _load_public_document_text(db, portfolio.current_version_id)
+        if not document_text:
+            raise HTTPException(
+                status_code=500,
+                detail="Portfolio data is missing. Please regenerate."
+            )
+        content = document_text.encode("utf-8")
+        _public_render_cache.set(cache_key, content)
 
     logger.info(f"Retrieved public portfolio for slug: {slug}")
-    return portfolio.current_version.public_portfolio_json
+    return Response(content=content, media_type="application/json")
 
 
 @router.get("/{slug}/coaching", response_model=Dict[str, Any])
 async def get_private_coaching(
     slug: str,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db_ro)
 ):
     """
     Retrieve private coaching insights by slug.
@@ -172,13 +234,13 @@ async def get_private_coaching(
         )
 
     logger.info(f"Retrieved private coaching for slug: {slug}")
-    return portfolio.current_version.private_coaching_json
+    return _json_document_response(portfolio.current_version.private_coaching_json)
 
 
 @router.get("/{slug}/status", response_model=PortfolioStatusResponse)
 async def get_portfolio_status(
     slug: str,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db_ro)
 ):
     """
     Check portfolio generation status.
@@ -220,7 +282,7 @@ async def get_portfolio_status(
 async def view_portfolio_html(
     request: Request,
     slug: str,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db_ro)
 ):
     """
     Render portfolio as HTML page.
@@ -238,10 +300,11 @@ async def view_portfolio_html(
     Returns:
         Rendered HTML page
     """
-    # Query portfolio by slug with current_version
+    # Query only what the status checks need; the document itself is
+    # loaded below unless the rendered page is cached
     result = await db.execute(
         select(Portfolio)
-        .options(selectinload(Portfolio.current_version))
+        .options(load_only(Portfolio.status, Portfolio.error_message, Portfolio.current_version_id))
         .where(Portfolio.slug == slug)
     )
     portfolio = result.scalar_one_or_none()
@@ -270,29 +333,30 @@ async def view_portfolio_html(
             detail=f"Portfolio generation failed: {portfolio.error_message}"
         )
 
-    if portfolio.status != "completed" or not portfolio.current_version or not portfolio.current_version.public_portfolio_json:
-        raise HTTPException(
-            status_code=400,
-            detail="Portfolio is not ready for viewing yet"
-        )
+    cache_key = ("html", portfolio.current_version_id)
+    html = _public_render_cache.get(cache_key) if portfolio.status == "completed" else None
+    if html is None:
+        document = await _load_public_document(db, portfolio.current_version_id)
+        if portfolio.status != "completed" or not document:
+            raise HTTPException(
+                status_code=400,
+                detail="Portfolio is not ready for viewing yet"
+            )
 
-    # Render portfolio HTML from current version
-    logger.info(f"Rendering HTML portfolio for slug: {slug}")
+        # Render portfolio HTML from current version (the template only uses
+        # the document, so the page can be reused for every viewer)
+        logger.info(f"Rendering HTML portfolio for slug: {slug}")
+        html = templates.get_template("portfolio.html").render(portfolio=document)
+        _public_render_cache.set(cache_key, html)
 
-    return templates.TemplateResponse(
-        "portfolio.html",
-        {
-            "request": request,
-            "portfolio": portfolio.current_version.public_portfolio_json
-        }
-    )
+    return HTMLResponse(html)
 
 
 @router.get("/{slug}/versions")
 async def list_portfolio_versions(
     slug: str,
     limit: int = 50,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db_ro)
 ):
     """
     List all versions for a portfolio.
@@ -307,27 +371,34 @@ async def list_portfolio_versions(
     Returns:
         List of versions with metadata
     """
-    # Query portfolio by slug
+    # Portfolio and its latest versions in one round trip; the outer join
+    # still returns a row (with a NULL version id) when there are no
+    # versions. Metadata columns only: the snapshot JSON is never sent in the
+    # list, so it is not read or parsed
     result = await db.execute(
-        select(Portfolio).where(Portfolio.slug == slug)
+        select(
+            PortfolioVersion.id,
+            PortfolioVersion.version_number,
+            PortfolioVersion.version_state,
+            PortfolioVersion.changes_summary,
+            PortfolioVersion.created_at,
+            PortfolioVersion.created_by,
+        )
+        .select_from(Portfolio)
+        .outerjoin(PortfolioVersion, PortfolioVersion.portfolio_id == Portfolio.id)
+        .where(Portfolio.slug == slug)
+        .order_by(PortfolioVersion.version_number.desc())
+        .limit(limit)
     )
-    portfolio = result.scalar_one_or_none()
+    rows = result.all()
     
-    if not portfolio:
+    if not rows:
         raise HTTPException(
             status_code=404,
             detail=f"Portfolio not found with slug: {slug}"
         )
     
-    # Query all versions for this portfolio
-    from app.models.database import PortfolioVersion
-    versions_result = await db.execute(
-        select(PortfolioVersion)
-        .where(PortfolioVersion.portfolio_id == portfolio.id)
-        .order_by(PortfolioVersion.version_number.desc())
-        .limit(limit)
-    )
-    versions = versions_result.scalars().all()
+    versions = [row for row in rows if row.id is not None]
     
     # Format versions with all required fields
     version_list = [
@@ -382,7 +453,7 @@ async def get_my_portfolios(
 async def get_portfolio_version(
     slug: str,
     version_id: str,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db_ro)
 ):
     """
     Get a specific portfolio version by ID.
@@ -427,7 +498,7 @@ async def get_portfolio_version(
     
     logger.info(f"Retrieved version {version.version_number} for portfolio {slug}")
     
-    return {
+    return _json_document_response({
         "id": version.id,
         "version_number": version.version_number,
         "version_state": version.version_state.value,
@@ -435,11 +506,17 @@ async def get_portfolio_version(
         "changes_summary": version.changes_summary,
         "created_at": version.created_at.isoformat() + "Z",
         "created_by": version.created_by.value
-    }
+    })
+
 
+def _read_debug_log(path: Path, placeholder: str) -> str:
+    """Read an AI debug log file, or return placeholder if none was written yet."""
+    if not path.exists():
+        return placeholder
+    return path.read_text(encoding="utf-8")
 
 
-@router.get("/debug/last-ai-generation", response_class=HTMLResponse)
+@router.get("/debug/last-ai-generation", response_class=HTMLResponse, include_in_schema=False)
 async def get_last_debug_info(request: Request):
     """
     Debug endpoint to see the last AI prompt and response.
@@ -453,49 +530,23 @@ async def get_last_debug_info(request: Request):
         response_path = log_dir / "last_portfolio_generation_response.txt"
         error_path = log_dir / "last_portfolio_generation_error.txt"
         
-        prompt = "No prompt logged yet."
-        if prompt_path.exists():
-            with open(prompt_path, "r", encoding="utf-8") as f:
-                prompt = f.read()
-                
-        response = "No response logged yet."
-        if response_path.exists():
-            with open(response_path, "r", encoding="utf-8") as f:
-                response = f.read()
-                
-        error = "No error logged."
-        if error_path.exists():
-            with open(error_path, "r", encoding="utf-8") as f:
-                error = f.read()
-                
-        # Simple HTML response for easier reading
-        html_content = f"""
-        <html>
-            <head>
-                <title>AI Debug Info</title>
-                <style>
-                    body {{ font-family: sans-serif; padding: 20px; background: #f5f5f5; }}
-                    pre {{ background: #fff; padding: 15px; border-radius: 5px; border: 1px solid #ddd; overflow-x: auto; white-space: pre-wrap; }}
-                    h2 {{ color: #333; }}
-                    .error {{ color: #d32f2f; }}
-                </style>
-            </head>
-            <body>
-                <h1>Last AI Generation Debug Info</h1>
-                
-                <h2>1. Error (if any)</h2>
-                <pre class="error">{error}</pre>
-                
-                <h2>2. Prompt Sent to Gemini</h2>
-                <pre>{prompt}</pre>
-                
-                <h2>3. Raw Response from Gemini</h2>
-                <pre>{response}</pre>
+        # Read the three logs concurrently in worker threads, off the event loop
+        prompt, response, error = await asyncio.gather(
+            asyncio.to_thread(_read_debug_log, prompt_path, "No prompt logged yet."),
+            asyncio.to_thread(_read_debug_log, response_path, "No response logged yet."),
+            asyncio.to_thread(_read_debug_log, error_path, "No error logged."),
+        )
                 
-                <p><a href="/">Back to Home</a></p>
-            </body>
-        </html>
-        """
-        return HTMLResponse(content=html_content)
+        # Rendered with autoescape: logged prompts and model output may
+        # contain markup, which must show as text rather than run
+        return templates.TemplateResponse(
+            "debug.html",
+            {
+                "request": request,
+                "prompt": prompt,
+                "response": response,
+                "error": error
+            }
+        )
     except Exception as e:
-        return HTMLResponse(content=f"<h1>Debug Error</h1><p>{str(e)}</p>")
+        return HTMLResponse(content=f"<h1>Debug Error</h1><p>{html.escape(str(e))}</p>")
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, UploadFile, File, HTTPException
 from app.models.responses import ResumeResponse, ErrorResponse
-from app.utils.validators import check_file_validity, FileValidationError
-from app.utils.file_parser import extract_text
+from app.utils.validators import validate_file, FileValidationError
+from app.utils.file_parser import extract_text_async
 from app.config import logger
 
 router = APIRouter(prefix="/upload", tags=["Resume"])
@@ -26,26 +26,19 @@ async def upload_resume(file: UploadFile = File(...)) -> ResumeResponse:
     Returns the complete extracted text without any section splitting.
     """
     try:
-        # Read file content
-        file_content = await file.read()
-        file_size = len(file_content)
-        
-        logger.info(f"Processing resume file: {file.filename} ({file_size} bytes)")
-        
-        # Validate file
+        # Validate file (Starlette already spooled the body to a temp file, so
+        # its size is read from there instead of copying it into memory)
         try:
-            check_file_validity(
-                filename=file.filename,
-                content_type=file.content_type,
-                file_size=file_size
-            )
+            file_size = validate_file(file)
         except FileValidationError as e:
             logger.warning(f"Validation failed for {file.filename}: {str(e)}")
             raise HTTPException(status_code=400, detail=str(e))
         
-        # Extract text
+        logger.info(f"Processing resume file: {file.filename} ({file_size} bytes)")
+        
+        # Extract text from the spooled file off the event loop
         try:
-            extracted_text = extract_text(file_content, file.filename)
+            extracted_text = await extract_text_async(file.file, file.filename, file_size)
             logger.info(f"Extracted {len(extracted_text)} characters from resume")
         except Exception as e:
             logger.error(f"Text extraction failed: {str(e)}")
@@ -1,11 +1,15 @@
 """AI Service for portfolio content generation using Google Gemini"""
+import asyncio
 import logging
 import json
+import hashlib
 from typing import Dict, Any, Optional, List
 from pathlib import Path
 from datetime import datetime
+import orjson
 import google.generativeai as genai
 from app.config import GEMINI_API_KEY
+from app.utils.ttl_cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
@@ -18,11 +22,17 @@ else:
 # Use Gemini Flash Latest for best compatibility and free tier
 MODEL_NAME = "gemini-flash-latest"
 
+# Refinements replayed on unchanged content (common while iterating in the
+# editor) reuse the earlier answer instead of another model call. Answers are
+# kept as JSON bytes so every hit hands out its own copy of the document
+_refine_cache = TTLCache(ttl=3600.0, max_size=1000)
+
 
 async def refine_portfolio_content(
     current_portfolio_json: Dict[str, Any],
     instruction: str,
-    sections_to_modify: List[str]
+    sections_to_modify: List[str],
+    use_cache: bool = True
 ) -> Dict[str, Any]:
     """
     Refine specific sections of a portfolio using AI.
@@ -35,6 +45,8 @@ async def refine_portfolio_content(
         current_portfolio_json: Complete current portfolio JSON
         instruction: User's refinement instruction
         sections_to_modify: List of section names to modify (e.g., ["summary", "experience"])
+        use_cache: Reuse an earlier refinement of the same document with the
+            same instruction and sections; False always asks the model again
     
     Returns:
         Complete refined portfolio JSON
@@ -45,6 +57,17 @@ async def refine_portfolio_content(
     if not GEMINI_API_KEY:
         raise Exception("GEMINI_API_KEY not configured")
     
+    content_hash = hashlib.blake2b(
+        orjson.dumps(current_portfolio_json, option=orjson.OPT_SORT_KEYS),
+        digest_size=16
+    ).hexdigest()
+    cache_key = (tuple(sections_to_modify), instruction, content_hash)
+    if use_cache:
+        cached_refinement = _refine_cache.get(cache_key)
+        if cached_refinement is not None:
+            logger.info(f"Reusing cached refinement - sections: {sections_to_modify}")
+            return orjson.loads(cached_refinement)
+    
     # Build the refinement prompt
     prompt = _build_refinement_prompt(
         current_portfolio_json=current_portfolio_json,
@@ -58,7 +81,10 @@ async def refine_portfolio_content(
     try:
         # Call Gemini API
         model = genai.GenerativeModel(MODEL_NAME)
-        response = model.generate_content(
+        # The SDK call is synchronous; run it in a worker thread so concurrent
+        # refinements overlap instead of blocking the event loop in turn
+        response = await asyncio.to_thread(
+            model.generate_content,
             prompt,
             generation_config=genai.types.GenerationConfig(
                 temperature=0.7,
@@ -81,6 +107,7 @@ async def refine_portfolio_content(
         refined_json = json.loads(response_text)
         
         logger.info(f"Successfully refined portfolio - sections: {sections_to_modify}")
+        _refine_cache.set(cache_key, orjson.dumps(refined_json))
         return refined_json
         
     except json.JSONDecodeError as e:
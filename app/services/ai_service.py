@@ -1,4 +1,5 @@
 """AI Service for portfolio content generation using Google Gemini"""
+import asyncio
 import logging
 import json
 from typing import Dict, Any, Optional, List
@@ -266,7 +267,10 @@ CONSTRAINTS:
 
 OUTPUT: Only the refined content, no explanations or metadata. Output as plain text, not JSON."""
 
-        response = model.generate_content(
+        # The SDK call is synchronous; run it in a worker thread so concurrent
+        # refinements overlap instead of blocking the event loop in turn
+        response = await asyncio.to_thread(
+            model.generate_content,
             prompt,
             generation_config=genai.types.GenerationConfig(
                 temperature=0.6,
@@ -2,19 +2,20 @@
 import asyncio
 import json
 import os
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any, Dict, List, Tuple
 
 import google.generativeai as genai
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, insert
 from sqlalchemy.future import select
 
 from app.config import (
     GEMINI_API_KEY,
     logger,
 )
-from app.models.database import ChatMessage, Conversation, Portfolio, User
+from app.models.database import ChatMessage, Conversation, Portfolio, PortfolioGithubRepo, User
 from app.services.rag_service import format_profile_evidence, retrieve_profile_evidence, should_retrieve_profile_context
 
 
@@ -73,21 +74,37 @@ async def gather_user_context(user: User, db: AsyncSession) -> Dict[str, Any]:
             "github_profile": f"https://github.com/{user.username}",
         }
     }
+    # Only flags are needed, so the payload columns stay deferred: the has_*
+    # columns record which sources generation used, and the repo count comes
+    # from the shredded portfolio_github_repos rows
+    github_repos_count = (
+        select(func.count(PortfolioGithubRepo.id))
+        .where(PortfolioGithubRepo.portfolio_id == Portfolio.id)
+        .correlate(Portfolio)
+        .scalar_subquery()
+    )
     result = await db.execute(
-        select(Portfolio)
+        select(
+            Portfolio.has_resume,
+            Portfolio.has_leetcode,
+            Portfolio.has_codeforces,
+            Portfolio.has_linkedin,
+            Portfolio.portfolio_focus,
+            github_repos_count.label("github_repos_count"),
+        )
         .where(Portfolio.user_id == user.id)
         .order_by(Portfolio.created_at.desc())
         .limit(1)
     )
-    portfolio = result.scalars().first()
+    portfolio = result.first()
 
     if portfolio:
         context.update({
-            "has_resume": bool(portfolio.resume_text),
-            "github_repos_count": len(portfolio.github_data or []),
-            "has_leetcode": bool(portfolio.leetcode_data),
-            "has_codeforces": bool(portfolio.codeforces_data),
-            "has_linkedin": bool(portfolio.linkedin_data),
+            "has_resume": bool(portfolio.has_resume),
+            "github_repos_count": portfolio.github_repos_count,
+            "has_leetcode": bool(portfolio.has_leetcode),
+            "has_codeforces": bool(portfolio.has_codeforces),
+            "has_linkedin": bool(portfolio.has_linkedin),
             "portfolio_focus": portfolio.portfolio_focus or "general",
         })
     else:
@@ -303,13 +320,24 @@ When changed is true, include only fields that should replace their current valu
         return _normalise_state(current_state), False
 
 
+async def _load_prompt_inputs(
+    user: User, conversation_id: str, db: AsyncSession
+) -> Tuple[Dict[str, Any], List[Dict[str, str]]]:
+    """Read the user context and recent history for a prompt, one after the other."""
+    context = await gather_user_context(user, db)
+    history = await get_conversation_history(conversation_id, db, limit=4)
+    return context, history
+
+
 async def send_message(
     user_message: str, user: User, conversation: Conversation, db: AsyncSession
 ) -> Dict[str, Any]:
     """Answer one message and refresh only this conversation's compact state."""
-    context_task = asyncio.create_task(gather_user_context(user, db))
+    # One session runs one query at a time, so both DB reads share a task;
+    # the RAG retrieval (embedding + vector search) overlaps them
+    db_reads_task = asyncio.create_task(_load_prompt_inputs(user, conversation.id, db))
     retrieval_task = asyncio.create_task(retrieve_profile_evidence(user.id, user_message))
-    context, evidence_matches = await asyncio.gather(context_task, retrieval_task)
+    (context, history), evidence_matches = await asyncio.gather(db_reads_task, retrieval_task)
     if should_retrieve_profile_context(user_message):
         _write_career_debug_log(
             "rag_retrieval_completed",
@@ -331,7 +359,6 @@ async def send_message(
     system_prompt = build_career_bot_system_prompt(
         context, conversation.state_json, conversation.summary, format_profile_evidence(evidence_matches)
     )
-    history = await get_conversation_history(conversation.id, db, limit=4)
     history.append({"role": "user", "content": user_message})
     _write_career_debug_log(
         "chat_prompt_context",
@@ -365,24 +392,37 @@ async def send_message(
         )
         raise RuntimeError("AI service unavailable. Please try again later.") from gemini_error
 
-    user_record = ChatMessage(
-        user_id=user.id,
-        conversation_id=conversation.id,
-        role="user",
-        content=user_message,
-    )
-    assistant_record = ChatMessage(
-        user_id=user.id,
-        conversation_id=conversation.id,
-        role="assistant",
-        content=assistant_response,
-        ai_service=ai_service,
-        model_used=model_used,
+    # Both messages go in one executemany INSERT; nothing reads them back,
+    # so there is no need to build ORM objects for the identity map.
+    # Timestamps are set here: the reply's is returned to the client, and
+    # it is one microsecond after the question's so the two never tie under
+    # the (created_at, id) history order
+    user_created_at = datetime.utcnow()
+    assistant_created_at = user_created_at + timedelta(microseconds=1)
+    await db.execute(
+        insert(ChatMessage),
+        [
+            {
+                "user_id": user.id,
+                "conversation_id": conversation.id,
+                "role": "user",
+                "content": user_message,
+                "created_at": user_created_at,
+            },
+            {
+                "user_id": user.id,
+                "conversation_id": conversation.id,
+                "role": "assistant",
+                "content": assistant_response,
+                "ai_service": ai_service,
+                "model_used": model_used,
+                "created_at": assistant_created_at,
+            },
+        ],
     )
     conversation.state_json = updated_state
     conversation.summary = updated_state["summary"]
     conversation.updated_at = datetime.utcnow()
-    db.add_all([user_record, assistant_record, conversation])
     await db.commit()
     _write_career_debug_log(
         "conversation_message_saved",
@@ -397,7 +437,7 @@ async def send_message(
         "assistant_message": assistant_response,
         "ai_service": ai_service,
         "model_used": model_used,
-        "timestamp": assistant_record.created_at.isoformat(),
+        "timestamp": assistant_created_at.isoformat(),
         "conversation_id": conversation.id,
         "state_updated": state_updated,
     }
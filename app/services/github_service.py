@@ -1,18 +1,38 @@
 import os
-import re
+import asyncio
 import base64
 import httpx
-from typing import Tuple, Optional
-from dotenv import load_dotenv
-from app.models.responses import GitHubRepoAnalysis, RepositoryStructure
+from typing import Dict, List, Tuple, Optional
+from app.models.responses import GITHUB_URL_RE, GitHubRepoAnalysis, RepositoryStructure
 from app.config import logger
-
-# Load environment variables
-load_dotenv()
+from app.http_client import get_http_client
 
 # GitHub API base URL
 GITHUB_API_BASE = "https://api.github.com"
 
+GITHUB_GRAPHQL_URL = f"{GITHUB_API_BASE}/graphql"
+
+# Caps repository analyses in flight across all requests, so concurrent
+# callers cannot burst past GitHub's secondary rate limits. Each analysis
+# makes up to three sequential API calls.
+MAX_CONCURRENT_ANALYSES = 10
+_analysis_slots = asyncio.Semaphore(MAX_CONCURRENT_ANALYSES)
+
+# README paths tried by the batched GraphQL query; repositories whose README
+# lives anywhere else fall back to the REST /readme endpoint
+_README_CANDIDATES = ("README.md", "readme.md", "Readme.md", "README.rst", "README.txt", "README")
+
+# Fields fetched per repository by prefetch_repositories
+_REPO_FIELDS_FRAGMENT = (
+    "fragment RepoFields on Repository {"
+    " name description primaryLanguage { name } updatedAt defaultBranchRef { name }"
+    + "".join(
+        f' readme{i}: object(expression: "HEAD:{path}") {{ ... on Blob {{ text }} }}'
+        for i, path in enumerate(_README_CANDIDATES)
+    )
+    + " }"
+)
+
 
 def load_github_token() -> Optional[str]:
     """
@@ -47,8 +67,7 @@ def parse_github_url(url: str) -> Tuple[str, str]:
     url = url.rstrip('/')
     
     # Pattern: https://github.com/owner/repo
-    pattern = r'^https?://github\.com/([\w\-\.]+)/([\w\-\.]+)/?$'
-    match = re.match(pattern, url)
+    match = GITHUB_URL_RE.match(url)
     
     if not match:
         raise ValueError(f"Invalid GitHub URL format: {url}")
@@ -59,6 +78,7 @@ def parse_github_url(url: str) -> Tuple[str, str]:
 
 async def get_repo_metadata(
     client: httpx.AsyncClient,
+    headers: dict,
     owner: str,
     repo: str
 ) -> dict:
@@ -67,6 +87,7 @@ async def get_repo_metadata(
     
     Args:
         client: HTTP client
+        headers: GitHub API headers (auth, accept, API version)
         owner: Repository owner
         repo: Repository name
         
@@ -80,7 +101,7 @@ async def get_repo_metadata(
     
     logger.info(f"Fetching metadata for {owner}/{repo}")
     
-    response = await client.get(url)
+    response = await client.get(url, headers=headers, timeout=30.0)
     response.raise_for_status()
     
     return response.json()
@@ -88,6 +109,7 @@ async def get_repo_metadata(
 
 async def get_repo_tree(
     client: httpx.AsyncClient,
+    headers: dict,
     owner: str,
     repo: str,
     branch: str
@@ -97,6 +119,7 @@ async def get_repo_tree(
     
     Args:
         client: HTTP client
+        headers: GitHub API headers (auth, accept, API version)
         owner: Repository owner
         repo: Repository name
         branch: Branch name (usually 'main' or 'master')
@@ -111,7 +134,7 @@ async def get_repo_tree(
     
     logger.info(f"Fetching tree for {owner}/{repo} (branch: {branch})")
     
-    response = await client.get(url)
+    response = await client.get(url, headers=headers, timeout=30.0)
     response.raise_for_status()
     
     return response.json()
@@ -175,8 +198,27 @@ def analyze_tree_structure(tree_data: dict) -> RepositoryStructure:
     )
 
 
+def truncate_readme(readme_text: str) -> Tuple[str, int]:
+    """
+    Truncate README text to 10,000 characters at the nearest newline.
+    
+    Returns:
+        Tuple of (readme_text, readme_length)
+    """
+    if len(readme_text) > 10000:
+        # Find the last newline before 10,000 chars
+        truncate_pos = readme_text.rfind('\n', 0, 10000)
+        if truncate_pos == -1:
+            # No newline found, just truncate at 10,000
+            truncate_pos = 10000
+        readme_text = readme_text[:truncate_pos]
+    
+    return readme_text, len(readme_text)
+
+
 async def get_readme(
     client: httpx.AsyncClient,
+    headers: dict,
     owner: str,
     repo: str
 ) -> Tuple[str, int]:
@@ -185,6 +227,7 @@ async def get_readme(
     
     Args:
         client: HTTP client
+        headers: GitHub API headers (auth, accept, API version)
         owner: Repository owner
         repo: Repository name
         
@@ -196,7 +239,7 @@ async def get_readme(
     logger.info(f"Fetching README for {owner}/{repo}")
     
     try:
-        response = await client.get(url)
+        response = await client.get(url, headers=headers, timeout=30.0)
         response.raise_for_status()
         
         data = response.json()
@@ -204,18 +247,7 @@ async def get_readme(
         
         # Decode base64 content
         readme_bytes = base64.b64decode(content_b64)
-        readme_text = readme_bytes.decode('utf-8', errors='ignore')
-        
-        # Truncate to 10,000 characters at nearest newline
-        if len(readme_text) > 10000:
-            # Find the last newline before 10,000 chars
-            truncate_pos = readme_text.rfind('\n', 0, 10000)
-            if truncate_pos == -1:
-                # No newline found, just truncate at 10,000
-                truncate_pos = 10000
-            readme_text = readme_text[:truncate_pos]
-        
-        readme_length = len(readme_text)
+        readme_text, readme_length = truncate_readme(readme_bytes.decode('utf-8', errors='ignore'))
         
         logger.info(f"README fetched: {readme_length} characters")
         
@@ -239,34 +271,122 @@ async def get_user_repositories(access_token: str) -> list:
         "X-GitHub-Api-Version": "2022-11-28"
     }
 
-    async with httpx.AsyncClient(headers=headers, timeout=30.0) as client:
-        # Fetch user's repositories (sorted by last updated)
-        response = await client.get(
-            f"{GITHUB_API_BASE}/user/repos?sort=updated&per_page=100",
+    client = get_http_client()
+    # Fetch user's repositories (sorted by last updated)
+    response = await client.get(
+        f"{GITHUB_API_BASE}/user/repos?sort=updated&per_page=100",
+        headers=headers,
+        timeout=30.0,
+    )
+    response.raise_for_status()
+
+    repos = response.json()
+    return [
+        {
+            "name": repo.get("name"),
+            "full_name": repo.get("full_name"),
+            "html_url": repo.get("html_url"),
+            "description": repo.get("description"),
+            "language": repo.get("language"),
+            "stargazers_count": repo.get("stargazers_count"),
+            "updated_at": repo.get("updated_at")
+        }
+        for repo in repos
+    ]
+
+
+async def prefetch_repositories(repo_urls: List[str]) -> List[Optional[dict]]:
+    """
+    Fetch metadata and README text for several repositories in one GraphQL query.
+    
+    Best effort: GraphQL requires a token, and a repository missing from the
+    result (invalid URL, not found, or the query failing) is simply left
+    out, so analyze_repository falls back to REST and reports the error.
+    
+    Args:
+        repo_urls: GitHub repository URLs
+        
+    Returns:
+        One entry per URL, in order: {"metadata": ..., "readme": ...} for
+        analyze_repository's prefetched argument, or None. Metadata is shaped
+        like the REST response; readme is None when none of the usual README
+        paths exist
+    """
+    prefetched: List[Optional[dict]] = [None] * len(repo_urls)
+    token = load_github_token()
+    if not token:
+        return prefetched
+    
+    # Index into repo_urls -> (owner, repo) for the URLs that parse
+    repos: Dict[int, Tuple[str, str]] = {}
+    for index, url in enumerate(repo_urls):
+        try:
+            repos[index] = parse_github_url(url)
+        except (ValueError, AttributeError):
+            continue
+    if not repos:
+        return prefetched
+    
+    # One aliased repository() selection per URL; owner/name go in variables
+    variables = {}
+    selections = []
+    for i, (owner, repo) in enumerate(repos.values()):
+        variables[f"owner{i}"] = owner
+        variables[f"name{i}"] = repo
+        selections.append(f"r{i}: repository(owner: $owner{i}, name: $name{i}) {{ ...RepoFields }}")
+    params = ", ".join(f"$owner{i}: String!, $name{i}: String!" for i in range(len(repos)))
+    query = f"query({params}) {{ {' '.join(selections)} }} {_REPO_FIELDS_FRAGMENT}"
+    
+    logger.info(f"Fetching metadata for {len(repos)} repositories via GraphQL")
+    
+    try:
+        response = await get_http_client().post(
+            GITHUB_GRAPHQL_URL,
+            headers={"Authorization": f"Bearer {token}"},
+            json={"query": query, "variables": variables},
+            timeout=30.0
         )
         response.raise_for_status()
-
-        repos = response.json()
-        return [
-            {
-                "name": repo.get("name"),
-                "full_name": repo.get("full_name"),
-                "html_url": repo.get("html_url"),
-                "description": repo.get("description"),
-                "language": repo.get("language"),
-                "stargazers_count": repo.get("stargazers_count"),
-                "updated_at": repo.get("updated_at")
-            }
-            for repo in repos
-        ]
+        data = response.json().get("data") or {}
+    except (httpx.HTTPError, ValueError) as e:
+        logger.warning(f"GraphQL prefetch failed, falling back to REST: {e}")
+        return prefetched
+    
+    for i, index in enumerate(repos):
+        node = data.get(f"r{i}")
+        if not node:
+            continue
+        readme = next(
+            (
+                blob["text"]
+                for j in range(len(_README_CANDIDATES))
+                if (blob := node.get(f"readme{j}")) and blob.get("text") is not None
+            ),
+            None
+        )
+        prefetched[index] = {
+            "metadata": {
+                "name": node.get("name"),
+                "description": node.get("description"),
+                "language": (node.get("primaryLanguage") or {}).get("name"),
+                "updated_at": node.get("updatedAt"),
+                "default_branch": (node.get("defaultBranchRef") or {}).get("name") or "main",
+            },
+            "readme": readme,
+        }
+    return prefetched
 
 
-async def analyze_repository(repo_url: str) -> GitHubRepoAnalysis:
+async def analyze_repository(repo_url: str, prefetched: Optional[dict] = None) -> GitHubRepoAnalysis:
     """
     Analyze a single GitHub repository.
+
+    Waits for a free slot when MAX_CONCURRENT_ANALYSES are already running.
     
     Args:
         repo_url: GitHub repository URL
+        prefetched: This repository's entry from prefetch_repositories, if
+            any; its metadata and README replace the matching REST calls
         
     Returns:
         GitHubRepoAnalysis with all metrics
@@ -275,6 +395,12 @@ async def analyze_repository(repo_url: str) -> GitHubRepoAnalysis:
         ValueError: If URL is invalid or token is missing
         httpx.HTTPStatusError: If GitHub API returns error
     """
+    async with _analysis_slots:
+        return await _analyze_repository(repo_url, prefetched)
+
+
+async def _analyze_repository(repo_url: str, prefetched: Optional[dict]) -> GitHubRepoAnalysis:
+    """Body of analyze_repository, run while holding an analysis slot."""
     # Load token (optional; unauthenticated requests are allowed but rate limited)
     token = load_github_token()
     
@@ -289,10 +415,13 @@ async def analyze_repository(repo_url: str) -> GitHubRepoAnalysis:
     if token:
         headers["Authorization"] = f"Bearer {token}"
     
-    async with httpx.AsyncClient(headers=headers, timeout=30.0) as client:
-        # Fetch metadata
+    client = get_http_client()
+    # Fetch metadata (unless the batched GraphQL query already did)
+    if prefetched is not None:
+        metadata = prefetched["metadata"]
+    else:
         try:
-            metadata = await get_repo_metadata(client, owner, repo)
+            metadata = await get_repo_metadata(client, headers, owner, repo)
         except httpx.HTTPStatusError as e:
             if e.response.status_code == 403 and not token:
                 # Clear guidance when hitting unauthenticated rate limit
@@ -301,30 +430,33 @@ async def analyze_repository(repo_url: str) -> GitHubRepoAnalysis:
                     "Add a personal access token in .env as GITHUB_TOKEN="
                 )
             raise
-        
-        # Extract metadata fields
-        name = metadata.get("name", "")
-        description = metadata.get("description") or ""
-        primary_language = metadata.get("language") or "Unknown"
-        last_updated = metadata.get("updated_at", "")
-        default_branch = metadata.get("default_branch", "main")
-        
-        # Fetch tree structure
-        tree_data = await get_repo_tree(client, owner, repo, default_branch)
-        structure = analyze_tree_structure(tree_data)
-        
-        # Fetch README
-        readme_text, readme_length = await get_readme(client, owner, repo)
-        
-        logger.info(f"Analysis complete for {owner}/{repo}")
-        
-        return GitHubRepoAnalysis(
-            name=name,
-            description=description,
-            primary_language=primary_language,
-            last_updated=last_updated,
-            github_url=f"https://github.com/{owner}/{repo}",
-            readme_text=readme_text,
-            readme_length=readme_length,
-            structure=structure
-        )
+    
+    # Extract metadata fields
+    name = metadata.get("name", "")
+    description = metadata.get("description") or ""
+    primary_language = metadata.get("language") or "Unknown"
+    last_updated = metadata.get("updated_at", "")
+    default_branch = metadata.get("default_branch", "main")
+    
+    # Fetch tree structure
+    tree_data = await get_repo_tree(client, headers, owner, repo, default_branch)
+    structure = analyze_tree_structure(tree_data)
+    
+    # Fetch README
+    if prefetched is not None and prefetched["readme"] is not None:
+        readme_text, readme_length = truncate_readme(prefetched["readme"])
+    else:
+        readme_text, readme_length = await get_readme(client, headers, owner, repo)
+    
+    logger.info(f"Analysis complete for {owner}/{repo}")
+    
+    return GitHubRepoAnalysis(
+        name=name,
+        description=description,
+        primary_language=primary_language,
+        last_updated=last_updated,
+        github_url=f"https://github.com/{owner}/{repo}",
+        readme_text=readme_text,
+        readme_length=readme_length,
+        structure=structure
+    )
@@ -1,10 +1,16 @@
 import httpx
 from app.models.responses import LeetCodeResponse
 from app.config import logger
+from app.http_client import get_http_client
+from app.utils.ttl_cache import TTLCache
+from app.utils.upstream import UpstreamError
 
 # LeetCode GraphQL API endpoint
 LEETCODE_GRAPHQL_URL = "https://leetcode.com/graphql"
 
+# Solved counts change slowly; reuse a user's stats for a few minutes
+_stats_cache = TTLCache(ttl=300.0, max_size=1024)
+
 # GraphQL query to fetch user profile and submission statistics
 GRAPHQL_QUERY = """
 query getUserProfile($username: String!) {
@@ -35,6 +41,10 @@ async def fetch_leetcode_stats(username: str) -> LeetCodeResponse:
         httpx.HTTPStatusError: If API request fails (404 if user not found)
         httpx.RequestError: If network error occurs
     """
+    cached_stats = _stats_cache.get(username)
+    if cached_stats is not None:
+        return cached_stats
+
     logger.info(f"Fetching LeetCode stats for user: {username}")
     
     # Prepare GraphQL request
@@ -45,79 +55,77 @@ async def fetch_leetcode_stats(username: str) -> LeetCodeResponse:
         }
     }
     
-    async with httpx.AsyncClient(timeout=15.0) as client:
-        try:
-            # Send POST request to LeetCode GraphQL endpoint
-            response = await client.post(
-                LEETCODE_GRAPHQL_URL,
-                json=payload,
-                headers={
-                    "Content-Type": "application/json",
-                    "Referer": "https://leetcode.com"
-                }
-            )
-            response.raise_for_status()
-            
-            # Parse response
-            data = response.json()
-            
-            # Check if user exists
-            matched_user = data.get("data", {}).get("matchedUser")
-            
-            if matched_user is None:
-                logger.warning(f"LeetCode user not found: {username}")
-                # Raise HTTPStatusError with 404 to be caught by router
-                raise httpx.HTTPStatusError(
-                    message=f"User '{username}' not found on LeetCode",
-                    request=response.request,
-                    response=response
-                )
-            
-            # Extract submission statistics
-            submit_stats = matched_user.get("submitStats", {})
-            ac_submission_num = submit_stats.get("acSubmissionNum", [])
-            
-            # Initialize counters
-            total_solved = 0
-            easy_solved = 0
-            medium_solved = 0
-            hard_solved = 0
-            
-            # Parse difficulty counts
-            for stat in ac_submission_num:
-                difficulty = stat.get("difficulty", "")
-                count = stat.get("count", 0)
-                
-                if difficulty == "All":
-                    total_solved = count
-                elif difficulty == "Easy":
-                    easy_solved = count
-                elif difficulty == "Medium":
-                    medium_solved = count
-                elif difficulty == "Hard":
-                    hard_solved = count
-            
-            # Build profile URL
-            profile_url = f"https://leetcode.com/{username}"
-            
-            logger.info(f"Stats for {username}: total={total_solved}, "
-                       f"easy={easy_solved}, medium={medium_solved}, hard={hard_solved}")
-            
-            return LeetCodeResponse(
-                username=username,
-                total_solved=total_solved,
-                easy_solved=easy_solved,
-                medium_solved=medium_solved,
-                hard_solved=hard_solved,
-                profile_url=profile_url
-            )
+    client = get_http_client()
+    try:
+        # Send POST request to LeetCode GraphQL endpoint
+        response = await client.post(
+            LEETCODE_GRAPHQL_URL,
+            json=payload,
+            headers={
+                "Content-Type": "application/json",
+                "Referer": "https://leetcode.com"
+            },
+            timeout=15.0
+        )
+        response.raise_for_status()
+        
+        # Parse response
+        data = response.json()
+        
+        # Check if user exists
+        matched_user = data.get("data", {}).get("matchedUser")
+        
+        if matched_user is None:
+            logger.warning(f"LeetCode user not found: {username}")
+            raise UpstreamError(404, f"LeetCode user '{username}' not found")
+        
+        # Extract submission statistics
+        submit_stats = matched_user.get("submitStats", {})
+        ac_submission_num = submit_stats.get("acSubmissionNum", [])
+        
+        # Initialize counters
+        total_solved = 0
+        easy_solved = 0
+        medium_solved = 0
+        hard_solved = 0
+        
+        # Parse difficulty counts
+        for stat in ac_submission_num:
+            difficulty = stat.get("difficulty", "")
+            count = stat.get("count", 0)
             
-        except httpx.HTTPStatusError:
-            # Re-raise HTTP errors (including our custom 404)
-            raise
-        except httpx.RequestError as e:
-            logger.error(f"Network error fetching LeetCode data: {e}")
-            raise
-        except Exception as e:
-            logger.error(f"Unexpected error parsing LeetCode response: {e}")
-            raise
+            if difficulty == "All":
+                total_solved = count
+            elif difficulty == "Easy":
+                easy_solved = count
+            elif difficulty == "Medium":
+                medium_solved = count
+            elif difficulty == "Hard":
+                hard_solved = count
+        
+        # Build profile URL
+        profile_url = f"https://leetcode.com/{username}"
+        
+        logger.info(f"Stats for {username}: total={total_solved}, "
+                   f"easy={easy_solved}, medium={medium_solved}, hard={hard_solved}")
+        
+        stats = LeetCodeResponse(
+            username=username,
+            total_solved=total_solved,
+            easy_solved=easy_solved,
+            medium_solved=medium_solved,
+            hard_solved=hard_solved,
+            profile_url=profile_url
+        )
+        _stats_cache.set(username, stats)
+        return stats
+        
+    except (httpx.HTTPStatusError, UpstreamError):
+        # Re-raise HTTP errors and the not-found error above
+        raise
+    except httpx.RequestError as e:
+        logger.error(f"Network error fetching LeetCode data: {e}")
+        raise
+    except Exception as e:
+        logger.error(f"Unexpected error parsing LeetCode response: {e}")
+        raise
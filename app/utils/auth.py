@@ -1,13 +1,20 @@
 import os
+import time
 from datetime import datetime, timedelta
 from typing import Optional, Union, Any
 from jose import jwt
 from passlib.context import CryptContext
 from app.config import JWT_SECRET, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES
+from app.utils.ttl_cache import TTLCache
 
 # Password hashing context (optional for OAuth-only, but good practice)
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Decoded payloads of recently verified tokens, so repeat requests with the
+# same bearer token skip the signature check. Only valid tokens are stored,
+# and each entry expires no later than the token's own "exp".
+_token_cache = TTLCache(ttl=3600.0, max_size=4096)
+
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """
@@ -28,8 +35,17 @@ def verify_token(token: str) -> Optional[dict]:
     """
     Verify a JWT access token and return the payload.
     """
+    payload = _token_cache.get(token)
+    if payload is not None:
+        return payload
+
     try:
         payload = jwt.decode(token, JWT_SECRET, algorithms=[ALGORITHM])
-        return payload
     except Exception:
         return None
+
+    if "exp" in payload:
+        remaining = payload["exp"] - time.time()
+        if remaining > 0:
+            _token_cache.set(token, payload, ttl=min(_token_cache.ttl, remaining))
+    return payload
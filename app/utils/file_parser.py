@@ -1,10 +1,24 @@
 import re
 import io
-from typing import Optional
+import os
+import asyncio
+import hashlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import BinaryIO, Optional, Union
 import pdfplumber
 from docx import Document
 from app.config import logger
 
+# Uploads at least this large are parsed in a worker process. pdfplumber is
+# pure Python, so a big PDF parsed in a thread still holds the GIL for
+# seconds and stalls the event loop; smaller files are not worth the copy
+# into another process.
+PROCESS_POOL_MIN_BYTES = 512 * 1024
+PROCESS_POOL_MAX_WORKERS = min(4, os.cpu_count() or 1)
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+
 
 def normalize_whitespace(text: str) -> str:
     """
@@ -29,12 +43,32 @@ def normalize_whitespace(text: str) -> str:
     return text.strip()
 
 
-def extract_text_from_pdf(file_bytes: bytes) -> str:
+def _as_stream(source: Union[bytes, BinaryIO]) -> BinaryIO:
+    """Wrap raw bytes in a stream; file objects (e.g. a spooled upload) pass through."""
+    return io.BytesIO(source) if isinstance(source, (bytes, bytearray)) else source
+
+
+def content_digest(source: BinaryIO) -> str:
+    """
+    Hash a binary file object's contents, leaving it rewound for parsing.
+
+    Used to recognise re-uploads of the same file, so it only needs to be
+    collision resistant, not secret.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    source.seek(0)
+    for chunk in iter(lambda: source.read(1024 * 1024), b""):
+        digest.update(chunk)
+    source.seek(0)
+    return digest.hexdigest()
+
+
+def extract_text_from_pdf(source: Union[bytes, BinaryIO]) -> str:
     """
     Extracts text content from PDF file using pdfplumber.
     
     Args:
-        file_bytes: PDF file content as bytes
+        source: PDF file content as bytes or a seekable binary file object
     
     Returns:
         Extracted text
@@ -45,7 +79,7 @@ def extract_text_from_pdf(file_bytes: bytes) -> str:
     try:
         text_chunks = []
         
-        with pdfplumber.open(io.BytesIO(file_bytes)) as pdf:
+        with pdfplumber.open(_as_stream(source)) as pdf:
             if len(pdf.pages) == 0:
                 logger.warning("PDF has no pages")
                 return ""
@@ -66,12 +100,12 @@ def extract_text_from_pdf(file_bytes: bytes) -> str:
         raise Exception(f"Could not parse PDF file: {str(e)}")
 
 
-def extract_text_from_docx(file_bytes: bytes) -> str:
+def extract_text_from_docx(source: Union[bytes, BinaryIO]) -> str:
     """
     Extracts text from DOCX file using python-docx.
     
     Args:
-        file_bytes: DOCX file content as bytes
+        source: DOCX file content as bytes or a seekable binary file object
     
     Returns:
         Extracted text
@@ -80,7 +114,7 @@ def extract_text_from_docx(file_bytes: bytes) -> str:
         Exception: If DOCX parsing fails
     """
     try:
-        doc = Document(io.BytesIO(file_bytes))
+        doc = Document(_as_stream(source))
         
         if not doc.paragraphs:
             logger.warning("DOCX has no paragraphs")
@@ -108,12 +142,13 @@ def extract_text_from_docx(file_bytes: bytes) -> str:
         raise Exception(f"Could not parse DOCX file: {str(e)}")
 
 
-def extract_text(file_bytes: bytes, filename: str) -> str:
+def extract_text(source: Union[bytes, BinaryIO], filename: str) -> str:
     """
     Routes to appropriate extraction method based on file extension.
     
     Args:
-        file_bytes: File content as bytes
+        source: File content as bytes, or a seekable binary file object such
+            as UploadFile.file so the upload is parsed without copying it
         filename: Original filename
     
     Returns:
@@ -122,8 +157,57 @@ def extract_text(file_bytes: bytes, filename: str) -> str:
     ext = filename.lower().split('.')[-1]
     
     if ext == 'pdf':
-        return extract_text_from_pdf(file_bytes)
+        return extract_text_from_pdf(source)
     elif ext == 'docx':
-        return extract_text_from_docx(file_bytes)
+        return extract_text_from_docx(source)
     else:
         raise ValueError(f"Unsupported file extension: {ext}")
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    """Return the shared extraction process pool, creating it on first use."""
+    global _process_pool
+    if _process_pool is None:
+        # spawn rather than fork: forking a process that runs an event loop
+        # and worker threads can deadlock the child
+        _process_pool = ProcessPoolExecutor(
+            max_workers=PROCESS_POOL_MAX_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _process_pool
+
+
+async def extract_text_async(source: BinaryIO, filename: str, size: int) -> str:
+    """
+    Run extract_text off the event loop.
+
+    Small files are parsed in a thread straight from the spooled upload;
+    files of PROCESS_POOL_MIN_BYTES or more are read and parsed in the
+    shared process pool.
+
+    Args:
+        source: Seekable binary file object, e.g. UploadFile.file
+        filename: Original filename
+        size: File size in bytes (as returned by validate_file)
+
+    Returns:
+        Extracted text
+    """
+    if size < PROCESS_POOL_MIN_BYTES:
+        return await asyncio.to_thread(extract_text, source, filename)
+
+    source.seek(0)
+    content = await asyncio.to_thread(source.read)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_process_pool(), extract_text, content, filename)
+
+
+def shutdown_process_pool():
+    """
+    Stop the extraction process pool.
+    Call this on application shutdown.
+    """
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(cancel_futures=True)
+        _process_pool = None
@@ -0,0 +1,78 @@
+"""Shared translation of GitHub/Codeforces/LeetCode API failures into HTTP errors"""
+import functools
+import inspect
+
+import httpx
+from fastapi import HTTPException
+
+from app.config import logger
+
+
+class UpstreamError(Exception):
+    """
+    An external API call failed.
+
+    Rendered as {"detail": ...} with status_code by the exception handler
+    registered in app.main, the same shape as HTTPException.
+    """
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+def upstream_error(service: str, error: httpx.HTTPError, not_found: str) -> UpstreamError:
+    """
+    Map an httpx error from calling service's API to an UpstreamError.
+
+    Args:
+        service: API name used in messages, e.g. "GitHub"
+        error: HTTPStatusError or RequestError raised by the call
+        not_found: Detail to return when the API answered 404
+
+    Returns:
+        UpstreamError to raise
+    """
+    if isinstance(error, httpx.HTTPStatusError):
+        status_code = error.response.status_code
+        if status_code == 404:
+            return UpstreamError(404, not_found)
+        if status_code in (403, 429):
+            return UpstreamError(
+                502, f"{service} API rate limit exceeded or access denied. Please try again later."
+            )
+        return UpstreamError(502, f"{service} API returned error {status_code}")
+    return UpstreamError(502, f"{service} API is currently unavailable. Please try again later.")
+
+
+def translate_upstream(service: str, not_found: str = "Resource not found"):
+    """
+    Decorator for endpoints that call service's API.
+
+    httpx errors become UpstreamError (see upstream_error) and any other
+    unexpected exception a 500; HTTPException and UpstreamError pass through.
+    not_found is formatted with the endpoint's arguments, e.g.
+    "LeetCode user '{username}' not found".
+    """
+    def decorator(endpoint):
+        signature = inspect.signature(endpoint)
+
+        @functools.wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            try:
+                return await endpoint(*args, **kwargs)
+            except (HTTPException, UpstreamError):
+                raise
+            except httpx.HTTPError as e:
+                logger.error(f"{service} API call failed: {e}")
+                arguments = signature.bind_partial(*args, **kwargs).arguments
+                raise upstream_error(service, e, not_found.format(**arguments))
+            except Exception as e:
+                logger.error(f"Unexpected error calling {service}: {e}")
+                raise HTTPException(
+                    status_code=500,
+                    detail=f"An unexpected error occurred: {str(e)}"
+                )
+        return wrapper
+    return decorator
@@ -26,7 +26,7 @@ def validate_file_type(filename: str, content_type: str) -> Tuple[bool, str]:
     if file_ext not in ALLOWED_EXTENSIONS:
         if file_ext == ".doc":
             return False, "Legacy .doc format is not supported. Please convert to .docx or PDF."
-        return False, f"File type not allowed. Accepted formats: {', '.join(ALLOWED_EXTENSIONS)}"
+        return False, f"File type not allowed. Accepted formats: {', '.join(sorted(ALLOWED_EXTENSIONS))}"
     
     # Validate MIME type matches extension
     if content_type not in ALLOWED_MIME_TYPES:
@@ -86,13 +86,19 @@ def check_file_validity(filename: str, content_type: str, file_size: int) -> Non
         raise FileValidationError(error_msg)
 
 
-def validate_file(file: UploadFile) -> None:
+def validate_file(file: UploadFile) -> int:
     """
     Validates an uploaded file (convenience wrapper for UploadFile objects).
 
+    The size is taken from the spooled upload, so the body is never read
+    into memory just to be measured.
+
     Args:
         file: FastAPI UploadFile object
 
+    Returns:
+        File size in bytes
+
     Raises:
         FileValidationError: If validation fails
     """
@@ -103,3 +109,4 @@ def validate_file(file: UploadFile) -> None:
 
     # Validate using existing function
     check_file_validity(file.filename, file.content_type, file_size)
+    return file_size
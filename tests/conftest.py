@@ -0,0 +1,26 @@
+import os
+import tempfile
+
+# Point the app at a throwaway SQLite file before anything imports app.database
+_tmpdir = tempfile.mkdtemp(prefix="devheat-tests-")
+_db_path = os.path.join(_tmpdir, "test.db")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_db_path}"
+
+import pytest_asyncio
+
+from app.database import AsyncSessionLocal, Base, engine
+import app.models.database  # noqa: F401  (registers the ORM tables)
+
+
+@pytest_asyncio.fixture
+async def db():
+    """Fresh database file per test; yields a session on the shared test engine."""
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(_db_path + suffix):
+            os.remove(_db_path + suffix)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with AsyncSessionLocal() as session:
+        yield session
+    # Each test runs on its own event loop; don't hand pooled connections across
+    await engine.dispose()
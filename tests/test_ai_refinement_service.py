@@ -0,0 +1,72 @@
+import pytest
+from unittest.mock import MagicMock, patch
+
+from app.services import ai_refinement_service
+from app.utils.ttl_cache import TTLCache
+
+
+_cache = TTLCache(ttl=3600.0, max_size=10)
+
+
+def _model(answers):
+    """A stand-in Gemini model that replies with the given JSON texts in turn."""
+    model = MagicMock()
+    model.generate_content.side_effect = [MagicMock(text=answer) for answer in answers]
+    return model
+
+
+async def _refine(model, document, use_cache=True):
+    with patch.object(ai_refinement_service, "GEMINI_API_KEY", "test-key"), \
+            patch.object(ai_refinement_service, "_refine_cache", _cache), \
+            patch.object(ai_refinement_service.genai, "GenerativeModel", return_value=model), \
+            patch.object(ai_refinement_service, "_log_prompt"), \
+            patch.object(ai_refinement_service, "_log_response"):
+        return await ai_refinement_service.refine_portfolio_content(
+            current_portfolio_json=document,
+            instruction="make it shorter",
+            sections_to_modify=["summary"],
+            use_cache=use_cache,
+        )
+
+
+@pytest.fixture(autouse=True)
+def _empty_cache():
+    _cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_same_refinement_of_same_document_is_served_from_cache():
+    model = _model(['{"summary": "short"}'])
+
+    first = await _refine(model, {"summary": "long", "name": "Jane"})
+    # Same content with keys in another order hashes the same
+    second = await _refine(model, {"name": "Jane", "summary": "long"})
+
+    assert first == second == {"summary": "short"}
+    assert model.generate_content.call_count == 1
+    # Each hit is its own copy of the document
+    second["summary"] = "edited"
+    assert await _refine(model, {"summary": "long", "name": "Jane"}) == {"summary": "short"}
+
+
+@pytest.mark.asyncio
+async def test_changed_document_misses_the_cache():
+    model = _model(['{"summary": "short"}', '{"summary": "shorter"}'])
+
+    await _refine(model, {"summary": "long"})
+    refined = await _refine(model, {"summary": "longer"})
+
+    assert refined == {"summary": "shorter"}
+    assert model.generate_content.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_regenerate_bypasses_the_cache_and_refreshes_it():
+    model = _model(['{"summary": "short"}', '{"summary": "terse"}'])
+
+    await _refine(model, {"summary": "long"})
+    regenerated = await _refine(model, {"summary": "long"}, use_cache=False)
+    cached = await _refine(model, {"summary": "long"})
+
+    assert regenerated == cached == {"summary": "terse"}
+    assert model.generate_content.call_count == 2
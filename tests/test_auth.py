@@ -21,3 +21,15 @@ def test_expired_token():
 def test_invalid_token():
     payload = verify_token("invalid.token.here")
     assert payload is None
+
+def test_verified_token_cached_until_exp():
+    import time
+    from app.utils.auth import _token_cache
+
+    token = create_access_token({"sub": "user-456"}, expires_delta=timedelta(seconds=30))
+    payload = verify_token(token)
+    assert _token_cache.get(token) is payload
+
+    # The entry never outlives the token itself
+    expires_at, _ = _token_cache._entries[token]
+    assert expires_at - time.monotonic() <= 30
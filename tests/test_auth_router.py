@@ -0,0 +1,139 @@
+import asyncio
+import gc
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select
+from unittest.mock import MagicMock, patch
+
+from app.models.database import User
+from app.routers import auth_router
+from app.utils.auth import verify_token
+
+
+class _FakeGitHub:
+    """Stands in for the shared httpx client during the OAuth callback."""
+
+    def __init__(self, user=None, emails=None, user_error=None, emails_error=None):
+        self.user = user
+        self.emails = emails or []
+        self.user_error = user_error
+        self.emails_error = emails_error
+
+    @staticmethod
+    def _response(payload):
+        response = MagicMock()
+        response.json.return_value = payload
+        return response
+
+    async def post(self, url, **kwargs):
+        return self._response({"access_token": "gho_test"})
+
+    async def get(self, url, **kwargs):
+        if url.endswith("/user/emails"):
+            if self.emails_error:
+                raise self.emails_error
+            return self._response(self.emails)
+        # Let the emails request finish (and fail) before the profile does
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        if self.user_error:
+            raise self.user_error
+        return self._response(self.user)
+
+
+async def _callback(db, client):
+    with patch.object(auth_router, "get_http_client", return_value=client):
+        return await auth_router.github_callback("code", db)
+
+
+def _user_id_from_redirect(response):
+    return verify_token(response.headers["location"].split("token=", 1)[1])["sub"]
+
+
+@pytest.mark.asyncio
+async def test_failed_emails_request_is_retrieved_when_profile_fails(db):
+    loop = asyncio.get_running_loop()
+    unhandled = []
+    loop.set_exception_handler(lambda _loop, context: unhandled.append(context))
+
+    client = _FakeGitHub(user_error=RuntimeError("profile down"), emails_error=RuntimeError("emails down"))
+    try:
+        await _callback(db, client)
+    except RuntimeError as exc:
+        assert str(exc) == "profile down"
+    else:
+        pytest.fail("expected the profile error")
+
+    await asyncio.sleep(0)
+    gc.collect()
+    assert unhandled == []
+
+
+@pytest.mark.asyncio
+async def test_failed_emails_request_is_retrieved_when_email_is_public(db):
+    loop = asyncio.get_running_loop()
+    unhandled = []
+    loop.set_exception_handler(lambda _loop, context: unhandled.append(context))
+
+    client = _FakeGitHub(
+        user={"id": 1, "login": "octo", "email": "octo@example.com", "avatar_url": None},
+        emails_error=RuntimeError("emails down"),
+    )
+    await _callback(db, client)
+
+    await asyncio.sleep(0)
+    gc.collect()
+    assert unhandled == []
+
+
+@pytest.mark.asyncio
+async def test_callback_inserts_then_updates_user_by_github_id(db):
+    first = await _callback(db, _FakeGitHub(
+        user={"id": 99, "login": "octo", "email": None, "avatar_url": "a.png"},
+        emails=[{"email": "other@example.com", "primary": False}, {"email": "octo@example.com", "primary": True}],
+    ))
+    user_id = _user_id_from_redirect(first)
+
+    # Same GitHub account, new login and public email: the row is updated in place
+    second = await _callback(db, _FakeGitHub(
+        user={"id": 99, "login": "octocat", "email": "cat@example.com", "avatar_url": "b.png"},
+    ))
+    assert _user_id_from_redirect(second) == user_id
+
+    db.expire_all()
+    users = (await db.execute(select(User))).scalars().all()
+    assert len(users) == 1
+    assert users[0].id == user_id
+    assert users[0].github_id == "99"
+    assert users[0].username == "octocat"
+    assert users[0].email == "cat@example.com"
+    assert users[0].avatar_url == "b.png"
+    assert users[0].access_token == "gho_test"
+
+
+@pytest.mark.asyncio
+async def test_callback_drops_cached_user_on_login(db):
+    first = await _callback(db, _FakeGitHub(
+        user={"id": 5, "login": "octo", "email": "octo@example.com", "avatar_url": None},
+    ))
+    user_id = _user_id_from_redirect(first)
+    auth_router._user_cache.set(user_id, object())
+
+    await _callback(db, _FakeGitHub(
+        user={"id": 5, "login": "octo", "email": "octo@example.com", "avatar_url": None},
+    ))
+    assert auth_router._user_cache.get(user_id) is None
+
+
+@pytest.mark.asyncio
+async def test_callback_rejects_oauth_error(db):
+    client = _FakeGitHub()
+
+    async def post(url, **kwargs):
+        return client._response({"error": "bad_verification_code", "error_description": "The code is invalid"})
+
+    client.post = post
+    with pytest.raises(HTTPException) as exc_info:
+        await _callback(db, client)
+    assert exc_info.value.status_code == 400
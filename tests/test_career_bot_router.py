@@ -0,0 +1,67 @@
+from datetime import datetime, timedelta
+
+import orjson
+import pytest
+
+from app.models.database import ChatMessage, Conversation, User
+from app.routers.career_bot_router import get_conversation_messages
+
+
+async def _seed_conversation(db, message_count):
+    user = User(github_id="42", username="octo")
+    db.add(user)
+    await db.flush()
+    conversation = Conversation(user_id=user.id, title="Chat")
+    db.add(conversation)
+    await db.flush()
+
+    start = datetime(2026, 1, 1)
+    messages = [
+        ChatMessage(
+            user_id=user.id,
+            conversation_id=conversation.id,
+            role="user" if number % 2 == 0 else "assistant",
+            content=f"message {number}",
+            created_at=start + timedelta(seconds=number),
+        )
+        for number in range(message_count)
+    ]
+    db.add_all(messages)
+    await db.commit()
+    return user, conversation.id
+
+
+async def _page(db, user, conversation_id, **params):
+    response = await get_conversation_messages(conversation_id, current_user=user, db=db, **params)
+    return orjson.loads(response.body)
+
+
+@pytest.mark.asyncio
+async def test_cursor_pages_through_messages_in_order(db):
+    user, conversation_id = await _seed_conversation(db, 5)
+
+    first = await _page(db, user, conversation_id, limit=2, offset=0, after_id=None)
+    assert [m["content"] for m in first["messages"]] == ["message 0", "message 1"]
+    assert first["total_count"] == 5
+    assert first["next_cursor"] == first["messages"][-1]["id"]
+
+    second = await _page(db, user, conversation_id, limit=2, offset=0, after_id=first["next_cursor"])
+    assert [m["content"] for m in second["messages"]] == ["message 2", "message 3"]
+    assert second["total_count"] is None
+
+    last = await _page(db, user, conversation_id, limit=2, offset=0, after_id=second["next_cursor"])
+    assert [m["content"] for m in last["messages"]] == ["message 4"]
+    assert last["next_cursor"] is None
+
+
+@pytest.mark.asyncio
+async def test_deprecated_offset_still_pages(db):
+    user, conversation_id = await _seed_conversation(db, 5)
+
+    page = await _page(db, user, conversation_id, limit=2, offset=2, after_id=None)
+    assert [m["content"] for m in page["messages"]] == ["message 2", "message 3"]
+    assert page["total_count"] == 5
+
+    past_end = await _page(db, user, conversation_id, limit=2, offset=10, after_id=None)
+    assert past_end["messages"] == []
+    assert past_end["total_count"] == 5
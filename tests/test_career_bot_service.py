@@ -0,0 +1,90 @@
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from sqlalchemy import select
+
+from app.models.database import ChatMessage, Conversation, Portfolio, PortfolioGithubRepo, User
+from app.services import career_bot_service
+from app.services.career_bot_service import gather_user_context
+
+
+@pytest.mark.asyncio
+async def test_gather_user_context_reads_flags_without_payload(db):
+    user = User(github_id="7", username="octo")
+    db.add(user)
+    await db.flush()
+    portfolio = Portfolio(
+        slug="octo",
+        name="Octo",
+        user_id=user.id,
+        portfolio_focus="backend",
+        has_resume=True,
+        has_linkedin=False,
+        has_leetcode=True,
+        has_codeforces=False,
+    )
+    db.add(portfolio)
+    await db.flush()
+    db.add_all([
+        PortfolioGithubRepo(portfolio_id=portfolio.id, name="one"),
+        PortfolioGithubRepo(portfolio_id=portfolio.id, name="two"),
+    ])
+    await db.commit()
+
+    context = await gather_user_context(user, db)
+
+    assert context["has_resume"] is True
+    assert context["has_linkedin"] is False
+    assert context["has_leetcode"] is True
+    assert context["has_codeforces"] is False
+    assert context["github_repos_count"] == 2
+    assert context["portfolio_focus"] == "backend"
+
+
+@pytest.mark.asyncio
+async def test_gather_user_context_without_portfolio(db):
+    user = User(github_id="8", username="nobody")
+    db.add(user)
+    await db.commit()
+
+    context = await gather_user_context(user, db)
+
+    assert context["github_repos_count"] == 0
+    assert context["has_resume"] is False
+
+
+@pytest.mark.asyncio
+async def test_send_message_saves_both_turn_messages(db):
+    user = User(github_id="9", username="octo")
+    db.add(user)
+    await db.flush()
+    conversation = Conversation(user_id=user.id, title="Chat")
+    db.add(conversation)
+    await db.commit()
+
+    new_state = {**career_bot_service.DEFAULT_CONVERSATION_STATE, "summary": "Talked about Go"}
+    with patch.object(career_bot_service, "retrieve_profile_evidence", AsyncMock(return_value=[])), \
+            patch.object(career_bot_service, "chat_with_gemini", AsyncMock(return_value=("Learn Go", "gemini-test"))), \
+            patch.object(career_bot_service, "update_conversation_state", AsyncMock(return_value=(new_state, True))), \
+            patch.object(career_bot_service, "_write_career_debug_log"):
+        reply = await career_bot_service.send_message("What next?", user, conversation, db)
+
+    assert reply["assistant_message"] == "Learn Go"
+    assert reply["model_used"] == "gemini-test"
+    assert reply["state_updated"] is True
+
+    rows = (await db.execute(
+        select(ChatMessage.role, ChatMessage.content, ChatMessage.model_used, ChatMessage.created_at)
+        .where(ChatMessage.conversation_id == conversation.id)
+        .order_by(ChatMessage.created_at, ChatMessage.id)
+    )).all()
+    assert [(row.role, row.content, row.model_used) for row in rows] == [
+        ("user", "What next?", None),
+        ("assistant", "Learn Go", "gemini-test"),
+    ]
+    assert rows[0].created_at < rows[1].created_at
+    assert reply["timestamp"] == rows[1].created_at.isoformat()
+
+    history = await career_bot_service.get_conversation_history(conversation.id, db)
+    assert [message["role"] for message in history] == ["user", "assistant"]
+    assert conversation.summary == "Talked about Go"
@@ -0,0 +1,98 @@
+import pytest
+from sqlalchemy import text
+from app.database import engine, get_db, get_db_ro
+
+
+async def _run(dependency):
+    gen = dependency()
+    session = await gen.__anext__()
+    await session.execute(text("SELECT 1"))
+    with pytest.raises(StopAsyncIteration):
+        await gen.__anext__()
+
+
+@pytest.mark.asyncio
+async def test_get_db_ro_resets_query_only(db):
+    # Put two connections in the pool so a check-in/check-out in between
+    # would land the reset on the other one
+    async with engine.connect() as first, engine.connect() as second:
+        await first.exec_driver_sql("SELECT 1")
+        await second.exec_driver_sql("SELECT 1")
+
+    await _run(get_db_ro)
+
+    # The pooled connection get_db_ro used must be writable again
+    async with engine.connect() as conn:
+        assert (await conn.exec_driver_sql("PRAGMA query_only")).scalar() == 0
+
+    gen = get_db()
+    session = await gen.__anext__()
+    await session.execute(text("INSERT INTO users (id, github_id, username, created_at, updated_at) VALUES ('u1', '1', 'octo', CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)"))
+    with pytest.raises(StopAsyncIteration):
+        await gen.__anext__()
+
+
+@pytest.mark.asyncio
+async def test_init_db_converts_legacy_text_uuid_keys(db):
+    from sqlalchemy import select
+    from app.database import init_db
+    from app.models.database import Portfolio, PortfolioVersion
+
+    portfolio_id = "0b6a2f4e-5d1c-4c33-9a57-1f2e3d4c5b6a"
+    version_id = "7c8d9e0f-1a2b-4c3d-8e4f-5a6b7c8d9e0f"
+    # A file create_all built before the keys became BLOBs: ids stored as text
+    await db.execute(text(
+        "INSERT INTO portfolios (id, slug, name, portfolio_focus, status, current_version_id, created_at, updated_at) "
+        "VALUES (:id, 'legacy', 'Legacy', 'general', 'completed', :version_id, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)"
+    ), {"id": portfolio_id, "version_id": version_id})
+    await db.execute(text(
+        "INSERT INTO portfolio_versions (id, portfolio_id, version_number, version_state, public_portfolio_json, created_by, created_at) "
+        "VALUES (:id, :portfolio_id, 1, 'COMMITTED', '{}', 'AI', CURRENT_TIMESTAMP)"
+    ), {"id": version_id, "portfolio_id": portfolio_id})
+    await db.execute(text("PRAGMA user_version = 0"))
+    await db.commit()
+
+    await init_db()
+
+    portfolio = (await db.execute(select(Portfolio).where(Portfolio.id == portfolio_id))).scalar_one()
+    assert portfolio.current_version_id == version_id
+    version = (await db.execute(
+        select(PortfolioVersion).where(PortfolioVersion.portfolio_id == portfolio_id)
+    )).scalar_one()
+    assert version.id == version_id
+
+
+@pytest.mark.asyncio
+async def test_init_db_backfills_github_repos(db):
+    from sqlalchemy import func, select
+    from app.database import init_db
+    from app.models.database import Portfolio, PortfolioGithubRepo
+
+    repos = [
+        {"name": "api", "primary_language": "Python", "readme_length": 120, "structure": {"has_tests": True}},
+        {"name": "site", "primary_language": "TypeScript"},
+    ]
+    # A file create_all upgraded: repos only in github_data, child table empty
+    legacy = Portfolio(slug="legacy", name="Legacy", status="completed", github_data=repos)
+    shredded = Portfolio(slug="shredded", name="Shredded", status="completed", github_data=repos)
+    db.add_all([legacy, shredded])
+    await db.flush()
+    db.add(PortfolioGithubRepo(portfolio_id=shredded.id, name="api"))
+    await db.execute(text("PRAGMA user_version = 0"))
+    await db.commit()
+    legacy_id, shredded_id = legacy.id, shredded.id
+
+    await init_db()
+
+    rows = (await db.execute(
+        select(PortfolioGithubRepo.name, PortfolioGithubRepo.primary_language,
+               PortfolioGithubRepo.readme_length, PortfolioGithubRepo.structure)
+        .where(PortfolioGithubRepo.portfolio_id == legacy_id)
+        .order_by(PortfolioGithubRepo.name)
+    )).all()
+    assert rows == [("api", "Python", 120, {"has_tests": True}), ("site", "TypeScript", None, None)]
+    # Portfolios that already have repo rows are not filled again
+    shredded_count = (await db.execute(
+        select(func.count()).where(PortfolioGithubRepo.portfolio_id == shredded_id)
+    )).scalar_one()
+    assert shredded_count == 1
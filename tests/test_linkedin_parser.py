@@ -0,0 +1,144 @@
+import random
+from typing import Dict
+
+import pytest
+
+from app.routers.linkedin_router import parse_linkedin_sections
+
+
+def _line_based_parse(text: str) -> Dict[str, str]:
+    """The original line-by-line parser, kept as the reference behaviour."""
+    lines = text.split('\n')
+    section_positions = {"skills": -1, "summary_header": -1, "experience": -1, "education": -1}
+
+    for i, line in enumerate(lines):
+        line_lower = line.strip().lower()
+        if line_lower in ["top skills", "skills", "technical skills", "core competencies"] and section_positions["skills"] == -1:
+            section_positions["skills"] = i
+        elif line_lower in ["summary", "about"] and section_positions["summary_header"] == -1:
+            section_positions["summary_header"] = i
+        elif line_lower in ["experience", "work experience", "professional experience"] and section_positions["experience"] == -1:
+            section_positions["experience"] = i
+        elif line_lower in ["education", "academic background"] and section_positions["education"] == -1:
+            section_positions["education"] = i
+
+    sections = {"summary": "", "experience_raw": "", "education_raw": "", "skills_raw": ""}
+
+    if section_positions["skills"] != -1:
+        start = section_positions["skills"] + 1
+        end_candidates = [pos for pos in [section_positions["summary_header"], section_positions["experience"]] if pos > start]
+        end = min(end_candidates) if end_candidates else len(lines)
+        skills_lines = []
+        consecutive_long_lines = 0
+        for line in lines[start:end]:
+            stripped = line.strip()
+            if not stripped:
+                skills_lines.append(line)
+                continue
+            if len(stripped.split()) > 10:
+                consecutive_long_lines += 1
+                if consecutive_long_lines >= 2:
+                    break
+            else:
+                consecutive_long_lines = 0
+                skills_lines.append(line)
+        sections["skills_raw"] = '\n'.join(skills_lines).strip()
+
+    if section_positions["skills"] != -1 and section_positions["experience"] != -1:
+        start = section_positions["skills"] + 1
+        summary_start = start
+        consecutive_long_lines = 0
+        for i in range(start, section_positions["experience"]):
+            stripped = lines[i].strip()
+            if not stripped:
+                continue
+            if len(stripped.split()) > 10:
+                consecutive_long_lines += 1
+                if consecutive_long_lines >= 2:
+                    summary_start = i - 1
+                    break
+            else:
+                consecutive_long_lines = 0
+        sections["summary"] = '\n'.join(lines[summary_start:section_positions["experience"]]).strip()
+    elif section_positions["experience"] != -1 and section_positions["skills"] == -1:
+        sections["summary"] = '\n'.join(lines[:section_positions["experience"]]).strip()
+
+    if section_positions["experience"] != -1:
+        start = section_positions["experience"] + 1
+        end = section_positions["education"] if section_positions["education"] != -1 else len(lines)
+        sections["experience_raw"] = '\n'.join(lines[start:end]).strip()
+
+    if section_positions["education"] != -1:
+        sections["education_raw"] = '\n'.join(lines[section_positions["education"] + 1:]).strip()
+
+    return sections
+
+
+@pytest.mark.parametrize("text", [
+    # Case folding that maps a non-ASCII letter onto a header spelling
+    "ſkills\nPython\nExperience\nACME",
+    "Top SKills\nPython\nExperience\nACME",
+    "SUMMARY\nI build things\nWORK EXPERIENCE\nACME\nEDUCATION\nMIT",
+    "  Skills \r\nGo\r\nExperience\r\nACME\r\n",
+    "",
+])
+def test_header_detection_matches_line_based_parser(text):
+    assert parse_linkedin_sections(text) == _line_based_parse(text)
+
+
+def test_random_documents_match_line_based_parser():
+    rng = random.Random(1234)
+    vocabulary = [
+        "Top Skills", "skills", "SUMMARY", "About", "Experience", "Education",
+        "academic background", "  experience  ", "ſkills", "", " ",
+        "Python", "Leadership", "ACME Corp",
+        "Engineer who designs and ships distributed systems for large scale production use",
+    ]
+    for _ in range(500):
+        text = "\n".join(rng.choice(vocabulary) for _ in range(rng.randint(0, 20)))
+        assert parse_linkedin_sections(text) == _line_based_parse(text), text
+
+
+LINKEDIN_EXPORT = """Jane Doe
+Backend Engineer
+Top Skills
+Python
+PostgreSQL
+Distributed Systems
+I am a backend engineer who enjoys building reliable services for many users at scale.
+Over eight years I have shipped payment, search and messaging systems for large companies.
+Summary
+Experience
+ACME Corp
+Senior Engineer
+2020 - Present
+Education
+MIT
+BSc Computer Science"""
+
+
+def test_sections_sliced_from_export():
+    sections = parse_linkedin_sections(LINKEDIN_EXPORT)
+
+    assert sections["skills_raw"] == "Python\nPostgreSQL\nDistributed Systems"
+    assert sections["summary"].startswith("I am a backend engineer")
+    assert sections["summary"].endswith("Summary")
+    assert sections["experience_raw"] == "ACME Corp\nSenior Engineer\n2020 - Present"
+    assert sections["education_raw"] == "MIT\nBSc Computer Science"
+    assert sections == _line_based_parse(LINKEDIN_EXPORT)
+
+
+def test_without_skills_everything_before_experience_is_summary():
+    sections = parse_linkedin_sections("Jane Doe\nI build APIs\n\nExperience\nACME\n")
+
+    assert sections["summary"] == "Jane Doe\nI build APIs"
+    assert sections["experience_raw"] == "ACME"
+    assert sections["skills_raw"] == ""
+    assert sections["education_raw"] == ""
+
+
+def test_only_first_occurrence_of_a_header_counts():
+    sections = parse_linkedin_sections("Experience\nACME\nExperience\nInitech\nEducation\nMIT")
+
+    assert sections["experience_raw"] == "ACME\nExperience\nInitech"
+    assert sections["education_raw"] == "MIT"
@@ -0,0 +1,172 @@
+import orjson
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select
+from unittest.mock import AsyncMock, patch
+
+from app.models.database import Portfolio, PortfolioVersion, VersionState, VersionCreatedBy
+from app.routers.portfolio_refinement_router import (
+    MAX_VERSIONS,
+    RefineRequest,
+    RevertRequest,
+    confirm_portfolio,
+    refine_portfolio,
+    revert_portfolio,
+)
+from app.services import ai_refinement_service
+
+
+async def _seed(db, documents):
+    """
+    A portfolio with one version per document; the last one is current.
+
+    Returns the portfolio id and the version ids, oldest first.
+    """
+    # Enforce FKs like PostgreSQL would, so statement order matters
+    await (await db.connection()).exec_driver_sql("PRAGMA foreign_keys = ON")
+
+    portfolio = Portfolio(slug="jane", name="Jane", status="completed")
+    db.add(portfolio)
+    await db.flush()
+
+    versions = []
+    for number, document in enumerate(documents, start=1):
+        version = PortfolioVersion(
+            portfolio_id=portfolio.id,
+            version_number=number,
+            version_state=VersionState.COMMITTED if number == 1 else VersionState.DRAFT,
+            public_portfolio_json=document,
+            created_by=VersionCreatedBy.AI,
+        )
+        db.add(version)
+        versions.append(version)
+    await db.flush()
+
+    portfolio.current_version_id = versions[-1].id
+    await db.commit()
+    return portfolio.id, [version.id for version in versions]
+
+
+async def _versions(db, portfolio_id):
+    result = await db.execute(
+        select(PortfolioVersion.id, PortfolioVersion.version_number, PortfolioVersion.version_state)
+        .where(PortfolioVersion.portfolio_id == portfolio_id)
+    )
+    return result.all()
+
+
+@pytest.mark.asyncio
+async def test_confirm_commits_latest_version_and_drops_the_rest(db):
+    portfolio_id, version_ids = await _seed(db, [{"name": "v1"}, {"name": "draft"}])
+
+    response = await confirm_portfolio("jane", db)
+
+    assert response.status == "confirmed"
+    assert response.version.id == version_ids[-1]
+    assert response.version.version_number == 3
+    assert response.version.version_state == "committed"
+    assert await _versions(db, portfolio_id) == [(version_ids[-1], 3, VersionState.COMMITTED)]
+
+    db.expire_all()
+    current_version_id = (await db.execute(
+        select(Portfolio.current_version_id).where(Portfolio.id == portfolio_id)
+    )).scalar_one()
+    assert current_version_id == version_ids[-1]
+
+
+@pytest.mark.asyncio
+async def test_confirm_rejects_empty_refined_document(db):
+    portfolio_id, version_ids = await _seed(db, [{"name": "v1"}, {}])
+
+    with pytest.raises(HTTPException) as exc_info:
+        await confirm_portfolio("jane", db)
+
+    assert exc_info.value.status_code == 400
+    assert len(await _versions(db, portfolio_id)) == 2
+
+
+@pytest.mark.asyncio
+async def test_confirm_unknown_slug_is_404(db):
+    with pytest.raises(HTTPException) as exc_info:
+        await confirm_portfolio("nobody", db)
+    assert exc_info.value.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_revert_commits_selected_version_after_the_max(db):
+    portfolio_id, version_ids = await _seed(db, [{"name": "v1"}, {"name": "v2"}, {"name": "draft"}])
+
+    response = await revert_portfolio("jane", RevertRequest(version_id=version_ids[0]), db)
+
+    assert response.status == "reverted"
+    assert response.version.id == version_ids[0]
+    assert response.version.version_number == 4
+    assert await _versions(db, portfolio_id) == [(version_ids[0], 4, VersionState.COMMITTED)]
+
+    db.expire_all()
+    summary = (await db.execute(
+        select(PortfolioVersion.changes_summary).where(PortfolioVersion.id == version_ids[0])
+    )).scalar_one()
+    assert summary == "Reverted to version 1"
+
+
+@pytest.mark.asyncio
+async def test_revert_rejects_version_of_another_portfolio(db):
+    await _seed(db, [{"name": "v1"}])
+    other = Portfolio(slug="other", name="Other", status="completed")
+    db.add(other)
+    await db.flush()
+    foreign = PortfolioVersion(
+        portfolio_id=other.id,
+        version_number=1,
+        version_state=VersionState.COMMITTED,
+        public_portfolio_json={"name": "other"},
+        created_by=VersionCreatedBy.AI,
+    )
+    db.add(foreign)
+    await db.commit()
+
+    with pytest.raises(HTTPException) as exc_info:
+        await revert_portfolio("jane", RevertRequest(version_id=foreign.id), db)
+    assert exc_info.value.status_code == 400
+
+
+async def _refine(db, refined_json):
+    with patch.object(ai_refinement_service, "refine_portfolio_content", AsyncMock(return_value=refined_json)):
+        response = await refine_portfolio("jane", RefineRequest(instruction="shorter"), db)
+    return orjson.loads(response.body)
+
+
+@pytest.mark.asyncio
+async def test_refine_adds_draft_and_points_portfolio_at_it(db):
+    portfolio_id, version_ids = await _seed(db, [{"name": "v1"}])
+
+    body = await _refine(db, {"name": "refined"})
+
+    assert body["version"]["version_number"] == 2
+    assert body["version"]["version_state"] == "draft"
+    assert body["portfolio_json"] == {"name": "refined"}
+    assert len(await _versions(db, portfolio_id)) == 2
+
+    db.expire_all()
+    current_version_id = (await db.execute(
+        select(Portfolio.current_version_id).where(Portfolio.id == portfolio_id)
+    )).scalar_one()
+    assert current_version_id == body["version"]["id"]
+
+
+@pytest.mark.asyncio
+async def test_refine_drops_oldest_draft_beyond_max_versions(db):
+    # One committed version followed by a full set of drafts
+    documents = [{"name": f"v{number}"} for number in range(1, MAX_VERSIONS + 2)]
+    portfolio_id, version_ids = await _seed(db, documents)
+
+    body = await _refine(db, {"name": "refined"})
+
+    versions = await _versions(db, portfolio_id)
+    drafts = [number for _, number, state in versions if state == VersionState.DRAFT]
+    assert len(drafts) == MAX_VERSIONS
+    assert min(drafts) == 3
+    assert max(drafts) == body["version"]["version_number"] == MAX_VERSIONS + 2
+    # The committed version is kept
+    assert (version_ids[0], 1, VersionState.COMMITTED) in versions
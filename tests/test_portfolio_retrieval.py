@@ -0,0 +1,49 @@
+import pytest
+from fastapi import HTTPException
+
+from app.models.database import Portfolio, PortfolioVersion, VersionState, VersionCreatedBy
+from app.routers.portfolio_retrieval_router import list_portfolio_versions
+
+
+@pytest.mark.asyncio
+async def test_list_versions_unknown_slug_is_404(db):
+    with pytest.raises(HTTPException) as exc_info:
+        await list_portfolio_versions("nobody", db=db)
+    assert exc_info.value.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_list_versions_portfolio_without_versions_is_empty(db):
+    db.add(Portfolio(slug="jane", name="Jane", status="processing"))
+    await db.commit()
+
+    response = await list_portfolio_versions("jane", db=db)
+
+    assert response == {"versions": [], "total_count": 0}
+
+
+@pytest.mark.asyncio
+async def test_list_versions_newest_first_and_limited(db):
+    portfolio = Portfolio(slug="jane", name="Jane", status="completed")
+    db.add(portfolio)
+    await db.flush()
+    for number in (1, 2, 3):
+        db.add(PortfolioVersion(
+            portfolio_id=portfolio.id,
+            version_number=number,
+            version_state=VersionState.COMMITTED if number == 1 else VersionState.DRAFT,
+            public_portfolio_json={"name": f"v{number}"},
+            changes_summary=f"change {number}",
+            created_by=VersionCreatedBy.AI,
+        ))
+    await db.commit()
+
+    response = await list_portfolio_versions("jane", limit=2, db=db)
+
+    assert response["total_count"] == 2
+    assert [v["version_number"] for v in response["versions"]] == [3, 2]
+    latest = response["versions"][0]
+    assert latest["version_state"] == "draft"
+    assert latest["created_by"] == "ai"
+    assert latest["changes_summary"] == "change 3"
+    assert latest["created_at"].endswith("Z")
@@ -0,0 +1,21 @@
+from app.utils.ttl_cache import TTLCache
+
+
+def test_evicts_least_recently_used():
+    cache = TTLCache(ttl=60.0, max_size=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "a" is now the most recent
+
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_per_entry_ttl():
+    cache = TTLCache(ttl=60.0, max_size=2)
+    cache.set("short", 1, ttl=0)
+    cache.set("long", 2)
+    assert cache.get("short") is None
+    assert cache.get("long") == 2